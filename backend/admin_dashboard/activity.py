@@ -0,0 +1,187 @@
+import base64
+from django.db.models import Q
+from django.db.models.signals import post_init, post_save
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# entity_type -> (summary, actor_field, get_status), filled in by track()
+_tracked = {}
+
+
+def _user_summary(user, status):
+    return f"{user.username} joined as {user.role}"
+
+
+def _project_summary(project, status):
+    return f'Project "{project.title}" is {status}'
+
+
+def _task_summary(task, status):
+    return f'Task "{task.title}" is {status}'
+
+
+def _transaction_summary(tx, status):
+    return f"{tx.get_transaction_type_display()} of {tx.amount} is {status}"
+
+
+def _kyc_summary(record, status):
+    return f"KYC ({record.document_type}) for user #{record.user_id} is {status}"
+
+
+def _dispute_summary(dispute, status):
+    return f'Dispute "{dispute.title}" is {status}'
+
+
+def _alert_summary(alert, status):
+    return f"{alert.get_severity_display()} alert: {alert.title} ({status})"
+
+
+def _alert_status(alert):
+    return 'resolved' if alert.__dict__.get('is_resolved') else 'open'
+
+
+def _status(instance):
+    return instance.__dict__.get('status', '')
+
+
+def _no_status(instance):
+    return ''
+
+
+def track(model, entity_type, summary, actor_field=None, get_status=_status):
+    """
+    Append an ActivityEvent when a row is created or its status changes.
+    The previous status is remembered at post_init, so no extra read.
+    """
+    from .models import ActivityEvent
+
+    uid = f'activity_{model._meta.label_lower}'
+    _tracked[entity_type] = (summary, actor_field, get_status)
+
+    def on_init(sender, instance, **kwargs):
+        instance._activity_status = get_status(instance) if instance.pk is not None else None
+
+    def on_save(sender, instance, created, raw=False, **kwargs):
+        if raw:
+            return
+        previous = getattr(instance, '_activity_status', None)
+        status = get_status(instance)
+        instance._activity_status = status
+        if not created and (previous is None or status == previous):
+            return
+
+        ActivityEvent.objects.create(
+            entity_type=entity_type,
+            entity_id=instance.pk,
+            verb='created' if created else 'status_changed',
+            status=status,
+            summary=summary(instance, status)[:255],
+            actor_id=getattr(instance, actor_field) if actor_field else None,
+            data={} if created else {'previous_status': previous},
+        )
+
+    post_init.connect(on_init, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=uid)
+
+
+def connect():
+    from users.models import User, KYCRecord
+    from projects.models import EnterpriseProject
+    from tasks.models import TaskUnit
+    from wallet.models import WalletTransaction
+    from .models import DisputeCase, SystemAlert
+
+    track(User, 'user', _user_summary, actor_field='pk', get_status=_no_status)
+    track(EnterpriseProject, 'project', _project_summary, actor_field='client_id')
+    track(TaskUnit, 'task', _task_summary, actor_field='assigned_to_id')
+    track(WalletTransaction, 'transaction', _transaction_summary, actor_field='user_id')
+    track(KYCRecord, 'kyc', _kyc_summary, actor_field='user_id')
+    track(DisputeCase, 'dispute', _dispute_summary, actor_field='raised_by_id')
+    track(SystemAlert, 'alert', _alert_summary, get_status=_alert_status)
+
+
+def record_bulk_transitions(entity_type, instances, previous_statuses):
+    """
+    Append status_changed events for rows updated with bulk_update, which
+    sends no signals. `previous_statuses` maps pk -> status before the update.
+    """
+    from .models import ActivityEvent
+
+    summary, actor_field, get_status = _tracked[entity_type]
+    events = []
+    for instance in instances:
+        status = get_status(instance)
+        previous = previous_statuses.get(instance.pk)
+        if status == previous:
+            continue
+        events.append(ActivityEvent(
+            entity_type=entity_type,
+            entity_id=instance.pk,
+            verb='status_changed',
+            status=status,
+            summary=summary(instance, status)[:255],
+            actor_id=getattr(instance, actor_field) if actor_field else None,
+            data={'previous_status': previous},
+        ))
+    ActivityEvent.objects.bulk_create(events, batch_size=500)
+
+
+def record_bulk_created(entity_type, instances):
+    """Append created events for rows inserted with bulk_create"""
+    from .models import ActivityEvent
+
+    summary, actor_field, get_status = _tracked[entity_type]
+    ActivityEvent.objects.bulk_create([
+        ActivityEvent(
+            entity_type=entity_type,
+            entity_id=instance.pk,
+            verb='created',
+            status=get_status(instance),
+            summary=summary(instance, get_status(instance))[:255],
+            actor_id=getattr(instance, actor_field) if actor_field else None,
+            data={},
+        )
+        for instance in instances
+    ], batch_size=500)
+
+
+def encode_cursor(event):
+    raw = f"{event.created_at.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """(created_at, id) from an opaque cursor; raises ValueError if malformed"""
+    try:
+        created_at, event_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        created_at = parse_datetime(created_at)
+        event_id = int(event_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if created_at is None:
+        raise ValueError("Invalid cursor")
+    return created_at, event_id
+
+
+def feed(entity_types=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    One page of the activity feed, newest first, read with a single query
+    on the (created_at, id) index. Returns (events, next_cursor).
+    """
+    from .models import ActivityEvent
+
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    queryset = ActivityEvent.objects.select_related('actor').order_by('-created_at', '-id')
+    if entity_types:
+        queryset = queryset.filter(entity_type__in=entity_types)
+    if cursor:
+        created_at, event_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=event_id)
+        )
+
+    events = list(queryset[:limit + 1])
+    next_cursor = encode_cursor(events[limit - 1]) if len(events) > limit else None
+    return events[:limit], next_cursor
@@ -5,3 +5,9 @@ class AdminDashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'admin_dashboard'
     verbose_name = 'Admin Dashbaord'
+
+    def ready(self):
+        from . import activity, events, signals
+        signals.connect()
+        activity.connect()
+        events.connect()
@@ -0,0 +1,121 @@
+import logging
+import uuid
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+AUDIT_MODELS = {
+    'project': 'projects.ProjectAudit',
+    'admin': 'admin_dashboard.AuditLog',
+}
+
+def sync_mode():
+    return getattr(settings, 'AUDIT_SYNC', False)
+
+
+def _flatten(fields):
+    """Model instances become <name>_id so records stay JSON for the broker"""
+    flat = {}
+    for name, value in fields.items():
+        if isinstance(value, models.Model):
+            flat[f'{name}_id'] = value.pk
+        else:
+            flat[name] = value
+    return flat
+
+
+def _entry(kind, fields):
+    return {
+        'kind': kind,
+        'dedupe_id': uuid.uuid4().hex,
+        'created_at': timezone.now().isoformat(),
+        'fields': _flatten(fields),
+    }
+
+
+def record(kind, **fields):
+    """
+    Queue one audit record. Nothing is written in the caller's transaction:
+    the record is handed to a worker when that transaction commits (so
+    rolled back work leaves no audit trail), wherever the write happened:
+    a request, a task, a management command or the shell.
+    """
+    record_many(kind, [fields])
+
+
+def record_many(kind, rows):
+    """Queue several audit records of one kind with a single commit hook"""
+    entries = [_entry(kind, fields) for fields in rows]
+    if not entries:
+        return
+    if sync_mode():
+        write_records(entries)
+        return
+    transaction.on_commit(lambda: enqueue(entries))
+
+
+def project_event(project, action, description, performed_by=None):
+    record('project', project=project, action=action, description=description,
+           performed_by=performed_by)
+
+
+def admin_action(user, action, description, resource_id='', resource_type='', **extra):
+    record('admin', user=user, action=action, description=description,
+           resource_id=resource_id, resource_type=resource_type, **extra)
+
+
+def admin_actions(user, action, rows):
+    """Bulk form of admin_action; each row holds description/resource_* fields"""
+    record_many('admin', [dict(row, user=user, action=action) for row in rows])
+
+
+def enqueue(entries):
+    """Hand committed records to the worker, AUDIT_BATCH_SIZE per message"""
+    from .tasks import write_audit_records
+
+    size = getattr(settings, 'AUDIT_BATCH_SIZE', 100)
+    for i in range(0, len(entries), size):
+        batch = entries[i:i + size]
+        try:
+            write_audit_records.delay(batch)
+        except Exception:
+            # Broker unavailable: keep the records rather than drop them
+            logger.exception("Could not enqueue %d audit records, writing inline", len(batch))
+            write_records(batch)
+
+
+def _build(entry):
+    model = apps.get_model(AUDIT_MODELS[entry['kind']])
+    return model(
+        dedupe_id=entry['dedupe_id'],
+        created_at=parse_datetime(entry['created_at']),
+        **entry['fields']
+    )
+
+
+def write_records(entries):
+    """
+    Insert audit records with bulk_create. Delivery is at-least-once, so a
+    redelivered batch is absorbed by the unique dedupe_id.
+    """
+    by_kind = {}
+    for entry in entries:
+        by_kind.setdefault(entry['kind'], []).append(_build(entry))
+
+    for objs in by_kind.values():
+        model = type(objs[0])
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(objs, ignore_conflicts=True, batch_size=500)
+        except IntegrityError:
+            # e.g. a project deleted before its audit landed; save the rest
+            for obj in objs:
+                try:
+                    with transaction.atomic():
+                        model.objects.bulk_create([obj], ignore_conflicts=True)
+                except IntegrityError:
+                    logger.warning("Dropping audit record %s", obj.dedupe_id)
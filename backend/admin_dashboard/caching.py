@@ -0,0 +1,80 @@
+import hashlib
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+KEY_PREFIX = 'admin_view'
+
+
+def cache_key(name, request):
+    params = sorted(request.GET.lists())
+    digest = hashlib.sha256(repr(params).encode()).hexdigest()[:16]
+    return f"{KEY_PREFIX}:{name}:{digest}"
+
+
+def _etag(data):
+    return '"%s"' % hashlib.sha256(JSONRenderer().render(data)).hexdigest()
+
+
+def _wait_for_entry(key, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+        time.sleep(0.05)
+    return None
+
+
+def _respond(request, entry, ttl):
+    if entry['etag'] in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(entry['data'])
+    response['ETag'] = entry['etag']
+    response['Cache-Control'] = f'private, max-age={ttl}'
+    return response
+
+
+def cached_admin_view(ttl=None):
+    """
+    Cache an admin read endpoint for a few seconds, shared by every admin.
+
+    Responses carry a strong ETag (a hash of the rendered JSON) so polling
+    tabs get 304s while the data is unchanged. On a miss only one request
+    computes the response; concurrent misses wait for its result instead
+    of hitting the database themselves.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            timeout = ttl if ttl is not None else getattr(settings, 'ADMIN_VIEW_CACHE_TTL', 5)
+            lock_timeout = getattr(settings, 'ADMIN_VIEW_LOCK_TIMEOUT', 10)
+            key = cache_key(view_func.__name__, request)
+
+            entry = cache.get(key)
+            if entry is None:
+                if cache.add(f"{key}:lock", True, timeout=lock_timeout):
+                    try:
+                        response = view_func(request, *args, **kwargs)
+                        if response.status_code != status.HTTP_200_OK:
+                            return response
+                        entry = {'etag': _etag(response.data), 'data': response.data}
+                        cache.set(key, entry, timeout=timeout)
+                    finally:
+                        cache.delete(f"{key}:lock")
+                else:
+                    entry = _wait_for_entry(key, lock_timeout)
+                    if entry is None:
+                        # The computing request died or is very slow; do it ourselves
+                        return view_func(request, *args, **kwargs)
+
+            return _respond(request, entry, timeout)
+
+        return wrapper
+    return decorator
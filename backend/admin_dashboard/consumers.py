@@ -0,0 +1,25 @@
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .events import ADMIN_FEED_GROUP
+
+
+class AdminFeedConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Live operations feed for admins: new alerts, dispute openings, KYC
+    submissions and withdrawal status changes are pushed as they happen.
+    """
+
+    async def connect(self):
+        user = self.scope.get('user')
+        if not user or not user.is_authenticated or user.role != 'admin':
+            await self.close(code=4403)
+            return
+
+        await self.channel_layer.group_add(ADMIN_FEED_GROUP, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        await self.channel_layer.group_discard(ADMIN_FEED_GROUP, self.channel_name)
+
+    async def feed_event(self, event):
+        await self.send_json({'event': event['event'], 'data': event['data']})
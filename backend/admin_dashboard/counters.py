@@ -0,0 +1,210 @@
+from collections import Counter
+from datetime import datetime, time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+KEY_PREFIX = 'dashboard:counter'
+READY_KEY = 'dashboard:counters:ready'
+DAY_KEY_TIMEOUT = 60 * 60 * 48
+
+GLOBAL_COUNTERS = (
+    'total_students',
+    'total_enterprises',
+    'total_projects',
+    'total_tasks_completed',
+    'pending_kyc',
+    'pending_disputes',
+    'pending_withdrawals',
+)
+DAILY_COUNTERS = (
+    'projects_today',
+    'tasks_today',
+    'withdrawals_today',
+)
+PENDING_WITHDRAWAL_STATUSES = ('pending', 'processing')
+
+
+def _currencies():
+    return getattr(settings, 'CURRENCIES', ('NGN',))
+
+
+def _volume_counter(currency):
+    return f'volume_minor:{currency}'
+
+
+def _key(name, day=None):
+    if day is not None:
+        return f'{KEY_PREFIX}:{name}:{day.isoformat()}'
+    return f'{KEY_PREFIX}:{name}'
+
+
+def _local_day(value):
+    return timezone.localdate(value) if value else None
+
+
+# Contributions: what each row currently adds to the counters. Signal
+# handlers diff these before and after a save to get O(1) increments.
+
+def user_contributions(user):
+    if user.role == 'student':
+        return {'total_students': 1}
+    if user.role == 'enterprise':
+        return {'total_enterprises': 1}
+    return {}
+
+
+def project_contributions(project):
+    contributions = {'total_projects': 1}
+    if project.created_at:
+        contributions[('projects_today', _local_day(project.created_at))] = 1
+    return contributions
+
+
+def task_contributions(task):
+    contributions = {}
+    if task.created_at:
+        contributions[('tasks_today', _local_day(task.created_at))] = 1
+    if task.status == 'completed':
+        contributions['total_tasks_completed'] = 1
+        contributions[_volume_counter(task.pay_amount_currency)] = task.pay_amount_minor
+    return contributions
+
+
+def kyc_contributions(record):
+    return {'pending_kyc': 1} if record.status == 'pending' else {}
+
+
+def dispute_contributions(dispute):
+    return {'pending_disputes': 1} if dispute.status == 'open' else {}
+
+
+def transaction_contributions(tx):
+    if tx.transaction_type != 'withdrawal':
+        return {}
+    contributions = {}
+    if tx.status in PENDING_WITHDRAWAL_STATUSES:
+        contributions['pending_withdrawals'] = 1
+    if tx.created_at:
+        contributions[('withdrawals_today', _local_day(tx.created_at))] = 1
+    return contributions
+
+
+def diff(old, new):
+    delta = Counter(new)
+    delta.subtract(old)
+    return {name: value for name, value in delta.items() if value}
+
+
+def apply_delta(delta):
+    """Apply counter increments once the surrounding transaction commits"""
+    if delta:
+        transaction.on_commit(lambda: _apply(delta))
+
+
+def _apply(delta):
+    if not cache.get(READY_KEY):
+        return  # The next read rebuilds everything from the database
+
+    for name, value in delta.items():
+        if isinstance(name, tuple):
+            name, day = name
+            key = _key(name, day)
+            cache.add(key, 0, timeout=DAY_KEY_TIMEOUT)
+        else:
+            key = _key(name)
+        try:
+            cache.incr(key, value)
+        except ValueError:
+            # A counter was evicted; fall back to a rebuild on next read
+            mark_stale()
+            return
+
+
+def mark_stale():
+    cache.delete(READY_KEY)
+
+
+def recount():
+    """Recompute every counter from the database (cold start and drift repair)"""
+    from users.models import User, KYCRecord
+    from projects.models import EnterpriseProject
+    from tasks.models import TaskUnit
+    from wallet.models import WalletTransaction
+    from wallet.money import sum_minor_by_currency
+    from .models import DisputeCase
+
+    today = timezone.localdate()
+    start_of_day = timezone.make_aware(datetime.combine(today, time.min))
+
+    roles = User.objects.aggregate(
+        students=Count('id', filter=Q(role='student')),
+        enterprises=Count('id', filter=Q(role='enterprise')),
+    )
+    volume = sum_minor_by_currency(TaskUnit.objects.filter(status='completed'), 'pay_amount')
+
+    values = {
+        _key('total_students'): roles['students'],
+        _key('total_enterprises'): roles['enterprises'],
+        _key('total_projects'): EnterpriseProject.objects.count(),
+        _key('total_tasks_completed'): TaskUnit.objects.filter(status='completed').count(),
+        _key('pending_kyc'): KYCRecord.objects.filter(status='pending').count(),
+        _key('pending_disputes'): DisputeCase.objects.filter(status='open').count(),
+        _key('pending_withdrawals'): WalletTransaction.objects.filter(
+            transaction_type='withdrawal',
+            status__in=PENDING_WITHDRAWAL_STATUSES
+        ).count(),
+    }
+    for currency in set(_currencies()) | set(volume):
+        values[_key(_volume_counter(currency))] = volume.get(currency, 0)
+
+    day_values = {
+        _key('projects_today', today): EnterpriseProject.objects.filter(
+            created_at__gte=start_of_day
+        ).count(),
+        _key('tasks_today', today): TaskUnit.objects.filter(
+            created_at__gte=start_of_day
+        ).count(),
+        _key('withdrawals_today', today): WalletTransaction.objects.filter(
+            transaction_type='withdrawal',
+            created_at__gte=start_of_day
+        ).count(),
+    }
+
+    cache.set_many(values, timeout=None)
+    cache.set_many(day_values, timeout=DAY_KEY_TIMEOUT)
+    cache.set(READY_KEY, True, timeout=None)
+
+
+def read():
+    """
+    Current counter values. A handful of cache reads when warm; a full
+    recount only when the cache was cold or a counter went missing.
+    """
+    today = timezone.localdate()
+    names = {_key(name): name for name in GLOBAL_COUNTERS}
+    names.update({_key(name, today): name for name in DAILY_COUNTERS})
+    names.update({
+        _key(_volume_counter(currency)): _volume_counter(currency)
+        for currency in _currencies()
+    })
+
+    if not cache.get(READY_KEY):
+        recount()
+
+    stored = cache.get_many(list(names))
+    missing = [key for key in names if key not in stored]
+    if any(not key.endswith(today.isoformat()) for key in missing):
+        recount()
+        stored = cache.get_many(list(names))
+
+    values = {name: stored.get(key, 0) for key, name in names.items()}
+    volume = {}
+    for currency in _currencies():
+        minor = values.pop(_volume_counter(currency))
+        if minor:
+            volume[currency] = minor
+    values['volume_by_currency'] = volume
+    return values
@@ -0,0 +1,97 @@
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models.signals import post_init, post_save
+
+logger = logging.getLogger(__name__)
+
+ADMIN_FEED_GROUP = 'admin_feed'
+
+
+def publish(event, data):
+    """
+    Push an event to every connected admin once the current transaction
+    commits. A missing or unreachable channel layer never fails the caller.
+    """
+    def send():
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        try:
+            async_to_sync(channel_layer.group_send)(ADMIN_FEED_GROUP, {
+                'type': 'feed.event',
+                'event': event,
+                'data': data,
+            })
+        except Exception:
+            logger.exception("Could not publish admin feed event %s", event)
+
+    transaction.on_commit(send)
+
+
+def alert_created(alert):
+    publish('alert.created', {
+        'id': alert.id,
+        'title': alert.title,
+        'alert_type': alert.alert_type,
+        'severity': alert.severity,
+    })
+
+
+def kyc_submitted(record):
+    publish('kyc.submitted', {
+        'id': record.id,
+        'user_id': record.user_id,
+        'document_type': record.document_type,
+    })
+
+
+def dispute_opened(dispute):
+    publish('dispute.opened', {
+        'id': dispute.id,
+        'task_id': dispute.task_id,
+        'raised_by_id': dispute.raised_by_id,
+        'title': dispute.title,
+    })
+
+
+def withdrawal_status_changed(withdrawal):
+    publish('withdrawal.status_changed', {
+        'id': withdrawal.id,
+        'user_id': withdrawal.user_id,
+        'reference': withdrawal.reference,
+        'status': withdrawal.status,
+        'amount': str(withdrawal.amount.amount),
+        'currency': str(withdrawal.amount.currency),
+    })
+
+
+def connect():
+    """
+    Disputes have no single creating view and withdrawal status is saved
+    from several tasks, so those two are published from model signals.
+    """
+    from wallet.models import WalletTransaction
+    from .models import DisputeCase
+
+    def on_dispute_saved(sender, instance, created, raw=False, **kwargs):
+        if created and not raw:
+            dispute_opened(instance)
+
+    def on_transaction_init(sender, instance, **kwargs):
+        instance._feed_status = instance.__dict__.get('status')
+
+    def on_transaction_saved(sender, instance, created, raw=False, **kwargs):
+        if raw or instance.transaction_type != 'withdrawal':
+            return
+        if created or instance.status != getattr(instance, '_feed_status', None):
+            withdrawal_status_changed(instance)
+        instance._feed_status = instance.status
+
+    post_save.connect(on_dispute_saved, sender=DisputeCase, weak=False,
+                      dispatch_uid='admin_feed_dispute')
+    post_init.connect(on_transaction_init, sender=WalletTransaction, weak=False,
+                      dispatch_uid='admin_feed_withdrawal')
+    post_save.connect(on_transaction_saved, sender=WalletTransaction, weak=False,
+                      dispatch_uid='admin_feed_withdrawal')
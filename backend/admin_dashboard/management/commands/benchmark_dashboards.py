@@ -0,0 +1,188 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from djmoney.money import Money
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from admin_dashboard import views
+from admin_dashboard.caching import cache_key
+from projects.models import EnterpriseProject
+from tasks.models import TaskUnit
+from users.models import User
+from wallet.models import WalletTransaction, ExchangeRate
+from wallet.fx import invalidate_rates
+
+CURRENCIES = ('NGN', 'USD', 'KES', 'GHS')
+RATES_TO_NGN = {'USD': Decimal('1500'), 'KES': Decimal('11.5'), 'GHS': Decimal('100')}
+
+
+class Command(BaseCommand):
+    help = "Benchmark the admin dashboard endpoints over a mixed-currency ledger"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--transactions', type=int, default=20000)
+        parser.add_argument('--tasks', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--viewers', type=int, nargs='*', default=[1, 10, 50, 200],
+                            help='Concurrent admin tabs to simulate per refresh cycle')
+        parser.add_argument('--keep', action='store_true',
+                            help='Keep the generated rows instead of rolling them back')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            admin = self.seed(rng, options)
+            self.stdout.write(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+            for name, view in (
+                ('dashboard_stats', views.dashboard_stats),
+                ('financial_overview', views.financial_overview),
+                ('recent_activity', views.recent_activity),
+            ):
+                self.run_view(name, view, admin, options['repeat'])
+                for viewers in options['viewers']:
+                    self.run_viewers(name, view, admin, viewers)
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        invalidate_rates()
+
+    def seed(self, rng, options):
+        for currency, rate in RATES_TO_NGN.items():
+            ExchangeRate.objects.update_or_create(
+                source_currency=currency, target_currency='NGN', defaults={'rate': rate}
+            )
+
+        admin = User.objects.create_user(
+            username=f'bench_admin_{rng.randrange(10**9)}', password=None, role='admin'
+        )
+
+        users = []
+        for i in range(options['users']):
+            user = User(
+                username=f'bench_{rng.randrange(10**9)}_{i}',
+                role=rng.choice(['student', 'student', 'student', 'enterprise']),
+                wallet_balance=Money(rng.randint(0, 500000) / 100, rng.choice(CURRENCIES)),
+            )
+            user.sync_minor_units()
+            users.append(user)
+        users = User.objects.bulk_create(users, batch_size=1000)
+        enterprises = [u for u in users if u.role == 'enterprise'] or [admin]
+
+        projects = []
+        for i in range(max(1, options['users'] // 10)):
+            project = EnterpriseProject(
+                client=rng.choice(enterprises),
+                title=f'Bench project {i}',
+                description='Benchmark project',
+                total_amount=Money(rng.randint(1000, 10**6), rng.choice(CURRENCIES)),
+                escrow_locked=rng.random() < 0.7,
+                status='active',
+            )
+            project.sync_minor_units()
+            projects.append(project)
+        projects = EnterpriseProject.objects.bulk_create(projects, batch_size=1000)
+
+        tasks = []
+        for i in range(options['tasks']):
+            project = projects[i % len(projects)]
+            task = TaskUnit(
+                project=project,
+                unit_index=i,
+                title=f'Bench task {i}',
+                description='Benchmark task',
+                type='digital',
+                pay_amount=Money(rng.randint(100, 50000) / 100, project.total_amount.currency),
+                status=rng.choice(['available', 'assigned', 'completed', 'completed']),
+            )
+            task.sync_minor_units()
+            tasks.append(task)
+        TaskUnit.objects.bulk_create(tasks, batch_size=2000)
+
+        transactions = []
+        for i in range(options['transactions']):
+            tx = WalletTransaction(
+                user=rng.choice(users),
+                amount=Money(rng.randint(100, 10**6) / 100, rng.choice(CURRENCIES)),
+                transaction_type=rng.choice([t for t, _ in WalletTransaction.TRANSACTION_TYPES]),
+                status=rng.choice(['completed', 'completed', 'completed', 'pending', 'failed']),
+                reference=f'BENCH_{rng.randrange(10**12)}_{i}',
+            )
+            tx.sync_minor_units()
+            transactions.append(tx)
+        transactions = WalletTransaction.objects.bulk_create(transactions, batch_size=2000)
+
+        # Spread the ledger over the last 60 days
+        now = timezone.now()
+        ids = [tx.pk for tx in transactions]
+        for day in range(60):
+            WalletTransaction.objects.filter(pk__in=ids[day::60]).update(
+                created_at=now - timedelta(days=day, minutes=rng.randint(0, 600))
+            )
+
+        return admin
+
+    def run_view(self, name, view, user, repeat):
+        factory = APIRequestFactory()
+        timings = []
+        queries = 0
+
+        for _ in range(repeat):
+            request = factory.get('/')
+            force_authenticate(request, user=user)
+            cache.delete(cache_key(name, request))  # Time the computation, not the response cache
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = view(request)
+                response.render()
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = len(ctx.captured_queries)
+
+        self.stdout.write(
+            f"{name:<20} mean {statistics.mean(timings):8.2f} ms  "
+            f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:8.2f} ms  "
+            f"queries {queries}"
+        )
+
+    def run_viewers(self, name, view, user, viewers):
+        """
+        One refresh cycle of `viewers` admin tabs polling the same endpoint.
+        Half of them already hold the last ETag. With the response cache the
+        database work stays at one computation however many tabs there are.
+        """
+        factory = APIRequestFactory()
+        etag = None
+        queries = 0
+        not_modified = 0
+
+        cache.delete(cache_key(name, factory.get('/')))
+
+        started = time.perf_counter()
+        for i in range(viewers):
+            headers = {'HTTP_IF_NONE_MATCH': etag} if etag and i % 2 else {}
+            request = factory.get('/', **headers)
+            force_authenticate(request, user=user)
+            with CaptureQueriesContext(connection) as ctx:
+                response = view(request)
+                response.render()
+            queries += len(ctx.captured_queries)
+            etag = response.get('ETag', etag)
+            not_modified += response.status_code == 304
+        elapsed = (time.perf_counter() - started) * 1000
+
+        self.stdout.write(
+            f"{name:<20} viewers {viewers:4d}  total {elapsed:8.2f} ms  "
+            f"queries {queries:4d}  304s {not_modified}"
+        )
@@ -0,0 +1,43 @@
+import os
+import time
+from django.core.management.base import BaseCommand
+
+from admin_dashboard.seeding import DEFAULT_PASSWORD, LoadSeeder
+
+
+class Command(BaseCommand):
+    help = "Generate a large, deterministic dataset for profiling (users, projects, tasks, validations, ledger)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--projects', type=int, default=None, help='Defaults to users / 20')
+        parser.add_argument('--tasks', type=int, default=None, help='Defaults to users * 5')
+        parser.add_argument('--transactions', type=int, default=None, help='Defaults to users * 10')
+        parser.add_argument('--days', type=int, default=180, help='History the rows are spread over')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Processes writing chunks (forced to 1 on SQLite)')
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--password', default=DEFAULT_PASSWORD, help='Password of every generated user')
+        parser.add_argument('--skip-derived', action='store_true',
+                            help="Don't rebuild task stats, reputation, counters, rollups and the search index")
+
+    def handle(self, *args, **options):
+        seeder = LoadSeeder(
+            seed=options['seed'],
+            users=options['users'],
+            projects=options['projects'],
+            tasks=options['tasks'],
+            transactions=options['transactions'],
+            days=options['days'],
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            password=options['password'],
+            progress=self.stdout.write,
+        )
+        started = time.perf_counter()
+        created = seeder.run(derive=not options['skip_derived'])
+        self.stdout.write(
+            f"Created {sum(created.values())} rows with {seeder.workers} workers "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
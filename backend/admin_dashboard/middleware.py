@@ -0,0 +1,29 @@
+from urllib.parse import parse_qs
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+
+
+@database_sync_to_async
+def get_user_for_token(raw_token):
+    from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+    from users.authentication import CachedJWTAuthentication
+
+    auth = CachedJWTAuthentication()
+    try:
+        return auth.get_user(auth.get_validated_token(raw_token))
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return AnonymousUser()
+
+
+class JWTQueryAuthMiddleware(BaseMiddleware):
+    """
+    Authenticate websocket connections from a `token` query parameter
+    holding a SimpleJWT access token (browsers can't set headers on ws://)
+    """
+
+    async def __call__(self, scope, receive, send):
+        query = parse_qs(scope.get('query_string', b'').decode())
+        token = query.get('token', [None])[0]
+        scope['user'] = await get_user_for_token(token) if token else AnonymousUser()
+        return await super().__call__(scope, receive, send)
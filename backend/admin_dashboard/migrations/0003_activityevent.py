@@ -0,0 +1,74 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL_PER_TYPE = 100
+
+# entity_type, app label, model, summary field, actor field, status field
+BACKFILL_SOURCES = (
+    ('user', 'users', 'User', 'username', 'id', None),
+    ('project', 'projects', 'EnterpriseProject', 'title', 'client_id', 'status'),
+    ('task', 'tasks', 'TaskUnit', 'title', 'assigned_to_id', 'status'),
+    ('transaction', 'wallet', 'WalletTransaction', 'reference', 'user_id', 'status'),
+    ('kyc', 'users', 'KYCRecord', 'document_type', 'user_id', 'status'),
+    ('dispute', 'admin_dashboard', 'DisputeCase', 'title', 'raised_by_id', 'status'),
+    ('alert', 'admin_dashboard', 'SystemAlert', 'title', None, None),
+)
+
+
+def backfill_activity(apps, schema_editor):
+    """Seed the feed with the latest rows of each type so it isn't empty on deploy"""
+    ActivityEvent = apps.get_model('admin_dashboard', 'ActivityEvent')
+    events = []
+    for entity_type, app_label, model_name, label_field, actor_field, status_field in BACKFILL_SOURCES:
+        model = apps.get_model(app_label, model_name)
+        date_field = 'date_joined' if model_name == 'User' else 'created_at'
+        for row in model.objects.order_by(f'-{date_field}')[:BACKFILL_PER_TYPE]:
+            status = getattr(row, status_field) if status_field else ''
+            events.append(ActivityEvent(
+                entity_type=entity_type,
+                entity_id=row.pk,
+                verb='created',
+                status=status,
+                summary=f"{model._meta.verbose_name.capitalize()} {getattr(row, label_field)}"[:255],
+                actor_id=getattr(row, actor_field) if actor_field else None,
+                created_at=getattr(row, date_field),
+            ))
+    ActivityEvent.objects.bulk_create(events, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0002_audit_dedupe_id'),
+        ('users', '0004_kycrecord_derivatives'),
+        ('projects', '0003_audit_dedupe_id'),
+        ('tasks', '0003_taskunit_pay_amount_minor'),
+        ('wallet', '0006_transactionrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('user', 'User'), ('project', 'Project'), ('task', 'Task'), ('transaction', 'Transaction'), ('kyc', 'KYC Record'), ('dispute', 'Dispute'), ('alert', 'System Alert')], max_length=20)),
+                ('entity_id', models.PositiveBigIntegerField()),
+                ('verb', models.CharField(max_length=20)),
+                ('status', models.CharField(blank=True, max_length=20)),
+                ('summary', models.CharField(max_length=255)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='admin_dashb_created_96a78a_idx'), models.Index(fields=['entity_type', '-created_at', '-id'], name='admin_dashb_entity__73b74f_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_activity, migrations.RunPython.noop),
+    ]
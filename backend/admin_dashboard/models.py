@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -75,7 +76,8 @@ class AuditLog(models.Model):
     resource_id = models.CharField(max_length=100, blank=True)  # ID of the affected resource
     resource_type = models.CharField(max_length=50, blank=True)  # Type of resource
     metadata = models.JSONField(default=dict, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    dedupe_id = models.CharField(max_length=32, unique=True, null=True, blank=True, editable=False)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-created_at']
@@ -127,4 +129,36 @@ class DisputeCase(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"Dispute: {self.title} - {self.status}"
\ No newline at end of file
+        return f"Dispute: {self.title} - {self.status}"
+
+
+class ActivityEvent(models.Model):
+    """Append-only feed of key platform transitions, newest first"""
+    ENTITY_TYPES = (
+        ('user', 'User'),
+        ('project', 'Project'),
+        ('task', 'Task'),
+        ('transaction', 'Transaction'),
+        ('kyc', 'KYC Record'),
+        ('dispute', 'Dispute'),
+        ('alert', 'System Alert'),
+    )
+    
+    entity_type = models.CharField(max_length=20, choices=ENTITY_TYPES)
+    entity_id = models.PositiveBigIntegerField()
+    verb = models.CharField(max_length=20)  # 'created' or 'status_changed'
+    status = models.CharField(max_length=20, blank=True)
+    summary = models.CharField(max_length=255)
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='activity_events')
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['entity_type', '-created_at', '-id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.entity_type} #{self.entity_id} {self.verb}: {self.summary}"
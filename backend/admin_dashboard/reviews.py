@@ -0,0 +1,120 @@
+from collections import Counter
+from types import SimpleNamespace
+from django.db import transaction
+from django.utils import timezone
+
+from . import activity, audit, counters
+
+RESOLVABLE_DISPUTE_STATUSES = ('open', 'under_review', 'escalated')
+
+
+def _counter_delta(contributions, instances, previous_statuses):
+    """Sum the counter changes the signal handlers would have applied one by one"""
+    delta = Counter()
+    for instance in instances:
+        old = contributions(SimpleNamespace(status=previous_statuses[instance.pk]))
+        delta.update(counters.diff(old, contributions(instance)))
+    return {name: value for name, value in delta.items() if value}
+
+
+def _review_kyc(ids, admin, status, reason=''):
+    """
+    Move pending KYC records to approved/rejected with one bulk_update.
+    Returns (updated_ids, skipped_ids); ids that are missing or no longer
+    pending are skipped.
+    """
+    from users.authentication import invalidate_principals
+    from users.models import User, KYCRecord
+
+    now = timezone.now()
+    with transaction.atomic():
+        records = list(
+            KYCRecord.objects.select_for_update(of=('self',))
+            .select_related('user')
+            .filter(id__in=ids, status='pending')
+        )
+        previous = {record.pk: record.status for record in records}
+
+        for record in records:
+            record.status = status
+            record.verified_by = admin
+            record.verified_at = now
+            if status == 'rejected':
+                record.metadata['rejection_reason'] = reason
+        KYCRecord.objects.bulk_update(
+            records, ['status', 'verified_by', 'verified_at', 'metadata'], batch_size=500
+        )
+
+        if status == 'approved':
+            user_ids = {r.user_id for r in records}
+            User.objects.filter(id__in=user_ids).update(kyc_completed=True)
+            # After commit, or a concurrent request could re-cache the old row
+            transaction.on_commit(lambda: invalidate_principals(user_ids))
+
+        action = 'kyc_approved' if status == 'approved' else 'kyc_rejected'
+        audit.admin_actions(admin, action, [
+            {
+                'description': (
+                    f'Approved KYC for user {record.user.username}' if status == 'approved'
+                    else f'Rejected KYC for user {record.user.username}. Reason: {reason}'
+                ),
+                'resource_id': str(record.user_id),
+                'resource_type': 'user',
+            }
+            for record in records
+        ])
+        activity.record_bulk_transitions('kyc', records, previous)
+        counters.apply_delta(_counter_delta(counters.kyc_contributions, records, previous))
+
+    updated = sorted(record.pk for record in records)
+    return updated, sorted(set(ids) - set(updated))
+
+
+def approve_kyc_records(ids, admin):
+    return _review_kyc(ids, admin, 'approved')
+
+
+def reject_kyc_records(ids, admin, reason=''):
+    return _review_kyc(ids, admin, 'rejected', reason)
+
+
+def resolve_disputes(ids, admin, resolution, resolution_notes):
+    """Resolve unresolved disputes with one bulk_update. Returns (updated_ids, skipped_ids)"""
+    from tasks import reputation
+    from .models import DisputeCase
+
+    now = timezone.now()
+    with transaction.atomic():
+        disputes = list(
+            DisputeCase.objects.select_for_update()
+            .filter(id__in=ids, status__in=RESOLVABLE_DISPUTE_STATUSES)
+        )
+        previous = {dispute.pk: dispute.status for dispute in disputes}
+
+        for dispute in disputes:
+            dispute.status = 'resolved'
+            dispute.resolution = resolution
+            dispute.resolution_notes = resolution_notes
+            dispute.resolved_by = admin
+            dispute.resolved_at = now
+            dispute.updated_at = now
+        DisputeCase.objects.bulk_update(
+            disputes,
+            ['status', 'resolution', 'resolution_notes', 'resolved_by', 'resolved_at', 'updated_at'],
+            batch_size=500
+        )
+
+        audit.admin_actions(admin, 'dispute_resolved', [
+            {
+                'description': f'Resolved dispute #{dispute.id} with resolution: {resolution}',
+                'resource_id': str(dispute.id),
+                'resource_type': 'dispute',
+            }
+            for dispute in disputes
+        ])
+        activity.record_bulk_transitions('dispute', disputes, previous)
+        reputation.disputes_resolved(disputes)
+        counters.apply_delta(_counter_delta(counters.dispute_contributions, disputes, previous))
+
+    updated = sorted(dispute.pk for dispute in disputes)
+    return updated, sorted(set(ids) - set(updated))
@@ -0,0 +1,493 @@
+import hashlib
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from functools import partial
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from djmoney.money import Money
+
+DEFAULT_PASSWORD = 'load-test-pass'
+
+# Share of users holding each wallet currency
+CURRENCY_WEIGHTS = (('NGN', 85), ('USD', 6), ('KES', 5), ('GHS', 4))
+ENTERPRISE_EVERY = 12  # Every 12th user is an enterprise, the rest students
+VERIFIED_SHARE = 0.7
+KYC_SHARE = 0.4
+
+PROJECT_STATUS_WEIGHTS = (
+    ('draft', 5), ('funded', 5), ('processing', 5), ('active', 50), ('completed', 30), ('cancelled', 5),
+)
+TASK_STATUS_WEIGHTS = (
+    ('pending', 5), ('available', 22), ('assigned', 10), ('submitted', 8),
+    ('verifying', 5), ('completed', 43), ('failed', 4), ('disputed', 3),
+)
+TASK_TYPE_WEIGHTS = (('digital', 70), ('physical', 20), ('hybrid', 10))
+VALIDATED_STATUSES = ('submitted', 'verifying', 'completed', 'failed', 'disputed')
+MAX_VALIDATIONS = 3
+
+STUDENT_TRANSACTION_WEIGHTS = (('task_payment', 60), ('withdrawal', 30), ('advance', 5), ('refund', 5))
+ENTERPRISE_TRANSACTION_WEIGHTS = (('deposit', 45), ('escrow_funding', 35), ('escrow_release', 15), ('refund', 5))
+STUDENT_TRANSACTION_SHARE = 0.7
+TRANSACTION_STATUS_WEIGHTS = (
+    ('completed', 80), ('pending', 8), ('processing', 3), ('failed', 7), ('cancelled', 2),
+)
+LEDGER_ROWS_PER_PROJECT = 6  # One funding row plus up to five payouts or a refund
+
+
+def _unit(seed, tag, index):
+    """A stable pseudo-random number in [0, 1) for (seed, tag, index)"""
+    digest = hashlib.blake2b(f'{seed}:{tag}:{index}'.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') / 2 ** 64
+
+
+def _amount(value, cap):
+    return Decimal(str(round(min(value, cap), 2)))
+
+
+def _weighted(rng, weights):
+    return rng.choices([value for value, _ in weights], [weight for _, weight in weights])[0]
+
+
+def _pick_weighted(fraction, weights):
+    total = sum(weight for _, weight in weights)
+    point = fraction * total
+    for value, weight in weights:
+        point -= weight
+        if point < 0:
+            return value
+    return weights[-1][0]
+
+
+class Layout:
+    """
+    Row counts, primary key bases and the time span of one load. Every row's
+    pk, owner and timestamp follow from its index and the seed, so chunks can
+    be generated by any worker in any order and still give the same data.
+    """
+
+    def __init__(self, seed, users, projects, tasks, transactions, days, end, bases, password):
+        self.seed = seed
+        self.users = users
+        self.projects = projects
+        self.tasks = tasks
+        self.transactions = transactions
+        self.start = end - timedelta(days=days)
+        self.span = end - self.start
+        self.bases = bases
+        self.password = password  # One shared hash; hashing millions would dominate the run
+
+    def at(self, fraction):
+        return self.start + self.span * min(max(fraction, 0.0), 1.0)
+
+    # Users: created evenly over the span, pk order is creation order
+    def user_pk(self, index):
+        return self.bases['user'] + index
+
+    def is_enterprise(self, index):
+        return index % ENTERPRISE_EVERY == 0
+
+    def is_verified(self, index):
+        return _unit(self.seed, 'verified', index) < VERIFIED_SHARE
+
+    def currency(self, index):
+        return _pick_weighted(_unit(self.seed, 'currency', index), CURRENCY_WEIGHTS)
+
+    def _known_by(self, fraction):
+        """Number of users that exist at `fraction` of the span"""
+        return max(1, min(self.users, math.ceil(self.users * fraction)))
+
+    def pick_student(self, rng, fraction):
+        # Older accounts are the busier ones
+        index = int(self._known_by(fraction) * rng.random() ** 1.5)
+        if self.is_enterprise(index):
+            index = index + 1 if index + 1 < self.users else max(0, index - 1)
+        return index
+
+    def pick_enterprise(self, rng, fraction):
+        enterprises = max(1, math.ceil(self._known_by(fraction) / ENTERPRISE_EVERY))
+        return int(enterprises * rng.random() ** 1.5) * ENTERPRISE_EVERY
+
+    # Projects: created evenly over the first 80% of the span
+    def project_pk(self, index):
+        return self.bases['project'] + index
+
+    def project_fraction(self, index):
+        return 0.8 * index / max(1, self.projects)
+
+    def project_client(self, index):
+        rng = random.Random(f'{self.seed}:client:{index}')
+        return self.pick_enterprise(rng, self.project_fraction(index))
+
+    # Tasks: task i is unit i // projects of project i % projects
+    def task_pk(self, index):
+        return self.bases['task'] + index
+
+
+def _models():
+    from projects.models import EnterpriseProject
+    from tasks.models import TaskUnit, TaskValidation
+    from users.models import User, UserProfile
+    from wallet.models import EscrowLedger, WalletTransaction
+
+    return {
+        'user': User, 'profile': UserProfile, 'project': EnterpriseProject, 'ledger': EscrowLedger,
+        'task': TaskUnit, 'validation': TaskValidation, 'transaction': WalletTransaction,
+    }
+
+
+@contextmanager
+def _explicit_timestamps(*models):
+    """Let bulk_create keep the created_at/updated_at values we generate"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _seed_users(layout, rng, start, stop):
+    models = _models()
+    User, UserProfile = models['user'], models['profile']
+
+    users, profiles = [], []
+    for index in range(start, stop):
+        pk = layout.user_pk(index)
+        joined = layout.at(index / layout.users)
+        enterprise = layout.is_enterprise(index)
+        currency = layout.currency(index)
+        balance = 0 if rng.random() < 0.3 else _amount(rng.lognormvariate(8, 1.5), 10 ** 9)
+        user = User(
+            pk=pk,
+            username=f'load_{pk}',
+            email=f'load_{pk}@example.com',
+            phone=f'+2347{pk:09d}',
+            password=layout.password,
+            role='enterprise' if enterprise else 'student',
+            is_verified=layout.is_verified(index),
+            kyc_completed=rng.random() < KYC_SHARE,
+            wallet_balance=Money(balance, currency),
+            tier=1,
+            date_joined=joined,
+            created_at=joined,
+            updated_at=joined,
+        )
+        user.sync_minor_units()
+        user.sync_phone()
+        users.append(user)
+        profiles.append(UserProfile(
+            pk=layout.bases['profile'] + index,
+            user_id=pk,
+            student_id=None if enterprise else f'STU{pk}',
+        ))
+
+    with _explicit_timestamps(User):
+        User.objects.bulk_create(users, batch_size=1000)
+    UserProfile.objects.bulk_create(profiles, batch_size=1000)
+    return len(users)
+
+
+def _seed_projects(layout, rng, start, stop):
+    models = _models()
+    EnterpriseProject, EscrowLedger = models['project'], models['ledger']
+
+    projects, entries = [], []
+    for index in range(start, stop):
+        pk = layout.project_pk(index)
+        client = layout.project_client(index)
+        created = layout.at(layout.project_fraction(index))
+        status = _weighted(rng, PROJECT_STATUS_WEIGHTS)
+        total = _amount(rng.lognormvariate(12, 1.2), 10 ** 9)
+        locked = status in ('funded', 'processing', 'active', 'completed')
+        project = EnterpriseProject(
+            pk=pk,
+            client_id=layout.user_pk(client),
+            title=f'Load project {pk}',
+            description='Generated by seed_load',
+            task_type=_weighted(rng, TASK_TYPE_WEIGHTS),
+            total_amount=Money(total, layout.currency(client)),
+            escrow_locked=locked,
+            status=status,
+            created_at=created,
+            updated_at=created,
+        )
+        project.sync_minor_units()
+        projects.append(project)
+
+        if not locked and status != 'cancelled':
+            continue
+        ledger_pk = layout.bases['ledger'] + index * LEDGER_ROWS_PER_PROJECT
+        rows = [('funding', total)]
+        if status == 'cancelled':
+            rows.append(('refund', total))
+        else:
+            payouts = rng.randint(0, LEDGER_ROWS_PER_PROJECT - 1)
+            rows += [('payout', _amount(float(total) * rng.random() / (payouts + 1), 10 ** 9)) for _ in range(payouts)]
+        for offset, (kind, amount) in enumerate(rows):
+            entry = EscrowLedger(
+                pk=ledger_pk + offset,
+                project_id=pk,
+                amount=Money(amount, layout.currency(client)),
+                transaction_type=kind,
+                reference=f'LOAD-ESC-{ledger_pk + offset}',
+                created_at=created + timedelta(hours=offset * rng.uniform(1, 72)),
+            )
+            entry.sync_minor_units()
+            entries.append(entry)
+
+    with _explicit_timestamps(EnterpriseProject, EscrowLedger):
+        EnterpriseProject.objects.bulk_create(projects, batch_size=1000)
+        EscrowLedger.objects.bulk_create(entries, batch_size=1000)
+    return len(projects)
+
+
+def _validation_statuses(rng, task_status, count):
+    if task_status == 'completed':
+        return ['rejected' if rng.random() < 0.1 else 'approved' for _ in range(count)]
+    if task_status == 'failed':
+        return ['approved' if rng.random() < 0.1 else 'rejected' for _ in range(count)]
+    if task_status == 'disputed':
+        return [rng.choice(('approved', 'rejected')) for _ in range(count)]
+    return [rng.choice(('pending', 'pending', 'approved', 'rejected')) for _ in range(count)]
+
+
+def _seed_tasks(layout, rng, start, stop):
+    models = _models()
+    TaskUnit, TaskValidation = models['task'], models['validation']
+
+    tasks, validations = [], []
+    for index in range(start, stop):
+        pk = layout.task_pk(index)
+        project = index % layout.projects
+        project_fraction = layout.project_fraction(project)
+        fraction = project_fraction + (1 - project_fraction) * rng.random() * 0.5
+        created = layout.at(fraction)
+        status = _weighted(rng, TASK_STATUS_WEIGHTS)
+        task_type = _weighted(rng, TASK_TYPE_WEIGHTS)
+        currency = layout.currency(layout.project_client(project))
+
+        task = TaskUnit(
+            pk=pk,
+            project_id=layout.project_pk(project),
+            unit_index=index // layout.projects,
+            title=f'Load task {pk}',
+            description='Generated by seed_load',
+            type=task_type,
+            pay_amount=Money(_amount(rng.lognormvariate(7, 0.8), 10 ** 6), currency),
+            estimated_time_seconds=rng.choice((600, 900, 1800, 3600, 7200)),
+            payload={'items': rng.randint(1, 50)},
+            verification_strategy='supervisor' if task_type == 'physical' else 'peer_consensus',
+            status=status,
+            created_at=created,
+        )
+        task.sync_minor_units()
+
+        assignee = None
+        if status not in ('pending', 'available'):
+            assignee = layout.pick_student(rng, fraction)
+            task.assigned_to_id = layout.user_pk(assignee)
+            task.assigned_at = created + timedelta(hours=rng.uniform(0.1, 72))
+        if status in VALIDATED_STATUSES:
+            task.submitted_at = task.assigned_at + timedelta(seconds=task.estimated_time_seconds * rng.uniform(0.3, 3))
+            task.submission_data = {'answer': rng.randint(0, 10 ** 6)}
+        if status == 'completed':
+            task.completed_at = task.submitted_at + timedelta(hours=rng.uniform(0.5, 48))
+        tasks.append(task)
+
+        if status not in VALIDATED_STATUSES:
+            continue
+        wanted = rng.randint(0 if status == 'submitted' else 1, MAX_VALIDATIONS)
+        validators = set()
+        for _ in range(wanted * 3):
+            if len(validators) == wanted:
+                break
+            candidate = layout.pick_student(rng, fraction)
+            if candidate != assignee and layout.is_verified(candidate):
+                validators.add(candidate)
+        statuses = _validation_statuses(rng, status, len(validators))
+        for offset, (validator, validation_status) in enumerate(zip(sorted(validators), statuses)):
+            validated = task.submitted_at + timedelta(hours=rng.uniform(0.1, 24))
+            validations.append(TaskValidation(
+                pk=layout.bases['validation'] + index * MAX_VALIDATIONS + offset,
+                task_unit_id=pk,
+                validator_id=layout.user_pk(validator),
+                status=validation_status,
+                created_at=validated,
+                updated_at=validated,
+            ))
+
+    with _explicit_timestamps(TaskUnit, TaskValidation):
+        TaskUnit.objects.bulk_create(tasks, batch_size=1000)
+        TaskValidation.objects.bulk_create(validations, batch_size=1000)
+    return len(tasks)
+
+
+def _seed_transactions(layout, rng, start, stop):
+    WalletTransaction = _models()['transaction']
+
+    transactions = []
+    for index in range(start, stop):
+        pk = layout.bases['transaction'] + index
+        # The ledger grows over time, so ids and timestamps rise together
+        fraction = (index + rng.random()) / layout.transactions
+        created = layout.at(fraction)
+        if rng.random() < STUDENT_TRANSACTION_SHARE:
+            user = layout.pick_student(rng, fraction)
+            kind = _weighted(rng, STUDENT_TRANSACTION_WEIGHTS)
+        else:
+            user = layout.pick_enterprise(rng, fraction)
+            kind = _weighted(rng, ENTERPRISE_TRANSACTION_WEIGHTS)
+        status = _weighted(rng, TRANSACTION_STATUS_WEIGHTS)
+        mean = 9 if kind in ('deposit', 'escrow_funding', 'escrow_release') else 7
+        tx = WalletTransaction(
+            pk=pk,
+            user_id=layout.user_pk(user),
+            amount=Money(_amount(rng.lognormvariate(mean, 1.2), 10 ** 9), layout.currency(user)),
+            transaction_type=kind,
+            status=status,
+            reference=f'LOAD-{pk}',
+            created_at=created,
+            completed_at=created + timedelta(minutes=rng.uniform(1, 600)) if status == 'completed' else None,
+        )
+        tx.sync_minor_units()
+        transactions.append(tx)
+
+    with _explicit_timestamps(WalletTransaction):
+        WalletTransaction.objects.bulk_create(transactions, batch_size=1000)
+    return len(transactions)
+
+
+PHASES = {
+    'users': _seed_users,
+    'projects': _seed_projects,
+    'tasks': _seed_tasks,
+    'transactions': _seed_transactions,
+}
+
+
+def _run_chunk(layout, phase, chunk_size, chunk):
+    start = chunk * chunk_size
+    stop = min(start + chunk_size, getattr(layout, phase))
+    rng = random.Random(f'{layout.seed}:{phase}:{chunk}')
+    with transaction.atomic():
+        return PHASES[phase](layout, rng, start, stop)
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def _next_pk(model):
+    return (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+class LoadSeeder:
+    """
+    Generate a large, internally consistent dataset: users with profiles,
+    projects with escrow ledger rows, task units in every status with their
+    validations, and wallet transactions. Each phase is split into chunks
+    written with bulk_create across a process pool; each chunk has its own
+    RNG seeded from (seed, phase, chunk), so the output depends only on the
+    seed and the counts, not on the number of workers.
+
+    bulk_create sends no signals, so the derived tables (task stats,
+    reputation, dashboard counters, rollups, the search index) are rebuilt
+    once at the end.
+    """
+
+    def __init__(self, seed=42, users=10000, projects=None, tasks=None, transactions=None,
+                 days=180, chunk_size=5000, workers=1, password=DEFAULT_PASSWORD, end=None,
+                 progress=None):
+        if connection.vendor == 'sqlite':
+            workers = 1  # SQLite takes one writer at a time
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.progress = progress or (lambda message: None)
+
+        models = _models()
+        bases = {name: _next_pk(model) for name, model in models.items()}
+        projects = projects if projects is not None else max(1, users // 20)
+        self.layout = Layout(
+            seed=seed,
+            users=max(ENTERPRISE_EVERY, users),
+            projects=max(1, projects),
+            tasks=tasks if tasks is not None else users * 5,
+            transactions=transactions if transactions is not None else users * 10,
+            days=days,
+            end=end or timezone.now(),
+            bases=bases,
+            password=make_password(password),
+        )
+
+    def run(self, derive=True):
+        created = {}
+        pool = None
+        if self.workers > 1:
+            # Forked workers must open their own connections
+            connections.close_all()
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        mapper = map if pool is None else pool.map
+        try:
+            # Phases run in order so foreign keys always point at committed rows
+            for phase in PHASES:
+                chunks = range(math.ceil(getattr(self.layout, phase) / self.chunk_size))
+                created[phase] = sum(mapper(partial(_run_chunk, self.layout, phase, self.chunk_size), chunks))
+                self.progress(f"{phase}: {created[phase]}")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        self._reset_sequences()
+        self._update_project_units()
+        if derive:
+            self.derive()
+        return created
+
+    def _reset_sequences(self):
+        statements = connection.ops.sequence_reset_sql(no_style(), list(_models().values()))
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def _update_project_units(self):
+        models = _models()
+        TaskUnit, EnterpriseProject = models['task'], models['project']
+        layout = self.layout
+
+        units = TaskUnit.objects.filter(project=OuterRef('pk')).order_by().values('project')
+        EnterpriseProject.objects.filter(
+            pk__gte=layout.bases['project'], pk__lt=layout.bases['project'] + layout.projects
+        ).update(
+            total_units=Coalesce(Subquery(units.annotate(n=Count('pk')).values('n')), 0),
+            completed_units=Coalesce(Subquery(
+                units.annotate(n=Count('pk', filter=Q(status='completed'))).values('n')
+            ), 0),
+        )
+
+    def derive(self):
+        from tasks import reputation, stats
+        from users.search import rebuild_search_index
+        from wallet.rollups import build_rollups
+        from . import counters
+
+        self.progress(f"task stats: {stats.recompute()}")
+        self.progress(f"reputation: {reputation.recompute()}")
+        counters.recount()
+        hours = int(self.layout.span.total_seconds() // 3600) + 1
+        self.progress(f"rollups: {build_rollups(hours=hours, window_hours=24)}")
+        rebuild_search_index()
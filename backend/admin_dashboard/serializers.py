@@ -1,7 +1,9 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from .models import AdminDashboard, SystemAlert, AuditLog, DisputeCase
+from .models import AdminDashboard, SystemAlert, AuditLog, DisputeCase, ActivityEvent
 from users.models import User, KYCRecord
+from users.images import derivative_urls
 from projects.models import EnterpriseProject
 from tasks.models import TaskUnit
 from wallet.models import WalletTransaction
@@ -14,7 +16,12 @@ class DashboardStatsSerializer(serializers.Serializer):
     total_enterprises = serializers.IntegerField()
     total_projects = serializers.IntegerField()
     total_tasks_completed = serializers.IntegerField()
+    reporting_currency = serializers.CharField()
     total_volume_processed = serializers.DecimalField(max_digits=12, decimal_places=2)
+    volume_by_currency = serializers.DictField(
+        child=serializers.DecimalField(max_digits=14, decimal_places=2)
+    )
+    unconverted_currencies = serializers.ListField(child=serializers.CharField())
     platform_earnings = serializers.DecimalField(max_digits=12, decimal_places=2)
     pending_kyc = serializers.IntegerField()
     pending_disputes = serializers.IntegerField()
@@ -59,6 +66,21 @@ class DisputeResolutionSerializer(serializers.Serializer):
     resolution = serializers.ChoiceField(choices=DisputeCase.RESOLUTION_CHOICES)
     resolution_notes = serializers.CharField(required=True)
 
+class BulkIdsField(serializers.ListField):
+    child = serializers.IntegerField(min_value=1)
+    
+    def __init__(self, **kwargs):
+        kwargs.setdefault('allow_empty', False)
+        kwargs.setdefault('max_length', getattr(settings, 'ADMIN_BULK_MAX_IDS', 1000))
+        super().__init__(**kwargs)
+
+class BulkKYCReviewSerializer(serializers.Serializer):
+    ids = BulkIdsField()
+    reason = serializers.CharField(required=False, allow_blank=True, default='')
+
+class BulkDisputeResolutionSerializer(DisputeResolutionSerializer):
+    ids = BulkIdsField()
+
 class UserManagementSerializer(serializers.ModelSerializer):
     profile = serializers.SerializerMethodField()
     
@@ -79,10 +101,15 @@ class UserManagementSerializer(serializers.ModelSerializer):
 class KYCReviewSerializer(serializers.ModelSerializer):
     user_username = serializers.CharField(source='user.username', read_only=True)
     user_email = serializers.CharField(source='user.email', read_only=True)
+    derivative_urls = serializers.SerializerMethodField()
     
     class Meta:
         model = KYCRecord
         fields = '__all__'
+    
+    def get_derivative_urls(self, obj):
+        # Reviewers should load these; the originals are for zooming in
+        return derivative_urls(obj, self.context.get('request'))
 
 class ProjectManagementSerializer(serializers.ModelSerializer):
     client_username = serializers.CharField(source='client.username', read_only=True)
@@ -94,14 +121,27 @@ class ProjectManagementSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 class FinancialOverviewSerializer(serializers.Serializer):
+    reporting_currency = serializers.CharField()
     total_escrow_balance = serializers.DecimalField(max_digits=14, decimal_places=2)
     total_wallet_balances = serializers.DecimalField(max_digits=14, decimal_places=2)
     total_withdrawals_today = serializers.DecimalField(max_digits=14, decimal_places=2)
     total_deposits_today = serializers.DecimalField(max_digits=14, decimal_places=2)
+    totals_by_currency = serializers.DictField(
+        child=serializers.DictField(child=serializers.DecimalField(max_digits=14, decimal_places=2))
+    )
+    unconverted_currencies = serializers.ListField(child=serializers.CharField())
     pending_withdrawals_count = serializers.IntegerField()
     failed_transactions_count = serializers.IntegerField()
     
     # Transaction breakdown
     transactions_today = serializers.IntegerField()
     transactions_this_week = serializers.IntegerField()
-    transactions_this_month = serializers.IntegerField()
\ No newline at end of file
+    transactions_this_month = serializers.IntegerField()
+
+class ActivityEventSerializer(serializers.ModelSerializer):
+    actor_username = serializers.CharField(source='actor.username', read_only=True, allow_null=True)
+    
+    class Meta:
+        model = ActivityEvent
+        fields = ('id', 'entity_type', 'entity_id', 'verb', 'status', 'summary',
+                  'actor', 'actor_username', 'data', 'created_at')
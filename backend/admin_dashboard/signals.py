@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+from django.db.models.signals import post_init, post_save, post_delete
+
+from . import counters
+
+
+def track(model, contributions, fields):
+    """
+    Keep dashboard counters in step with a model.
+
+    post_init remembers the handful of fields the counters depend on, so a
+    save can diff old and new contributions without re-reading the row.
+    Rows loaded with those fields deferred can't be diffed; saving one marks
+    the counters stale instead, and the next read recounts.
+    """
+    fields = tuple(fields)
+    uid = f'dashboard_counters_{model._meta.label_lower}'
+
+    def snapshot(instance):
+        values = instance.__dict__
+        if any(field not in values for field in fields):
+            return None
+        return SimpleNamespace(**{field: values[field] for field in fields})
+
+    def on_init(sender, instance, **kwargs):
+        instance._dashboard_state = snapshot(instance) if instance.pk is not None else None
+
+    def on_save(sender, instance, created, raw=False, **kwargs):
+        if raw:
+            return
+        old_state = getattr(instance, '_dashboard_state', None)
+        new_state = snapshot(instance)
+
+        if new_state is None or (old_state is None and not created):
+            counters.mark_stale()
+        else:
+            old = contributions(old_state) if old_state is not None else {}
+            counters.apply_delta(counters.diff(old, contributions(new_state)))
+        instance._dashboard_state = new_state
+
+    def on_delete(sender, instance, **kwargs):
+        old_state = getattr(instance, '_dashboard_state', None)
+        if old_state is None:
+            counters.mark_stale()
+        else:
+            counters.apply_delta(counters.diff(contributions(old_state), {}))
+
+    post_init.connect(on_init, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=uid)
+
+
+def connect():
+    from users.models import User, KYCRecord
+    from projects.models import EnterpriseProject
+    from tasks.models import TaskUnit
+    from wallet.models import WalletTransaction
+    from .models import DisputeCase
+
+    track(User, counters.user_contributions, ['role'])
+    track(EnterpriseProject, counters.project_contributions, ['created_at'])
+    track(TaskUnit, counters.task_contributions,
+          ['created_at', 'status', 'pay_amount_currency', 'pay_amount_minor'])
+    track(KYCRecord, counters.kyc_contributions, ['status'])
+    track(DisputeCase, counters.dispute_contributions, ['status'])
+    track(WalletTransaction, counters.transaction_contributions,
+          ['transaction_type', 'status', 'created_at'])
@@ -0,0 +1,44 @@
+from celery import shared_task
+from django.db import DatabaseError
+from django.utils import timezone
+from .models import AdminDashboard
+from . import audit, counters
+
+
+@shared_task
+def snapshot_dashboard_stats(recount=False):
+    """
+    Persist the live dashboard counters into today's AdminDashboard row.
+    With recount=True the counters are first rebuilt from the database.
+    """
+    from wallet.fx import convert_totals, reporting_currency
+    from wallet.money import from_minor
+    
+    if recount:
+        counters.recount()
+    
+    stats = counters.read()
+    volume_minor, _ = convert_totals(stats['volume_by_currency'])
+    
+    snapshot, _ = AdminDashboard.objects.update_or_create(
+        date_recorded=timezone.localdate(),
+        defaults={
+            'total_students': stats['total_students'],
+            'total_enterprises': stats['total_enterprises'],
+            'total_projects': stats['total_projects'],
+            'total_tasks_completed': stats['total_tasks_completed'],
+            'total_volume_processed': from_minor(volume_minor, reporting_currency()).amount,
+            'platform_earnings': from_minor(volume_minor * 5 // 100, reporting_currency()).amount,
+        }
+    )
+    return snapshot.id
+
+
+@shared_task(acks_late=True, autoretry_for=(DatabaseError,), retry_backoff=True, max_retries=None)
+def write_audit_records(entries):
+    """
+    Bulk insert a batch of queued audit records. Acked only after the insert,
+    and retried on database errors; duplicates are skipped by dedupe_id.
+    """
+    audit.write_records(entries)
+    return len(entries)
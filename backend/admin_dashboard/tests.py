@@ -1,3 +1,772 @@
 from django.test import TestCase
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from . import counters
+from .models import AdminDashboard, DisputeCase
+from .tasks import snapshot_dashboard_stats
+from projects.models import EnterpriseProject
+from tasks.models import TaskUnit
+from wallet.models import WalletTransaction
+
+User = get_user_model()
+
+
+class DashboardCountersTestCase(TestCase):
+    """Test the incrementally maintained dashboard counters"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            username='admin_user', email='admin@test.com', password='testpass123', role='admin'
+        )
+        self.client_user = User.objects.create_user(
+            username='enterprise_user', email='enterprise@test.com', password='testpass123', role='enterprise'
+        )
+        self.student = User.objects.create_user(
+            username='student_user', email='student@test.com', password='testpass123', role='student'
+        )
+        self.project = EnterpriseProject.objects.create(
+            title='Test Project',
+            description='Test project for counters',
+            client=self.client_user,
+            total_amount=1000.00
+        )
+        self.task = TaskUnit.objects.create(
+            project=self.project,
+            unit_index=1,
+            title='Test Task',
+            description='Test task description',
+            type='digital',
+            pay_amount=50.00,
+            status='assigned',
+            assigned_to=self.student
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+
+    def test_cold_read_recounts(self):
+        """The first read builds counters from the database"""
+        stats = counters.read()
+
+        self.assertEqual(stats['total_students'], 1)
+        self.assertEqual(stats['total_enterprises'], 1)
+        self.assertEqual(stats['total_projects'], 1)
+        self.assertEqual(stats['tasks_today'], 1)
+        self.assertEqual(stats['total_tasks_completed'], 0)
+
+    def test_transitions_update_counters_without_queries(self):
+        """Saves apply O(1) deltas and warm reads never touch the database"""
+        counters.read()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.status = 'completed'
+            self.task.save()
+            User.objects.create_user(
+                username='student_two', email='student2@test.com', password='testpass123', role='student'
+            )
+            WalletTransaction.objects.create(
+                user=self.student,
+                amount=100.00,
+                transaction_type='withdrawal',
+                status='pending',
+                reference='WDR_counter'
+            )
+
+        with self.assertNumQueries(0):
+            stats = counters.read()
+
+        self.assertEqual(stats['total_students'], 2)
+        self.assertEqual(stats['total_tasks_completed'], 1)
+        self.assertEqual(stats['volume_by_currency'], {'NGN': 5000})
+        self.assertEqual(stats['pending_withdrawals'], 1)
+        self.assertEqual(stats['withdrawals_today'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            WalletTransaction.objects.filter(reference='WDR_counter').get().delete()
+        self.assertEqual(counters.read()['pending_withdrawals'], 0)
+
+    def test_dispute_counter(self):
+        """Opening and resolving a dispute moves the pending count"""
+        counters.read()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            dispute = DisputeCase.objects.create(
+                title='Dispute', description='Bad work', task=self.task, raised_by=self.client_user
+            )
+        self.assertEqual(counters.read()['pending_disputes'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            dispute.status = 'resolved'
+            dispute.save()
+        self.assertEqual(counters.read()['pending_disputes'], 0)
+
+    def test_stats_endpoint_and_snapshot(self):
+        """The endpoint serves counters and the snapshot task persists them"""
+        response = self.api.get('/api/admin-dashboard/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_projects'], 1)
+
+        snapshot_dashboard_stats(recount=True)
+        snapshot = AdminDashboard.objects.get()
+        self.assertEqual(snapshot.total_students, 1)
+        self.assertEqual(snapshot.total_projects, 1)
+
+
+class CachedAdminViewTestCase(TestCase):
+    """Test the shared response cache on admin read endpoints"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            username='admin_user', email='admin@test.com', password='testpass123', role='admin'
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+
+    def test_etag_and_not_modified(self):
+        """A matching If-None-Match gets a 304 with the same ETag"""
+        response = self.api.get('/api/admin-dashboard/financial-overview/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.api.get('/api/admin-dashboard/financial-overview/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_many_viewers_compute_once(self):
+        """Repeated reads inside the TTL do not touch the database"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.api.get('/api/admin-dashboard/recent-activity/')
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(10):
+                response = self.api.get('/api/admin-dashboard/recent-activity/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_concurrent_miss_waits_for_result(self):
+        """A miss that finds the lock taken reuses the other request's result"""
+        from unittest.mock import patch
+        from .caching import cache_key
+        from rest_framework.test import APIRequestFactory
+
+        key = cache_key('dashboard_stats', APIRequestFactory().get('/'))
+        cache.add(f"{key}:lock", True)
+        entry = {'etag': '"abc"', 'data': {'total_students': 42}}
+
+        with patch('admin_dashboard.caching.cache.get', side_effect=[None, entry]), \
+                patch('admin_dashboard.counters.read') as read:
+            response = self.api.get('/api/admin-dashboard/stats/')
+
+        read.assert_not_called()
+        self.assertEqual(response.data, {'total_students': 42})
+        self.assertEqual(response['ETag'], '"abc"')
+
+    def test_non_admin_is_not_served_from_cache(self):
+        """Permission checks still run before the cache"""
+        self.api.get('/api/admin-dashboard/stats/')
+        student = User.objects.create_user(
+            username='student_user', email='student@test.com', password='testpass123', role='student'
+        )
+        self.api.force_authenticate(student)
+        self.assertEqual(self.api.get('/api/admin-dashboard/stats/').status_code, 403)
+
+
+class AuditPipelineTestCase(TestCase):
+    """Test the batched audit writer"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username='admin_user', email='admin@test.com', password='testpass123', role='admin'
+        )
+        self.project = EnterpriseProject.objects.create(
+            title='Test Project',
+            description='Test project for audits',
+            client=self.admin,
+            total_amount=1000.00
+        )
+
+    def _queue_two(self):
+        from . import audit
+
+        audit.project_event(self.project, 'ESCROW_FUNDED', 'Funded', performed_by=self.admin)
+        audit.admin_action(self.admin, 'kyc_approved', 'Approved', resource_id='1', resource_type='user')
+
+    def test_sync_mode_writes_inline(self):
+        """AUDIT_SYNC writes records in the caller's transaction"""
+        from django.test.utils import override_settings
+        from projects.models import ProjectAudit
+        from .models import AuditLog
+
+        with override_settings(AUDIT_SYNC=True):
+            self._queue_two()
+
+        self.assertEqual(ProjectAudit.objects.get().performed_by, self.admin)
+        self.assertEqual(AuditLog.objects.get().resource_type, 'user')
+
+    def test_enqueued_on_commit_and_deduplicated(self):
+        """Records wait for commit, ship as soon as it happens and survive redelivery"""
+        from unittest.mock import patch
+        from projects.models import ProjectAudit
+        from . import audit
+        from .models import AuditLog
+
+        with patch('admin_dashboard.tasks.write_audit_records.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self._queue_two()
+                delay.assert_not_called()
+
+        self.assertEqual(delay.call_count, 2)
+        batch = [entry for call in delay.call_args_list for entry in call[0][0]]
+
+        audit.write_records(batch)
+        audit.write_records(batch)
+        self.assertEqual(ProjectAudit.objects.count(), 1)
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+    def test_rolled_back_work_is_not_audited(self):
+        """Records queued inside a rolled back transaction are dropped"""
+        from django.db import transaction
+        from unittest.mock import patch
+
+        with patch('admin_dashboard.tasks.write_audit_records.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    self._queue_two()
+                    transaction.set_rollback(True)
+
+        delay.assert_not_called()
+
+    def test_broker_failure_writes_inline(self):
+        """If the batch cannot be enqueued it is written directly"""
+        from unittest.mock import patch
+        from projects.models import ProjectAudit
+
+        with patch('admin_dashboard.tasks.write_audit_records.delay', side_effect=ConnectionError):
+            with self.captureOnCommitCallbacks(execute=True):
+                self._queue_two()
+
+        self.assertEqual(ProjectAudit.objects.count(), 1)
+
+    def test_bulk_records_split_into_batches(self):
+        """One bulk call is one commit hook, shipped AUDIT_BATCH_SIZE records per message"""
+        from django.test.utils import override_settings
+        from unittest.mock import patch
+        from . import audit
+
+        rows = [{'description': f'Approved {i}', 'resource_id': str(i)} for i in range(5)]
+        with override_settings(AUDIT_BATCH_SIZE=2), \
+                patch('admin_dashboard.tasks.write_audit_records.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                audit.admin_actions(self.admin, 'kyc_approved', rows)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual([len(call[0][0]) for call in delay.call_args_list], [2, 2, 1])
+
+
+class StreamingExportTestCase(TestCase):
+    """Test the NDJSON/CSV export endpoints"""
+
+    def setUp(self):
+        from django.test.utils import override_settings
+
+        self.admin = User.objects.create_user(
+            username='admin_user', email='admin@test.com', password='testpass123', role='admin'
+        )
+        with override_settings(AUDIT_SYNC=True):
+            from . import audit
+            for action in ('kyc_approved', 'kyc_rejected', 'kyc_approved'):
+                audit.admin_action(self.admin, action, f'{action} test', resource_type='user')
+        for i, tx_type in enumerate(['deposit', 'withdrawal']):
+            WalletTransaction.objects.create(
+                user=self.admin,
+                amount=10 + i,
+                transaction_type=tx_type,
+                status='completed',
+                reference=f'EXPORT_{i}'
+            )
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+
+    def _lines(self, response):
+        return b''.join(response.streaming_content).decode().splitlines()
+
+    def test_ndjson_with_action_filter(self):
+        """Rows stream as one JSON object per line"""
+        import json
+
+        response = self.api.get('/api/admin-dashboard/exports/audit-logs/', {'action': 'kyc_approved'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self._lines(response)]
+        self.assertEqual([row['action'] for row in rows], ['kyc_approved', 'kyc_approved'])
+        self.assertEqual(rows[0]['user_id'], self.admin.id)
+
+    def test_csv_transactions(self):
+        """CSV output has a header row and filters on transaction type"""
+        response = self.api.get('/api/admin-dashboard/exports/transactions/', {
+            'output': 'csv', 'action': 'withdrawal', 'since': '2000-01-01'
+        })
+
+        lines = self._lines(response)
+        self.assertTrue(lines[0].startswith('id,created_at'))
+        self.assertEqual(len(lines), 2)
+        self.assertIn('EXPORT_1', lines[1])
+        self.assertIn('11.00', lines[1])
+
+    def test_transactions_include_archived(self):
+        """Rows moved to the cold archive are exported ahead of the hot ones"""
+        import json
+        import tempfile
+        from datetime import timedelta
+        from django.test.utils import override_settings
+        from django.utils import timezone
+        from wallet.tasks import archive_wallet_transactions
+
+        old = timezone.now() - timedelta(days=500)
+        for i, tx_type in enumerate(['deposit', 'withdrawal']):
+            tx = WalletTransaction.objects.create(
+                user=self.admin, amount=20 + i, transaction_type=tx_type,
+                status='completed', reference=f'ARCHIVED_{i}'
+            )
+            WalletTransaction.objects.filter(pk=tx.pk).update(created_at=old)
+
+        with tempfile.TemporaryDirectory() as root, override_settings(WALLET_ARCHIVE_ROOT=root):
+            archive_wallet_transactions(older_than_months=12)
+            response = self.api.get('/api/admin-dashboard/exports/transactions/', {'action': 'withdrawal'})
+            rows = [json.loads(line) for line in self._lines(response)]
+            recent = self.api.get('/api/admin-dashboard/exports/transactions/', {
+                'since': (timezone.now() - timedelta(days=30)).date().isoformat()
+            })
+            recent_rows = [json.loads(line) for line in self._lines(recent)]
+
+        self.assertEqual([row['reference'] for row in rows], ['ARCHIVED_1', 'EXPORT_1'])
+        self.assertEqual(rows[0]['user_id'], self.admin.id)
+        self.assertEqual(rows[0]['amount_minor'], 2100)
+        self.assertEqual(rows[0].keys(), rows[1].keys())
+        self.assertEqual(rows[0]['created_at'], old.isoformat())
+        self.assertEqual([row['reference'] for row in recent_rows], ['EXPORT_0', 'EXPORT_1'])
+
+    def test_date_bounds_and_validation(self):
+        """Rows outside the window are excluded; bad input is rejected"""
+        response = self.api.get('/api/admin-dashboard/exports/audit-logs/', {'until': '2000-01-01'})
+        self.assertEqual(self._lines(response), [])
+
+        self.assertEqual(
+            self.api.get('/api/admin-dashboard/exports/audit-logs/', {'since': 'yesterday'}).status_code, 400
+        )
+        self.assertEqual(self.api.get('/api/admin-dashboard/exports/users/').status_code, 404)
+
+
+IN_MEMORY_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+
+class AdminFeedTestCase(TestCase):
+    """Test the live admin operations feed"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username='admin_user', email='admin@test.com', password='testpass123', role='admin'
+        )
+        self.student = User.objects.create_user(
+            username='student_user', email='student@test.com', password='testpass123', role='student'
+        )
+
+    def _listen(self):
+        from asgiref.sync import async_to_sync
+        from channels.layers import get_channel_layer
+        from .events import ADMIN_FEED_GROUP
+
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(ADMIN_FEED_GROUP, channel)
+        return layer, channel
+
+    def test_withdrawal_status_changes_are_published(self):
+        """Creating and moving a withdrawal pushes one event per status"""
+        from asgiref.sync import async_to_sync
+        from django.test.utils import override_settings
+
+        with override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYERS):
+            layer, channel = self._listen()
+            with self.captureOnCommitCallbacks(execute=True):
+                withdrawal = WalletTransaction.objects.create(
+                    user=self.student,
+                    amount=100,
+                    transaction_type='withdrawal',
+                    reference='FEED_1'
+                )
+                withdrawal.metadata = {'note': 'no status change'}
+                withdrawal.save()
+                withdrawal.status = 'processing'
+                withdrawal.save()
+
+            first = async_to_sync(layer.receive)(channel)
+            second = async_to_sync(layer.receive)(channel)
+
+        self.assertEqual(first['event'], 'withdrawal.status_changed')
+        self.assertEqual([first['data']['status'], second['data']['status']], ['pending', 'processing'])
+
+    def test_consensus_failure_publishes_alert(self):
+        """check_validation_consensus pushes the SystemAlert it creates"""
+        from unittest.mock import patch
+        from tasks.models import TaskValidation
+        from tasks.tasks import check_validation_consensus
+
+        project = EnterpriseProject.objects.create(
+            title='Feed Project', description='Feed', client=self.admin, total_amount=100
+        )
+        task = TaskUnit.objects.create(
+            project=project, unit_index=1, title='Feed Task', description='Feed',
+            type='digital', pay_amount=10, status='submitted', assigned_to=self.student,
+            verification_metadata={'peer_count': 1, 'required_approvals': 1}
+        )
+        TaskValidation.objects.create(task_unit=task, validator=self.admin, status='rejected')
+
+        with patch('admin_dashboard.events.publish') as publish:
+            check_validation_consensus(task.id)
+
+        publish.assert_called_once()
+        self.assertEqual(publish.call_args[0][0], 'alert.created')
+
+    def test_consumer_admits_only_admins(self):
+        """Admins join the feed group and receive events; others are refused"""
+        import json
+        from asgiref.sync import async_to_sync
+        from asgiref.testing import ApplicationCommunicator
+        from .consumers import AdminFeedConsumer
+        from .events import ADMIN_FEED_GROUP
+        from django.test.utils import override_settings
+
+        async def session(user):
+            scope = {'type': 'websocket', 'path': '/ws/admin-dashboard/feed/', 'user': user}
+            communicator = ApplicationCommunicator(AdminFeedConsumer.as_asgi(), scope)
+            await communicator.send_input({'type': 'websocket.connect'})
+            reply = await communicator.receive_output()
+            if reply['type'] != 'websocket.accept':
+                return False, None
+
+            from channels.layers import get_channel_layer
+            await get_channel_layer().group_send(ADMIN_FEED_GROUP, {
+                'type': 'feed.event', 'event': 'kyc.submitted', 'data': {'id': 1}
+            })
+            message = await communicator.receive_output()
+            await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+            await communicator.wait()
+            return True, json.loads(message['text'])
+
+        with override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYERS):
+            connected, message = async_to_sync(session)(self.admin)
+            self.assertTrue(connected)
+            self.assertEqual(message, {'event': 'kyc.submitted', 'data': {'id': 1}})
+
+            connected, _ = async_to_sync(session)(self.student)
+            self.assertFalse(connected)
+
+
+class UserSearchTestCase(TestCase):
+    """Test ?search= on the user management list"""
+
+    def setUp(self):
+        from users.models import KYCRecord
+
+        self.admin = User.objects.create_user(
+            username='admin_user', email='admin@test.com', password='testpass123', role='admin'
+        )
+        self.ada = User.objects.create_user(
+            username='ada_lovelace', email='ada@example.com', password='testpass123',
+            role='student', phone='+2348012345678'
+        )
+        self.bob = User.objects.create_user(
+            username='bob_builder', email='bob@example.org', password='testpass123', role='enterprise'
+        )
+        KYCRecord.objects.create(
+            user=self.bob, document_type='nin', document_number='NIN-99887766',
+            document_front='kyc_documents/front.jpg', selfie_photo='kyc_selfies/selfie.jpg'
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+
+    def _search(self, term, **params):
+        response = self.api.get('/api/admin-dashboard/users/', {'search': term, **params})
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['username'] for row in response.data['results'])
+
+    def test_fragments_of_each_field(self):
+        """Username, email, phone and KYC document fragments all match"""
+        self.assertEqual(self._search('LOVEL'), ['ada_lovelace'])
+        self.assertEqual(self._search('example.org'), ['bob_builder'])
+        self.assertEqual(self._search('0123456'), ['ada_lovelace'])
+        self.assertEqual(self._search('887766'), ['bob_builder'])
+        self.assertEqual(self._search('example', role='student'), ['ada_lovelace'])
+
+    def test_short_terms_and_updates(self):
+        """Short fragments fall back to a scan; edits are searchable at once"""
+        self.assertEqual(self._search('bo'), ['bob_builder'])
+
+        self.ada.email = 'countess@analytical.io'
+        self.ada.save()
+        self.assertEqual(self._search('analytical'), ['ada_lovelace'])
+        self.assertEqual(self._search('ada@example'), [])
+
+
+class ActivityFeedTestCase(TestCase):
+    """Test the ActivityEvent-backed recent_activity feed"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            username='admin_user', email='admin@test.com', password='testpass123', role='admin'
+        )
+        self.student = User.objects.create_user(
+            username='student_user', email='student@test.com', password='testpass123', role='student'
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+
+    def _feed(self, **params):
+        cache.clear()
+        response = self.api.get('/api/admin-dashboard/recent-activity/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_transitions_are_recorded(self):
+        """Creation and status changes append events; other saves do not"""
+        from .models import ActivityEvent
+
+        tx = WalletTransaction.objects.create(
+            user=self.student, amount=25, transaction_type='withdrawal', reference='ACT_1'
+        )
+        tx.metadata = {'note': 'not a transition'}
+        tx.save()
+        tx.status = 'completed'
+        tx.save()
+
+        events = ActivityEvent.objects.filter(entity_type='transaction').order_by('id')
+        self.assertEqual([(e.verb, e.status) for e in events], [('created', 'pending'), ('status_changed', 'completed')])
+        self.assertEqual(events[1].data, {'previous_status': 'pending'})
+        self.assertEqual(events[1].actor, self.student)
+
+    def test_feed_is_one_query_with_type_filter(self):
+        """The merged feed is a single query and can be filtered by type"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        EnterpriseProject.objects.create(
+            title='Feed Project', description='Feed', client=self.admin, total_amount=100
+        )
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.api.get('/api/admin-dashboard/recent-activity/').data
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(data['results'][0]['entity_type'], 'project')
+
+        data = self._feed(type='user')
+        self.assertEqual({row['entity_type'] for row in data['results']}, {'user'})
+        self.assertEqual(len(data['results']), 2)
+
+    def test_keyset_paging(self):
+        """Cursors walk the feed without gaps or repeats"""
+        for i in range(5):
+            User.objects.create_user(username=f'page_user_{i}', password='testpass123')
+
+        seen = []
+        cursor = None
+        while True:
+            params = {'type': 'user', 'limit': 3}
+            if cursor:
+                params['cursor'] = cursor
+            data = self._feed(**params)
+            seen.extend(row['id'] for row in data['results'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(self.api.get('/api/admin-dashboard/recent-activity/', {'cursor': 'bad'}).status_code, 400)
+
+
+class BulkReviewTestCase(TestCase):
+    """Test bulk KYC review and dispute resolution"""
+
+    def setUp(self):
+        from django.test.utils import override_settings
+        from users.models import KYCRecord
+
+        cache.clear()
+        self.audit_sync = override_settings(AUDIT_SYNC=True)
+        self.audit_sync.enable()
+        self.admin = User.objects.create_user(
+            username='admin_user', email='admin@test.com', password='testpass123', role='admin'
+        )
+        self.students = [
+            User.objects.create_user(
+                username=f'student_{i}', email=f'student{i}@test.com', password='testpass123', role='student'
+            )
+            for i in range(4)
+        ]
+        self.records = [
+            KYCRecord.objects.create(
+                user=student, document_type='nin', document_number=f'NIN{i}',
+                document_front='kyc_documents/front.jpg', selfie_photo='kyc_selfies/selfie.jpg'
+            )
+            for i, student in enumerate(self.students)
+        ]
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+
+    def tearDown(self):
+        self.audit_sync.disable()
+
+    def test_principals_dropped_after_commit(self):
+        """Cached principals are only invalidated once the approval commits"""
+        from users.authentication import _principal_key
+        from . import reviews
+
+        key = _principal_key(self.students[0].pk)
+        cache.set(key, {'kyc_completed': False})
+        with self.captureOnCommitCallbacks(execute=True):
+            reviews.approve_kyc_records([self.records[0].id], self.admin)
+            self.assertIsNotNone(cache.get(key))
+        self.assertIsNone(cache.get(key))
+
+    def test_bulk_approve(self):
+        """Pending records are approved together; others are reported as skipped"""
+        from users.models import KYCRecord
+        from .models import AuditLog, ActivityEvent
+
+        self.records[3].status = 'rejected'
+        self.records[3].save()
+        ids = [r.id for r in self.records] + [9999]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.api.post('/api/admin-dashboard/kyc/bulk-approve/', {'ids': ids}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], [r.id for r in self.records[:3]])
+        self.assertEqual(response.data['skipped'], [self.records[3].id, 9999])
+        self.assertEqual(KYCRecord.objects.filter(status='approved', verified_by=self.admin).count(), 3)
+        self.assertEqual(User.objects.filter(kyc_completed=True).count(), 3)
+        self.assertEqual(AuditLog.objects.filter(action='kyc_approved').count(), 3)
+        self.assertEqual(ActivityEvent.objects.filter(entity_type='kyc', status='approved').count(), 3)
+        self.assertEqual(counters.read()['pending_kyc'], 0)
+
+    def test_bulk_reject_records_reason(self):
+        """Rejections store the reason in the record metadata"""
+        from users.models import KYCRecord
+
+        response = self.api.post('/api/admin-dashboard/kyc/bulk-reject/', {
+            'ids': [self.records[0].id, self.records[1].id], 'reason': 'Blurry document'
+        }, format='json')
+
+        self.assertEqual(len(response.data['updated']), 2)
+        record = KYCRecord.objects.get(id=self.records[0].id)
+        self.assertEqual(record.status, 'rejected')
+        self.assertEqual(record.metadata['rejection_reason'], 'Blurry document')
+
+    def test_single_reject_uses_metadata(self):
+        """reject_kyc no longer fails on the missing metadata field"""
+        response = self.api.post(f'/api/admin-dashboard/kyc/{self.records[0].id}/reject/', {'reason': 'Expired'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_bulk_resolve_disputes(self):
+        """Open disputes are resolved with one request"""
+        project = EnterpriseProject.objects.create(
+            title='Dispute Project', description='Disputes', client=self.admin, total_amount=100
+        )
+        task = TaskUnit.objects.create(
+            project=project, unit_index=1, title='Dispute Task', description='Dispute',
+            type='digital', pay_amount=10
+        )
+        disputes = [
+            DisputeCase.objects.create(
+                title=f'Dispute {i}', description='Bad work', task=task, raised_by=self.students[0],
+                status=dispute_status
+            )
+            for i, dispute_status in enumerate(['open', 'under_review', 'resolved'])
+        ]
+
+        response = self.api.post('/api/admin-dashboard/disputes/bulk-resolve/', {
+            'ids': [d.id for d in disputes], 'resolution': 'dismissed', 'resolution_notes': 'Backlog cleanup'
+        }, format='json')
+
+        self.assertEqual(response.data['updated'], [disputes[0].id, disputes[1].id])
+        self.assertEqual(response.data['skipped'], [disputes[2].id])
+        self.assertEqual(DisputeCase.objects.filter(status='resolved', resolution='dismissed').count(), 2)
+
+    def test_validation(self):
+        """Empty id lists and missing resolutions are rejected"""
+        response = self.api.post('/api/admin-dashboard/kyc/bulk-approve/', {'ids': []}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.api.post('/api/admin-dashboard/disputes/bulk-resolve/', {'ids': [1]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class SeedLoadTestCase(TestCase):
+    """Test the seed_load dataset generator"""
+
+    def _seed(self, seed=7, **kwargs):
+        from django.utils import timezone
+        from .seeding import LoadSeeder
+
+        options = {'users': 48, 'tasks': 400, 'transactions': 300, 'days': 5, 'chunk_size': 64}
+        options.update(kwargs)
+        end = timezone.make_aware(timezone.datetime(2026, 10, 1))
+        return LoadSeeder(seed=seed, end=end, password='testpass123', **options).run()
+
+    def _snapshot(self):
+        from tasks.models import TaskValidation
+
+        return (
+            list(TaskUnit.objects.order_by('pk').values_list(
+                'pk', 'project_id', 'status', 'assigned_to_id', 'pay_amount', 'created_at'
+            )),
+            list(TaskValidation.objects.order_by('pk').values_list('pk', 'validator_id', 'status')),
+            list(WalletTransaction.objects.order_by('pk').values_list('user_id', 'amount', 'amount_currency', 'status')),
+        )
+
+    def test_dataset_is_consistent(self):
+        """Every task status appears and the rows respect the domain rules"""
+        import io
+        from django.core.management import call_command
+        from tasks import stats
+        from tasks.models import TaskValidation
+        from users.models import User
+
+        call_command(
+            'seed_load', users=48, tasks=400, transactions=300, days=5, chunk_size=64, stdout=io.StringIO()
+        )
+
+        self.assertEqual(User.objects.filter(username__startswith='load_').count(), 48)
+        self.assertEqual(
+            set(TaskUnit.objects.values_list('status', flat=True)), {s for s, _ in TaskUnit.STATUS_CHOICES}
+        )
+        self.assertFalse(TaskUnit.objects.exclude(assigned_to=None).exclude(assigned_to__role='student').exists())
+        self.assertFalse(TaskValidation.objects.exclude(validator__role='student').exists())
+        self.assertFalse(EnterpriseProject.objects.exclude(client__role='enterprise').exists())
+        self.assertTrue(User.objects.filter(username__startswith='load_').first().check_password('load-test-pass'))
+
+        project = EnterpriseProject.objects.first()
+        self.assertEqual(project.total_units, project.task_units.count())
+        # Derived tables were rebuilt, so a repair finds nothing to fix
+        self.assertEqual(stats.recompute(), 0)
+
+    def test_same_seed_same_rows(self):
+        """A seed reproduces the same rows; another seed doesn't"""
+        from users.models import User
+
+        self._seed()
+        first = self._snapshot()
+        User.objects.all().delete()
+
+        self._seed()
+        self.assertEqual(self._snapshot(), first)
+        User.objects.all().delete()
+
+        self._seed(seed=8)
+        self.assertNotEqual(self._snapshot(), first)
@@ -14,9 +14,13 @@ urlpatterns = [
     # Audit logs
     path('audit-logs/', views.AuditLogListView.as_view(), name='audit-logs'),
     
+    # Streaming exports
+    path('exports/<str:resource>/', views.export_records, name='export-records'),
+    
     # Dispute management
     path('disputes/', views.DisputeCaseListView.as_view(), name='dispute-cases'),
     path('disputes/<int:pk>/', views.DisputeCaseDetailView.as_view(), name='dispute-case-detail'),
+    path('disputes/bulk-resolve/', views.bulk_resolve_disputes, name='bulk-resolve-disputes'),
     
     # User management
     path('users/', views.UserManagementListView.as_view(), name='user-management'),
@@ -26,6 +30,8 @@ urlpatterns = [
     path('kyc-applications/', views.KYCReviewListView.as_view(), name='kyc-applications'),
     path('kyc/<int:kyc_id>/approve/', views.approve_kyc, name='approve-kyc'),
     path('kyc/<int:kyc_id>/reject/', views.reject_kyc, name='reject-kyc'),
+    path('kyc/bulk-approve/', views.bulk_approve_kyc, name='bulk-approve-kyc'),
+    path('kyc/bulk-reject/', views.bulk_reject_kyc, name='bulk-reject-kyc'),
     
     # Project management
     path('projects/', views.ProjectManagementListView.as_view(), name='project-management'),
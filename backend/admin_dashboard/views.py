@@ -7,15 +7,24 @@ from datetime import timedelta
 from django.contrib.auth import get_user_model
 
 from .models import AdminDashboard, SystemAlert, AuditLog, DisputeCase
+from . import activity, audit, counters, events, reviews
+from .caching import cached_admin_view
+from .exports import EXPORTS, filtered_queryset, parse_bound, streaming_export
 from .serializers import (
     DashboardStatsSerializer, SystemAlertSerializer, AuditLogSerializer,
     DisputeCaseSerializer, DisputeResolutionSerializer, UserManagementSerializer,
-    KYCReviewSerializer, ProjectManagementSerializer, FinancialOverviewSerializer
+    KYCReviewSerializer, ProjectManagementSerializer, FinancialOverviewSerializer,
+    ActivityEventSerializer, BulkKYCReviewSerializer, BulkDisputeResolutionSerializer
 )
 from users.models import User, KYCRecord
+from users.search import search_users
 from projects.models import EnterpriseProject
+from tasks import reputation
 from tasks.models import TaskUnit
 from wallet.models import WalletTransaction, EscrowLedger
+from wallet.money import from_minor, sum_minor_by_currency, totals_as_decimals
+from wallet.fx import convert_totals, reporting_currency, reporting_total
+from wallet.rollups import start_of_day, window_totals
 
 User = get_user_model()
 
@@ -28,91 +37,62 @@ class IsAdminUser(permissions.BasePermission):
 
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
+@cached_admin_view()
 def dashboard_stats(request):
     """
     Get comprehensive dashboard statistics
-    """
-    # User statistics
-    total_students = User.objects.filter(role='student').count()
-    total_enterprises = User.objects.filter(role='enterprise').count()
-    
-    # Project statistics
-    total_projects = EnterpriseProject.objects.count()
-    total_tasks_completed = TaskUnit.objects.filter(status='completed').count()
-    
-    # Financial statistics
-    total_volume_processed = TaskUnit.objects.filter(
-        status='completed'
-    ).aggregate(total=Sum('pay_amount'))['total'] or 0
-    
-    # Platform earnings (simplified - 5% platform fee)
-    platform_earnings = float(total_volume_processed) * 0.05 if total_volume_processed else 0
-    
-    # Pending items
-    pending_kyc = KYCRecord.objects.filter(status='pending').count()
-    pending_disputes = DisputeCase.objects.filter(status='open').count()
-    pending_withdrawals = WalletTransaction.objects.filter(
-        transaction_type='withdrawal',
-        status__in=['pending', 'processing']
-    ).count()
-    
-    # Today's activity
-    today = timezone.now().date()
-    projects_today = EnterpriseProject.objects.filter(created_at__date=today).count()
-    tasks_today = TaskUnit.objects.filter(created_at__date=today).count()
-    withdrawals_today = WalletTransaction.objects.filter(
-        transaction_type='withdrawal',
-        created_at__date=today
-    ).count()
     
-    stats = {
-        'total_students': total_students,
-        'total_enterprises': total_enterprises,
-        'total_projects': total_projects,
-        'total_tasks_completed': total_tasks_completed,
-        'total_volume_processed': total_volume_processed,
-        'platform_earnings': platform_earnings,
-        'pending_kyc': pending_kyc,
-        'pending_disputes': pending_disputes,
-        'pending_withdrawals': pending_withdrawals,
-        'projects_today': projects_today,
-        'tasks_today': tasks_today,
-        'withdrawals_today': withdrawals_today,
-    }
+    Served from incrementally maintained counters (see counters.py), so the
+    cost does not grow with the size of the platform.
+    """
+    stats = counters.read()
+    
+    # Financial statistics (integer minor units, kept per currency)
+    volume_by_currency = stats.pop('volume_by_currency')
+    volume_minor, unconverted = convert_totals(volume_by_currency)
+    
+    stats.update({
+        'reporting_currency': reporting_currency(),
+        'total_volume_processed': from_minor(volume_minor, reporting_currency()).amount,
+        'volume_by_currency': totals_as_decimals(volume_by_currency),
+        'unconverted_currencies': unconverted,
+        # Platform earnings (simplified - 5% platform fee)
+        'platform_earnings': from_minor(volume_minor * 5 // 100, reporting_currency()).amount,
+    })
     
     serializer = DashboardStatsSerializer(stats)
     return Response(serializer.data)
 
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
+@cached_admin_view()
 def financial_overview(request):
     """
     Get financial overview and metrics
     """
-    today = timezone.now().date()
+    today = timezone.localdate()
+    start_of_today = start_of_day(today)
     
     # Escrow calculations
-    total_escrow_balance = EnterpriseProject.objects.filter(
-        escrow_locked=True
-    ).aggregate(total=Sum('total_amount'))['total'] or 0
+    escrow_balances = sum_minor_by_currency(
+        EnterpriseProject.objects.filter(escrow_locked=True), 'total_amount'
+    )
     
     # Wallet balances
-    total_wallet_balances = User.objects.aggregate(
-        total=Sum('wallet_balance')
-    )['total'] or 0
+    wallet_balances = sum_minor_by_currency(User.objects.all(), 'wallet_balance')
     
-    # Today's transactions
-    total_withdrawals_today = WalletTransaction.objects.filter(
+    # Today's transactions, from rollups plus the live tail
+    withdrawals_today = window_totals(
+        start_of_today,
         transaction_type='withdrawal',
-        created_at__date=today,
         status='completed'
-    ).aggregate(total=Sum('amount'))['total'] or 0
+    )['amounts']
     
-    total_deposits_today = WalletTransaction.objects.filter(
+    deposits_today = window_totals(
+        start_of_today,
         transaction_type__in=['deposit', 'escrow_funding'],
-        created_at__date=today,
         status='completed'
-    ).aggregate(total=Sum('amount'))['total'] or 0
+    )['amounts']
     
     # Counts
     pending_withdrawals_count = WalletTransaction.objects.filter(
@@ -125,25 +105,36 @@ def financial_overview(request):
     ).count()
     
     # Transaction timelines
-    transactions_today = WalletTransaction.objects.filter(
-        created_at__date=today
-    ).count()
+    transactions_today = window_totals(start_of_today)['count']
     
     week_ago = today - timedelta(days=7)
-    transactions_this_week = WalletTransaction.objects.filter(
-        created_at__date__gte=week_ago
-    ).count()
+    transactions_this_week = window_totals(start_of_day(week_ago))['count']
     
     month_ago = today - timedelta(days=30)
-    transactions_this_month = WalletTransaction.objects.filter(
-        created_at__date__gte=month_ago
-    ).count()
+    transactions_this_month = window_totals(start_of_day(month_ago))['count']
+    
+    # One group-by per metric, converted to the reporting currency at the edge
+    total_escrow_balance, escrow_unconverted = reporting_total(escrow_balances)
+    total_wallet_balances, wallet_unconverted = reporting_total(wallet_balances)
+    total_withdrawals_today, withdrawals_unconverted = reporting_total(withdrawals_today)
+    total_deposits_today, deposits_unconverted = reporting_total(deposits_today)
+    unconverted = sorted(set(
+        escrow_unconverted + wallet_unconverted + withdrawals_unconverted + deposits_unconverted
+    ))
     
     financial_data = {
+        'reporting_currency': reporting_currency(),
         'total_escrow_balance': total_escrow_balance,
         'total_wallet_balances': total_wallet_balances,
         'total_withdrawals_today': total_withdrawals_today,
         'total_deposits_today': total_deposits_today,
+        'unconverted_currencies': unconverted,
+        'totals_by_currency': {
+            'escrow_balance': totals_as_decimals(escrow_balances),
+            'wallet_balances': totals_as_decimals(wallet_balances),
+            'withdrawals_today': totals_as_decimals(withdrawals_today),
+            'deposits_today': totals_as_decimals(deposits_today),
+        },
         'pending_withdrawals_count': pending_withdrawals_count,
         'failed_transactions_count': failed_transactions_count,
         'transactions_today': transactions_today,
@@ -154,12 +145,60 @@ def financial_overview(request):
     serializer = FinancialOverviewSerializer(financial_data)
     return Response(serializer.data)
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_records(request, resource):
+    """
+    Stream audit logs, project audits or wallet transactions as NDJSON or CSV
+    
+    Query params: output (ndjson|csv), since/until (date or datetime),
+    action (comma separated; transaction type for transactions), status.
+    Transactions include rows moved to the cold archive, streamed first.
+    """
+    spec = EXPORTS.get(resource)
+    if spec is None:
+        return Response(
+            {"error": f"Unknown export '{resource}'"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    output = request.query_params.get('output', 'ndjson')
+    if output not in ('ndjson', 'csv'):
+        return Response(
+            {"error": "output must be 'ndjson' or 'csv'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    bounds = {}
+    for param in ('since', 'until'):
+        value = request.query_params.get(param)
+        if value:
+            bounds[param] = parse_bound(value)
+            if bounds[param] is None:
+                return Response(
+                    {"error": f"Invalid {param} date"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+    
+    def split(param):
+        value = request.query_params.get(param, '')
+        return [item for item in value.split(',') if item]
+    
+    filters = dict(actions=split('action'), statuses=split('status'), **bounds)
+    queryset = filtered_queryset(spec, **filters)
+    archived = spec.get_archived(**filters) if spec.get_archived else ()
+    return streaming_export(resource, spec, queryset, output, archived)
+
 class SystemAlertListView(generics.ListCreateAPIView):
     serializer_class = SystemAlertSerializer
     permission_classes = [IsAdminUser]
     
     def get_queryset(self):
         return SystemAlert.objects.all().order_by('-created_at')
+    
+    def perform_create(self, serializer):
+        alert = serializer.save()
+        events.alert_created(alert)
 
 class SystemAlertDetailView(generics.RetrieveUpdateAPIView):
     serializer_class = SystemAlertSerializer
@@ -237,9 +276,10 @@ class DisputeCaseDetailView(generics.RetrieveUpdateAPIView):
                 dispute.resolved_at = timezone.now()
                 dispute.status = 'resolved'
                 dispute.save()
+                reputation.disputes_resolved([dispute])
                 
                 # Create audit log
-                AuditLog.objects.create(
+                audit.admin_action(
                     user=request.user,
                     action='dispute_resolved',
                     description=f'Resolved dispute #{dispute.id} with resolution: {dispute.resolution}',
@@ -259,11 +299,16 @@ class UserManagementListView(generics.ListAPIView):
     
     def get_queryset(self):
         role_filter = self.request.query_params.get('role', None)
+        search = self.request.query_params.get('search', None)
         queryset = User.objects.all()
         
         if role_filter:
             queryset = queryset.filter(role=role_filter)
         
+        if search:
+            # username, email, phone or KYC document number fragment
+            queryset = search_users(queryset, search)
+        
         return queryset.order_by('-date_joined')
 
 class UserManagementDetailView(generics.RetrieveUpdateAPIView):
@@ -306,7 +351,7 @@ def approve_kyc(request, kyc_id):
     user.save()
     
     # Create audit log
-    AuditLog.objects.create(
+    audit.admin_action(
         user=request.user,
         action='kyc_approved',
         description=f'Approved KYC for user {user.username}',
@@ -343,7 +388,7 @@ def reject_kyc(request, kyc_id):
     kyc_record.save()
     
     # Create audit log
-    AuditLog.objects.create(
+    audit.admin_action(
         user=request.user,
         action='kyc_rejected',
         description=f'Rejected KYC for user {kyc_record.user.username}. Reason: {rejection_reason}',
@@ -356,6 +401,67 @@ def reject_kyc(request, kyc_id):
         "kyc_id": kyc_record.id
     })
 
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def bulk_approve_kyc(request):
+    """
+    Approve many pending KYC applications in one transaction
+    """
+    serializer = BulkKYCReviewSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    updated, skipped = reviews.approve_kyc_records(serializer.validated_data['ids'], request.user)
+    
+    return Response({
+        "message": f"Approved {len(updated)} KYC applications",
+        "updated": updated,
+        "skipped": skipped
+    })
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def bulk_reject_kyc(request):
+    """
+    Reject many pending KYC applications with one reason
+    """
+    serializer = BulkKYCReviewSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    updated, skipped = reviews.reject_kyc_records(
+        serializer.validated_data['ids'],
+        request.user,
+        serializer.validated_data['reason']
+    )
+    
+    return Response({
+        "message": f"Rejected {len(updated)} KYC applications",
+        "updated": updated,
+        "skipped": skipped
+    })
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def bulk_resolve_disputes(request):
+    """
+    Resolve many disputes with the same resolution
+    """
+    serializer = BulkDisputeResolutionSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = serializer.validated_data
+    updated, skipped = reviews.resolve_disputes(
+        data['ids'], request.user, data['resolution'], data['resolution_notes']
+    )
+    
+    return Response({
+        "message": f"Resolved {len(updated)} disputes",
+        "updated": updated,
+        "skipped": skipped
+    })
+
 class ProjectManagementListView(generics.ListAPIView):
     serializer_class = ProjectManagementSerializer
     permission_classes = [IsAdminUser]
@@ -371,31 +477,30 @@ class ProjectManagementListView(generics.ListAPIView):
 
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
+@cached_admin_view()
 def recent_activity(request):
     """
     Get recent platform activity for admin dashboard
-    """
-    # Recent users
-    recent_users = User.objects.order_by('-date_joined')[:5]
-    
-    # Recent projects
-    recent_projects = EnterpriseProject.objects.order_by('-created_at')[:5]
-    
-    # Recent transactions
-    recent_transactions = WalletTransaction.objects.order_by('-created_at')[:10]
     
-    # Recent tasks
-    recent_tasks = TaskUnit.objects.order_by('-created_at')[:10]
-    
-    # System alerts
-    active_alerts = SystemAlert.objects.filter(is_resolved=False).order_by('-created_at')[:5]
-    
-    activity_data = {
-        'recent_users': UserManagementSerializer(recent_users, many=True).data,
-        'recent_projects': ProjectManagementSerializer(recent_projects, many=True).data,
-        'recent_transactions': [],  # You'd need a transaction serializer
-        'recent_tasks': [],  # You'd need a task serializer
-        'active_alerts': SystemAlertSerializer(active_alerts, many=True).data,
-    }
+    A merged feed of users, projects, tasks, transactions, KYC, disputes
+    and alerts from the ActivityEvent table. Query params: type (comma
+    separated entity types), limit, cursor (next_cursor of the previous page).
+    """
+    entity_types = [t for t in request.query_params.get('type', '').split(',') if t]
+    try:
+        limit = int(request.query_params.get('limit', activity.DEFAULT_PAGE_SIZE))
+        events, next_cursor = activity.feed(
+            entity_types=entity_types,
+            cursor=request.query_params.get('cursor'),
+            limit=limit
+        )
+    except ValueError:
+        return Response(
+            {"error": "Invalid limit or cursor"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    return Response(activity_data)
\ No newline at end of file
+    return Response({
+        'results': ActivityEventSerializer(events, many=True).data,
+        'next_cursor': next_cursor,
+    })
\ No newline at end of file
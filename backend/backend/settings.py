@@ -89,7 +89,7 @@ TEMPLATES = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -107,6 +107,7 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.RevokingTokenRefreshSerializer',
 }
 
 # Spectacular Settings
@@ -122,6 +123,32 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.wallet.tasks.check_pending_transactions',
         'schedule': 300.0,  # Every 5 minutes
     },
+    'snapshot-dashboard-stats': {
+        'task': 'admin_dashboard.tasks.snapshot_dashboard_stats',
+        'schedule': 600.0,  # Every 10 minutes
+    },
+    'recount-dashboard-stats': {
+        'task': 'admin_dashboard.tasks.snapshot_dashboard_stats',
+        'schedule': 60 * 60 * 24,  # Daily full recount corrects any drift
+        'kwargs': {'recount': True},
+    },
+    'archive-wallet-transactions': {
+        'task': 'wallet.tasks.archive_wallet_transactions',
+        'schedule': 60 * 60 * 24,  # Daily; only whole months past the cutoff are archived
+    },
+    'build-transaction-rollups': {
+        'task': 'wallet.tasks.build_transaction_rollups',
+        'schedule': 900.0,  # Every 15 minutes over the last TRANSACTION_ROLLUP_HOURS
+    },
+    'rebuild-transaction-rollups': {
+        'task': 'wallet.tasks.build_transaction_rollups',
+        'schedule': 60 * 60 * 24,  # Daily pass over the longest dashboard window
+        'kwargs': {'hours': 24 * 35},
+    },
+    'recompute-reputation': {
+        'task': 'tasks.tasks.recompute_reputation',
+        'schedule': 60 * 60 * 24,  # Nightly; completions and events apply deltas in between
+    },
 }
 
 
@@ -136,6 +163,22 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Cache Settings
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
 CELERY_ACCEPT_CONTENT = ['json']
@@ -145,6 +188,9 @@ CELERY_TIMEZONE = 'UTC'
 
 # Currency Settings
 CURRENCIES = ('NGN', 'USD', 'KES', 'GHS')
+DEFAULT_CURRENCY = 'NGN'
+REPORTING_CURRENCY = os.getenv('REPORTING_CURRENCY', DEFAULT_CURRENCY)  # Dashboards total in this currency
+FX_RATE_CACHE_TTL = 300  # Seconds each process keeps exchange rates in memory
 CURRENCY_CHOICES = [('NGN', 'Naira'), ('USD', 'US Dollar')]
 
 # Payment Settings
@@ -153,6 +199,71 @@ PAYSTACK_SECRET_KEY = os.getenv('PAYSTACK_SECRET_KEY', '')
 PAYSTACK_PUBLIC_KEY = os.getenv('PAYSTACK_PUBLIC_KEY', '')
 MONNIFY_API_KEY = os.getenv('MONNIFY_API_KEY', '')
 
+# Paystack rate limiting (shared across all workers through the cache)
+PAYSTACK_RATE_LIMIT = int(os.getenv('PAYSTACK_RATE_LIMIT', 10))  # Requests per second
+PAYSTACK_RATE_LIMIT_MAX_WAIT = 30  # Seconds a call may queue for tokens or back off after 429s before RateLimitExceeded
+PAYSTACK_RATE_LIMIT_LOCKED_MAX_WAIT = 1  # Same, for calls made while holding row locks (withdrawals)
+PAYSTACK_RATE_LIMIT_REQUEST_MAX_WAIT = 0  # Same, inside a web request: answer 503 rather than block
+PAYSTACK_RATE_LIMIT_RETRIES = 10  # Times a Celery task requeues itself while the limit is saturated
+PAYSTACK_PRIORITY_SHARES = {
+    'high': 1.0,    # Transfers and payment initialization
+    'normal': 0.7,  # Verifications
+    'low': 0.4,     # Bank lists and other lookups
+}
+PAYSTACK_MAX_RETRIES = 3  # Retries after a 429 from the provider
+
+# Idempotency-Key handling for money-moving endpoints
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24  # Stored responses are replayed for 24 hours
+IDEMPOTENCY_LOCK_TIMEOUT = 30  # Seconds a duplicate waits on the in-flight request
+
+# Wallet transaction archive
+WALLET_ARCHIVE_AFTER_MONTHS = 12  # Settled transactions older than this move to cold storage
+WALLET_ARCHIVE_ROOT = os.getenv('WALLET_ARCHIVE_ROOT', os.path.join(BASE_DIR, 'archive'))
+
+# Transaction rollups behind the financial overview
+TRANSACTION_ROLLUP_HOURS = 48  # Hours of rollups each run recomputes to catch late status changes
+
+# Audit trail
+AUDIT_SYNC = False  # True writes audit records inline (tests); otherwise enqueued to Celery on commit
+AUDIT_BATCH_SIZE = 100  # Most records sent to the worker in one message
+
+# Admin dashboard
+ADMIN_BULK_MAX_IDS = 1000  # Largest id list a bulk admin review request accepts
+ADMIN_VIEW_CACHE_TTL = 5  # Seconds admin dashboard reads are shared between tabs
+ADMIN_VIEW_LOCK_TIMEOUT = 10  # Seconds a concurrent miss waits for the in-flight computation
+EXPORT_CHUNK_SIZE = 2000  # Rows fetched per round trip by streaming exports
+
+# Phone numbers and one-time codes
+PHONE_DEFAULT_COUNTRY_CODE = os.getenv('PHONE_DEFAULT_COUNTRY_CODE', default='234')  # Assumed for numbers typed without one
+OTP_LENGTH = 6
+OTP_TTL = 300  # Seconds a one-time code stays valid
+OTP_MAX_ATTEMPTS = 5  # Wrong guesses before a code is discarded
+OTP_SEND_LIMITS = {
+    'phone': (3, 600),  # Codes per phone per sliding 10 minutes
+    'ip': (20, 3600),  # Codes per client IP per sliding hour
+}
+OTP_EXPOSE_CODE = os.getenv('OTP_EXPOSE_CODE') == 'True'  # Also return the code in the response (demos only, never production)
+SMS_BACKEND = os.getenv('SMS_BACKEND', 'users.sms.UnconfiguredSMSBackend')  # Delivers OTP codes; unset refuses to send, see users/sms.py
+
+# Bulk user import
+USER_IMPORT_CHUNK_SIZE = 1000  # Rows validated, hashed and inserted per batch
+USER_IMPORT_WORKERS = int(os.getenv('USER_IMPORT_WORKERS', os.cpu_count() or 1))  # Processes hashing passwords in manage.py import_users
+USER_IMPORT_MAX_ROWS = 10000  # Rows one API import job may import; larger files go through manage.py import_users
+
+# Reputation
+REPUTATION_EVENT_WEIGHTS = {
+    'task_rejected': -0.2,  # AI or peer verification rejected a submission
+    'dispute_lost': -0.3,  # A dispute on the student's task was resolved against them
+    'validation_agreed': 0.02,  # A validator's vote matched the final outcome
+    'validation_disagreed': -0.05,
+}
+
+# JWT authentication
+AUTH_PRINCIPAL_CACHE_TTL = 60  # Seconds a token's user columns are served from cache
+JWT_REVOCATION_BLOOM_CAPACITY = 100_000  # Revoked tokens the in-process filter holds before it is rebuilt
+JWT_REVOCATION_BLOOM_ERROR_RATE = 0.01  # Share of live tokens that need a cache lookup to confirm
+JWT_REVOCATION_SYNC_INTERVAL = 1.0  # Seconds another process may take to see a revocation
+
 # KYC Settings
 KYC_THRESHOLD = os.getenv('KYC_THRESHOLD', default=50000)  # 50,000 in cents
 
@@ -160,6 +271,7 @@ WITHDRAWAL_MIN_AMOUNT = 100  # Minimum withdrawal amount in Naira
 WITHDRAWAL_KYC_THRESHOLD = 50000  # Amount requiring KYC verification
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+ASGI_APPLICATION = 'backend.asgi.application'
 
 
 # Database
@@ -199,6 +311,22 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+PASSWORD_HASHERS = [
+    'users.passwords.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# PBKDF2 iterations per cost profile. Switching profile rehashes each user's
+# password at their next successful login.
+PASSWORD_HASH_PROFILES = {
+    'default': 1_000_000,  # Django 5.2's own default
+    'interactive': 600_000,  # OWASP minimum for PBKDF2-SHA256
+    'test': 1_000,  # Local test runs only
+}
+PASSWORD_HASH_PROFILE = os.getenv('PASSWORD_HASH_PROFILE', 'default')
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))  # Threads hashing passwords for the async auth views
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -219,6 +347,8 @@ STATIC_URL = 'static/'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+KYC_DERIVATIVE_SIZES = {'thumb': (320, 320), 'web': (1280, 1280)}  # Bounding boxes for KYC image derivatives
+KYC_UPLOAD_MAX_BYTES = 10 * 1024 * 1024  # Largest accepted KYC image
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -33,7 +33,8 @@ urlpatterns = [
     path('api/auth/', include("users.urls")),
     path('api/projects/', include("projects.urls")),
     path('api/tasks/', include("tasks.urls")),
-    path('api/wallet/', include("wallet.urls"))
+    path('api/wallet/', include("wallet.urls")),
+    path('api/admin-dashboard/', include("admin_dashboard.urls")),
 
 ]
 
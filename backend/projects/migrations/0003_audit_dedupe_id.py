@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_enterpriseproject_total_amount_minor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectaudit',
+            name='dedupe_id',
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='projectaudit',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -1,10 +1,12 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from djmoney.models.fields import MoneyField
+from wallet.money import MinorUnitsMixin
 
 User = get_user_model()
 
-class EnterpriseProject(models.Model):
+class EnterpriseProject(MinorUnitsMixin, models.Model):
     STATUS_CHOICES = (
         ('draft', 'Draft'),
         ('funded', 'Funded'),
@@ -25,6 +27,7 @@ class EnterpriseProject(models.Model):
     description = models.TextField()
     task_type = models.CharField(max_length=20, choices=TASK_TYPE_CHOICES, default='digital')
     total_amount = MoneyField(max_digits=14, decimal_places=2, default_currency='NGN')
+    total_amount_minor = models.BigIntegerField(default=0, editable=False)
     escrow_locked = models.BooleanField(default=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
     total_units = models.IntegerField(default=0)
@@ -33,6 +36,8 @@ class EnterpriseProject(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    minor_unit_fields = ('total_amount',)
+    
     class Meta:
         ordering = ['-created_at']
     
@@ -59,7 +64,8 @@ class ProjectAudit(models.Model):
     action = models.CharField(max_length=100)
     description = models.TextField()
     performed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    dedupe_id = models.CharField(max_length=32, unique=True, null=True, blank=True, editable=False)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-created_at']
@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from django.db import transaction
 from django.db.models import Q
 from .models import EnterpriseProject, ProjectFile, ProjectAudit
+from admin_dashboard import audit
 from .serializers import (
     EnterpriseProjectSerializer, ProjectCreateSerializer, 
     ProjectFileSerializer, ProjectAuditSerializer, ProjectStatusUpdateSerializer
@@ -37,7 +38,7 @@ class ProjectListView(generics.ListCreateAPIView):
         project = serializer.save()
         
         # Create audit log
-        ProjectAudit.objects.create(
+        audit.project_event(
             project=project,
             action='PROJECT_CREATED',
             description=f'Project "{project.title}" created',
@@ -82,7 +83,7 @@ class ProjectFileUploadView(generics.CreateAPIView):
             )
             
             # Create audit log
-            ProjectAudit.objects.create(
+            audit.project_event(
                 project=project,
                 action='FILE_UPLOADED',
                 description=f'File "{file_obj.name}" uploaded',
@@ -138,7 +139,7 @@ def fund_project_escrow(request, project_id):
         project.save()
         
         # Create audit log
-        ProjectAudit.objects.create(
+        audit.project_event(
             project=project,
             action='ESCROW_FUNDED',
             description=f'Project funded with {project.total_amount}',
@@ -187,7 +188,7 @@ def trigger_atomization(request, project_id):
     project.save()
     
     # Create audit log
-    ProjectAudit.objects.create(
+    audit.project_event(
         project=project,
         action='ATOMIZATION_TRIGGERED',
         description='Task atomization process started',
@@ -0,0 +1,17 @@
+import time
+from django.core.management.base import BaseCommand
+
+from tasks.stats import recompute
+
+
+class Command(BaseCommand):
+    help = "Recount per-user task stats from tasks and validations and fix rows that drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids',
+                            help='Only repair these user ids (repeatable)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        repaired = recompute(options['user_ids'])
+        self.stdout.write(f"Repaired {repaired} user stats rows in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_stats(apps, schema_editor):
+    from tasks.stats import recompute
+    recompute(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_taskunit_pay_amount_minor'),
+        ('users', '0005_kycrecord_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTaskStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('tasks_completed', models.PositiveIntegerField(default=0)),
+                ('tasks_pending', models.PositiveIntegerField(default=0)),
+                ('tasks_submitted', models.PositiveIntegerField(default=0)),
+                ('validations_done', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'User Task Stats',
+                'verbose_name_plural': 'User Task Stats',
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
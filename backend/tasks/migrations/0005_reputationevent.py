@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_usertaskstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReputationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('task_rejected', 'Task Rejected'), ('dispute_lost', 'Dispute Lost'), ('validation_agreed', 'Validation Agreed'), ('validation_disagreed', 'Validation Disagreed')], max_length=30)),
+                ('delta', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('task', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reputation_events', to='tasks.taskunit')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reputation_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'kind', 'task'), name='unique_reputation_event')],
+            },
+        ),
+    ]
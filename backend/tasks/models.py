@@ -1,10 +1,11 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from djmoney.models.fields import MoneyField
+from wallet.money import MinorUnitsMixin
 
 User = get_user_model()
 
-class TaskUnit(models.Model):
+class TaskUnit(MinorUnitsMixin, models.Model):
     TASK_TYPES = (
         ('digital', 'Digital'),
         ('physical', 'Physical'),
@@ -35,6 +36,7 @@ class TaskUnit(models.Model):
     description = models.TextField()
     type = models.CharField(max_length=20, choices=TASK_TYPES)
     pay_amount = MoneyField(max_digits=10, decimal_places=2, default_currency='NGN')
+    pay_amount_minor = models.BigIntegerField(default=0, editable=False)
     estimated_time_seconds = models.IntegerField(default=1800)  # Default 30 minutes
     payload = models.JSONField(default=dict)  # Data the student needs
     verification_strategy = models.CharField(max_length=20, choices=VERIFICATION_STRATEGIES, default='peer_consensus')
@@ -47,6 +49,8 @@ class TaskUnit(models.Model):
     submission_data = models.JSONField(null=True, blank=True)  # Student's submission
     created_at = models.DateTimeField(auto_now_add=True)
     
+    minor_unit_fields = ('pay_amount',)
+    
     class Meta:
         ordering = ['unit_index']
         unique_together = ['project', 'unit_index']
@@ -137,3 +141,49 @@ class TaskValidation(models.Model):
         # ... existing meta ...
         verbose_name = 'Task Validation'
         verbose_name_plural = 'Task Validations'
+
+class UserTaskStats(models.Model):
+    """
+    Per-user task counters, kept in step with TaskUnit and TaskValidation
+    saves by tasks.stats so dashboards and the accept limit read one row.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='task_stats')
+    tasks_completed = models.PositiveIntegerField(default=0)
+    tasks_pending = models.PositiveIntegerField(default=0)  # Assigned or submitted
+    tasks_submitted = models.PositiveIntegerField(default=0)
+    validations_done = models.PositiveIntegerField(default=0)  # Approved or rejected
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'User Task Stats'
+        verbose_name_plural = 'User Task Stats'
+    
+    def __str__(self):
+        return f"Task stats for user #{self.user_id}"
+
+class ReputationEvent(models.Model):
+    """
+    Ledger of reputation adjustments. Completions are not logged here;
+    their capped bonus comes from UserTaskStats.tasks_completed.
+    """
+    KINDS = (
+        ('task_rejected', 'Task Rejected'),
+        ('dispute_lost', 'Dispute Lost'),
+        ('validation_agreed', 'Validation Agreed'),
+        ('validation_disagreed', 'Validation Disagreed'),
+    )
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reputation_events')
+    kind = models.CharField(max_length=30, choices=KINDS)
+    delta = models.FloatField()
+    task = models.ForeignKey(TaskUnit, on_delete=models.SET_NULL, null=True, blank=True, related_name='reputation_events')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            # One event per outcome, so retried Celery tasks don't apply it twice
+            models.UniqueConstraint(fields=['user', 'kind', 'task'], name='unique_reputation_event'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} ({self.delta:+}) for user #{self.user_id}"
@@ -0,0 +1,182 @@
+from collections import defaultdict
+import numpy as np
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest, Least
+from django.db.models.lookups import GreaterThanOrEqual
+
+# score = BASE_SCORE + min(COMPLETION_STEP * completed, COMPLETION_CAP)
+#         + sum(ReputationEvent.delta), clipped to [MIN_SCORE, MAX_SCORE]
+BASE_SCORE = 3.0
+COMPLETION_STEP = 0.1
+COMPLETION_CAP = 2.0
+MIN_SCORE = 0.0
+MAX_SCORE = 5.0
+TIER_THRESHOLDS = ((4.5, 3), (3.5, 2))  # (minimum score, tier), highest first
+DEFAULT_TIER = 1
+
+DISPUTE_RESOLUTIONS_AGAINST_STUDENT = ('enterprise_favor', 'partial_refund', 'full_refund')
+
+
+def _weights():
+    return getattr(settings, 'REPUTATION_EVENT_WEIGHTS', {
+        'task_rejected': -0.2,
+        'dispute_lost': -0.3,
+        'validation_agreed': 0.02,
+        'validation_disagreed': -0.05,
+    })
+
+
+def _tier_expression(score):
+    return Case(
+        *[When(GreaterThanOrEqual(score, threshold), then=Value(tier)) for threshold, tier in TIER_THRESHOLDS],
+        default=Value(DEFAULT_TIER)
+    )
+
+
+def apply_deltas(deltas):
+    """Shift scores by {user_id: delta}, one small UPDATE per user with the tier recomputed in SQL"""
+    from users.authentication import invalidate_principals
+    from users.models import User
+
+    changed = [user_id for user_id, delta in deltas.items() if delta]
+    for user_id in changed:
+        score = Greatest(Least(F('reputation_score') + deltas[user_id], Value(MAX_SCORE)), Value(MIN_SCORE))
+        User.objects.filter(pk=user_id).update(reputation_score=score, tier=_tier_expression(score))
+    if changed:
+        transaction.on_commit(lambda: invalidate_principals(changed))
+
+
+def completion_delta(completed):
+    """Change in the capped completion bonus when the count reaches `completed`"""
+    return min(COMPLETION_STEP * completed, COMPLETION_CAP) - min(COMPLETION_STEP * (completed - 1), COMPLETION_CAP)
+
+
+def task_completed(task):
+    """Credit a completion; call after the task is saved so its stats row already counts it"""
+    from . import stats
+
+    if task.assigned_to_id:
+        completed = stats.for_user(task.assigned_to_id).tasks_completed
+        apply_deltas({task.assigned_to_id: completion_delta(completed)})
+
+
+def record(events):
+    """
+    Log (user_id, kind, task_id) events and apply their weights. An event
+    already in the ledger is skipped, so retries are harmless.
+    """
+    from .models import ReputationEvent
+
+    weights = _weights()
+    deltas = defaultdict(float)
+    for user_id, kind, task_id in events:
+        try:
+            with transaction.atomic():
+                ReputationEvent.objects.create(user_id=user_id, kind=kind, task_id=task_id, delta=weights[kind])
+        except IntegrityError:
+            continue
+        deltas[user_id] += weights[kind]
+    apply_deltas(deltas)
+
+
+def task_rejected(task):
+    if task.assigned_to_id:
+        record([(task.assigned_to_id, 'task_rejected', task.id)])
+
+
+def validations_settled(task, approved):
+    """Reward validators whose vote matched the outcome and penalize the rest"""
+    from .models import TaskValidation
+
+    record([
+        (validator_id, 'validation_agreed' if (vote == 'approved') == approved else 'validation_disagreed', task.id)
+        for validator_id, vote in TaskValidation.objects.filter(
+            task_unit=task, status__in=('approved', 'rejected')
+        ).values_list('validator_id', 'status')
+    ])
+
+
+def disputes_resolved(disputes):
+    """Penalize students whose disputes were resolved against them"""
+    from .models import TaskUnit
+
+    lost = {d.task_id for d in disputes if d.resolution in DISPUTE_RESOLUTIONS_AGAINST_STUDENT}
+    if lost:
+        record([
+            (student_id, 'dispute_lost', task_id)
+            for task_id, student_id in TaskUnit.objects.filter(
+                id__in=lost, assigned_to__isnull=False
+            ).values_list('id', 'assigned_to_id')
+        ])
+
+
+def _columns(queryset, fields, dtypes):
+    rows = list(queryset.values_list(*fields).iterator(chunk_size=5000))
+    return [
+        np.fromiter((row[i] for row in rows), dtype=dtype, count=len(rows))
+        for i, dtype in enumerate(dtypes)
+    ]
+
+
+def _positions(ids, keys):
+    """Indexes of `keys` in the sorted `ids` array, and a mask of the keys found"""
+    positions = np.searchsorted(ids, keys)
+    found = positions < len(ids)
+    found[found] = ids[positions[found]] == keys[found]
+    return positions, found
+
+
+def recompute(user_ids=None, apps=global_apps):
+    """
+    Recompute every student's score from their completion count and event
+    ledger, vectorised with NumPy over exported columns, and write only the
+    rows that drifted (clipping makes O(1) deltas inexact at the bounds).
+    Returns the number of users corrected.
+    """
+    User = apps.get_model('users', 'User')
+    UserTaskStats = apps.get_model('tasks', 'UserTaskStats')
+    ReputationEvent = apps.get_model('tasks', 'ReputationEvent')
+
+    students = User.objects.filter(role='student').order_by('pk')
+    stats = UserTaskStats.objects.filter(tasks_completed__gt=0)
+    events = ReputationEvent.objects.all()
+    if user_ids is not None:
+        students = students.filter(pk__in=user_ids)
+        stats = stats.filter(user__in=user_ids)
+        events = events.filter(user__in=user_ids)
+
+    ids, current, tiers = _columns(students, ('pk', 'reputation_score', 'tier'), (np.int64, np.float64, np.int64))
+    if not len(ids):
+        return 0
+
+    completed = np.zeros(len(ids))
+    stat_users, counts = _columns(stats, ('user_id', 'tasks_completed'), (np.int64, np.float64))
+    positions, found = _positions(ids, stat_users)
+    completed[positions[found]] = counts[found]
+
+    event_users, deltas = _columns(events, ('user_id', 'delta'), (np.int64, np.float64))
+    positions, found = _positions(ids, event_users)
+    adjustments = np.bincount(positions[found], weights=deltas[found], minlength=len(ids))
+
+    scores = np.clip(
+        BASE_SCORE + np.minimum(COMPLETION_STEP * completed, COMPLETION_CAP) + adjustments,
+        MIN_SCORE, MAX_SCORE
+    )
+    new_tiers = np.select(
+        [scores >= threshold for threshold, _ in TIER_THRESHOLDS],
+        [tier for _, tier in TIER_THRESHOLDS],
+        DEFAULT_TIER
+    )
+
+    drifted = np.flatnonzero((np.abs(scores - current) > 1e-6) | (new_tiers != tiers))
+    User.objects.bulk_update([
+        User(pk=int(ids[i]), reputation_score=float(scores[i]), tier=int(new_tiers[i])) for i in drifted
+    ], ['reputation_score', 'tier'], batch_size=1000)
+
+    if apps is global_apps and len(drifted):
+        from users.authentication import invalidate_principals
+        invalidate_principals([int(ids[i]) for i in drifted])
+    return len(drifted)
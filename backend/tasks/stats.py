@@ -0,0 +1,176 @@
+from collections import defaultdict
+from types import SimpleNamespace
+from django.apps import apps as global_apps
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils import timezone
+
+PENDING_STATUSES = ('assigned', 'submitted')
+DONE_VALIDATION_STATUSES = ('approved', 'rejected')
+COUNTER_FIELDS = ('tasks_completed', 'tasks_pending', 'tasks_submitted', 'validations_done')
+
+
+# Contributions: (user_id, counter) -> amount a row currently adds. Saves
+# diff the old and new contributions and apply the result with F().
+
+def task_contributions(task):
+    if not task.assigned_to_id:
+        return {}
+    contributions = {}
+    if task.status == 'completed':
+        contributions[(task.assigned_to_id, 'tasks_completed')] = 1
+    if task.status in PENDING_STATUSES:
+        contributions[(task.assigned_to_id, 'tasks_pending')] = 1
+    if task.status == 'submitted':
+        contributions[(task.assigned_to_id, 'tasks_submitted')] = 1
+    return contributions
+
+
+def validation_contributions(validation):
+    if validation.status in DONE_VALIDATION_STATUSES:
+        return {(validation.validator_id, 'validations_done'): 1}
+    return {}
+
+
+def apply(old, new, create_missing=True):
+    """
+    Apply the difference between two contribution dicts, in the current
+    transaction. Users without a row get one counted from scratch unless
+    `create_missing` is False.
+    """
+    from .models import UserTaskStats
+
+    per_user = defaultdict(dict)
+    for key in set(old) | set(new):
+        delta = new.get(key, 0) - old.get(key, 0)
+        if delta:
+            user_id, field = key
+            per_user[user_id][field] = delta
+
+    for user_id, deltas in per_user.items():
+        updated = UserTaskStats.objects.filter(user_id=user_id).update(
+            updated_at=timezone.now(),
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+        if not updated and create_missing:
+            # No row yet: count from scratch, which already sees this change
+            recompute([user_id])
+
+
+def recompute(user_ids=None, apps=global_apps):
+    """
+    Recount stats from TaskUnit/TaskValidation for `user_ids` (default:
+    everyone) with two grouped queries, and write rows that drifted.
+    Returns the number of rows created or corrected.
+    """
+    TaskUnit = apps.get_model('tasks', 'TaskUnit')
+    TaskValidation = apps.get_model('tasks', 'TaskValidation')
+    UserTaskStats = apps.get_model('tasks', 'UserTaskStats')
+
+    tasks = TaskUnit.objects.filter(assigned_to__isnull=False)
+    validations = TaskValidation.objects.filter(status__in=DONE_VALIDATION_STATUSES)
+    existing = UserTaskStats.objects.all()
+    if user_ids is not None:
+        tasks = tasks.filter(assigned_to__in=user_ids)
+        validations = validations.filter(validator__in=user_ids)
+        existing = existing.filter(user__in=user_ids)
+
+    stored = {
+        row[0]: dict(zip(COUNTER_FIELDS, row[1:]))
+        for row in existing.values_list('user', *COUNTER_FIELDS)
+    }
+    # Users with a row or an explicit request start at zero, so stale rows reset
+    counts = {
+        user_id: dict.fromkeys(COUNTER_FIELDS, 0)
+        for user_id in {*stored, *(user_ids or ())}
+    }
+
+    def counts_for(user_id):
+        return counts.setdefault(user_id, dict.fromkeys(COUNTER_FIELDS, 0))
+
+    for row in tasks.values('assigned_to').annotate(
+        completed=Count('id', filter=Q(status='completed')),
+        pending=Count('id', filter=Q(status__in=PENDING_STATUSES)),
+        submitted=Count('id', filter=Q(status='submitted')),
+    ):
+        counts_for(row['assigned_to']).update(
+            tasks_completed=row['completed'],
+            tasks_pending=row['pending'],
+            tasks_submitted=row['submitted'],
+        )
+    for row in validations.values('validator').annotate(done=Count('id')):
+        counts_for(row['validator'])['validations_done'] = row['done']
+
+    now = timezone.now()
+    changed = [
+        UserTaskStats(user_id=user_id, updated_at=now, **values)
+        for user_id, values in counts.items()
+        if stored.get(user_id) != values
+    ]
+    UserTaskStats.objects.bulk_create(
+        changed, batch_size=1000,
+        update_conflicts=True, unique_fields=['user'], update_fields=[*COUNTER_FIELDS, 'updated_at']
+    )
+    return len(changed)
+
+
+def for_user(user_id, lock=False):
+    """The user's stats row, created on first use. lock=True selects it FOR UPDATE"""
+    from .models import UserTaskStats
+
+    queryset = UserTaskStats.objects.select_for_update() if lock else UserTaskStats.objects
+    try:
+        return queryset.get(user_id=user_id)
+    except UserTaskStats.DoesNotExist:
+        recompute([user_id])
+        return queryset.get(user_id=user_id)
+
+
+def track(model, contributions, fields):
+    """Like admin_dashboard.signals.track, but the counters live in UserTaskStats"""
+    fields = tuple(fields)
+    uid = f'user_task_stats_{model._meta.label_lower}'
+
+    def snapshot(instance):
+        values = instance.__dict__
+        if any(field not in values for field in fields):
+            return None
+        return SimpleNamespace(**{field: values[field] for field in fields})
+
+    def on_init(sender, instance, **kwargs):
+        instance._task_stats_state = snapshot(instance) if instance.pk is not None else None
+
+    def on_save(sender, instance, created, raw=False, **kwargs):
+        if raw:
+            return
+        old_state = getattr(instance, '_task_stats_state', None)
+        new_state = snapshot(instance)
+
+        if new_state is None or (old_state is None and not created):
+            # Can't diff a partially loaded row; recount whoever it touches now
+            user_ids = {user_id for user_id, _ in contributions(instance)}
+            if user_ids:
+                recompute(list(user_ids))
+        else:
+            old = contributions(old_state) if old_state is not None else {}
+            apply(old, contributions(new_state))
+        instance._task_stats_state = new_state
+
+    def on_delete(sender, instance, **kwargs):
+        old_state = getattr(instance, '_task_stats_state', None)
+        if old_state is not None:
+            # Deletes run per batch before their signals, so a row counted now
+            # would already miss the whole batch; for_user() counts it lazily.
+            # The user may also be the one being deleted.
+            apply(contributions(old_state), {}, create_missing=False)
+
+    post_init.connect(on_init, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=uid)
+
+
+def connect():
+    from .models import TaskUnit, TaskValidation
+
+    track(TaskUnit, task_contributions, ['assigned_to_id', 'status'])
+    track(TaskValidation, validation_contributions, ['validator_id', 'status'])
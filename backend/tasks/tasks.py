@@ -3,6 +3,7 @@ from django.db import transaction
 from django.utils import timezone
 import random
 from .models import TaskUnit, TaskValidation
+from . import reputation
 from wallet.models import WalletTransaction
 from users.models import User
 
@@ -27,19 +28,24 @@ def check_validation_consensus(task_id):
             if approved_count >= required_approvals:
                 # Consensus reached - approve task
                 complete_task(task.id)
+                reputation.validations_settled(task, approved=True)
             else:
                 # Consensus failed - mark as disputed
                 task.status = 'disputed'
                 task.save()
+                reputation.task_rejected(task)
+                reputation.validations_settled(task, approved=False)
                 
                 # Create system alert for admin
+                from admin_dashboard import events
                 from admin_dashboard.models import SystemAlert
-                SystemAlert.objects.create(
+                alert = SystemAlert.objects.create(
                     title=f'Task Disputed - #{task.id}',
                     description=f'Task {task.title} failed peer consensus validation',
                     alert_type='verification_failure',
                     severity='medium'
                 )
+                events.alert_created(alert)
                 
     except TaskUnit.DoesNotExist:
         pass
@@ -112,6 +118,7 @@ def process_task_verification(task_id):
             # If AI verification fails, mark for admin review
             task.status = 'disputed'
             task.save()
+            reputation.task_rejected(task)
             
     except TaskUnit.DoesNotExist:
         pass
@@ -167,9 +174,12 @@ def simulate_peer_validation(task_id):
         # Check consensus (simple majority)
         if approved_count >= 1:  # At least 1 approval for 2 validators
             complete_task(task.id)
+            reputation.validations_settled(task, approved=True)
         else:
             task.status = 'disputed'
             task.save()
+            reputation.task_rejected(task)
+            reputation.validations_settled(task, approved=False)
             
     except TaskUnit.DoesNotExist:
         pass
@@ -211,8 +221,8 @@ def complete_task(task_id):
             project.completed_units += 1
             project.save()
             
-            # Update student reputation
-            update_student_reputation.delay(student.id)
+            # Update student reputation: one small UPDATE instead of a recount
+            reputation.task_completed(task)
             
         except TaskUnit.DoesNotExist:
             pass
@@ -220,33 +230,17 @@ def complete_task(task_id):
 @shared_task
 def update_student_reputation(student_id):
     """
-    Update student reputation based on completed tasks
+    Recompute one student's reputation from scratch (repairs; completions
+    and other events adjust it incrementally)
     """
-    from users.models import User
-    try:
-        student = User.objects.get(id=student_id)
-        completed_tasks = TaskUnit.objects.filter(
-            assigned_to=student,
-            status='completed'
-        ).count()
-        
-        # Simple reputation calculation
-        base_reputation = 3.0  # Starting point
-        task_bonus = min(completed_tasks * 0.1, 2.0)  # Max 2.0 bonus
-        student.reputation_score = base_reputation + task_bonus
-        
-        # Update tier based on reputation
-        if student.reputation_score >= 4.5:
-            student.tier = 3
-        elif student.reputation_score >= 3.5:
-            student.tier = 2
-        else:
-            student.tier = 1
-            
-        student.save()
-        
-    except User.DoesNotExist:
-        pass
+    reputation.recompute([student_id])
+
+@shared_task
+def recompute_reputation():
+    """
+    Nightly batch recompute of every student's reputation to correct drift
+    """
+    return reputation.recompute()
 
 def simulate_ai_verification(task):
     """
@@ -1,3 +1,4 @@
+import io
 from django.test import TestCase
 from django.test.utils import override_settings
 from django.contrib.auth import get_user_model
@@ -309,3 +310,218 @@ class RedisConnectivityTestCase(TestCase):
         self.assertEqual(app.main, 'backend')
         self.assertIn('redis://localhost:6379/0', str(app.conf.broker_url))
         self.assertIn('redis://localhost:6379/0', str(app.conf.result_backend))
+
+
+class UserTaskStatsTestCase(TestCase):
+    """Test per-user task counters kept on task and validation saves"""
+
+    def setUp(self):
+        from rest_framework.test import APIClient
+
+        self.client_user = User.objects.create_user(
+            username='test_client', email='client@test.com', password='testpass123', role='enterprise'
+        )
+        self.student = User.objects.create_user(
+            username='test_student', email='student@test.com', password='testpass123', role='student'
+        )
+        self.validator = User.objects.create_user(
+            username='test_validator', email='validator@test.com', password='testpass123',
+            role='student', is_verified=True
+        )
+        self.project = EnterpriseProject.objects.create(
+            title='Test Project', description='Stats', client=self.client_user, total_amount=1000.00,
+        )
+        self.tasks = [
+            TaskUnit.objects.create(
+                project=self.project, unit_index=i, title=f'Task {i}', description='Stats',
+                type='digital', pay_amount=100, status='available'
+            )
+            for i in range(6)
+        ]
+        self.api = APIClient()
+        self.api.force_authenticate(self.student)
+
+    def _stats(self, user):
+        from .models import UserTaskStats
+        return UserTaskStats.objects.get(user=user)
+
+    def test_transitions_update_counters(self):
+        """Accept, submit, complete and validate move the counters"""
+        task = self.tasks[0]
+        self.assertEqual(self.api.post(f'/api/tasks/{task.id}/accept/').status_code, 200)
+        self.assertEqual(self._stats(self.student).tasks_pending, 1)
+
+        task = TaskUnit.objects.get(pk=task.pk)
+        task.status = 'submitted'
+        task.save()
+        stats = self._stats(self.student)
+        self.assertEqual((stats.tasks_pending, stats.tasks_submitted), (1, 1))
+
+        task.status = 'completed'
+        task.save()
+        stats = self._stats(self.student)
+        self.assertEqual((stats.tasks_completed, stats.tasks_pending, stats.tasks_submitted), (1, 0, 0))
+
+        validation = TaskValidation.objects.create(task_unit=task, validator=self.validator)
+        validation.status = 'approved'
+        validation.save()
+        self.assertEqual(self._stats(self.validator).validations_done, 1)
+
+        task.delete()
+        self.assertEqual(self._stats(self.student).tasks_completed, 0)
+
+    def test_cascade_deletes_keep_counters(self):
+        """Deleting users cascades through tasks and validations without miscounting"""
+        from .models import UserTaskStats
+
+        for task in self.tasks[:2]:
+            task.status = 'completed'
+            task.save()
+            TaskValidation.objects.create(task_unit=task, validator=self.validator, status='approved')
+        self.assertEqual(self._stats(self.validator).validations_done, 2)
+
+        self.validator.delete()
+        self.assertFalse(UserTaskStats.objects.filter(user_id=self.validator.pk).exists())
+
+        for task in self.tasks[2:4]:
+            TaskUnit.objects.filter(pk=task.pk).update(assigned_to=self.student, status='completed')
+        TaskUnit.objects.filter(pk__in=[t.pk for t in self.tasks[2:4]]).delete()
+        self.project.delete()
+        self.assertFalse(UserTaskStats.objects.filter(tasks_completed__gt=0).exists())
+
+    def test_accept_limit_reads_counter(self):
+        """The sixth concurrent task is refused without counting tasks"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for task in self.tasks[:5]:
+            self.assertEqual(self.api.post(f'/api/tasks/{task.id}/accept/').status_code, 200)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.api.post(f'/api/tasks/{self.tasks[5].id}/accept/')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in ctx.captured_queries))
+
+    def test_user_stats_endpoint(self):
+        """user_stats is served from the joined stats row"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.api.post(f'/api/tasks/{self.tasks[0].id}/accept/')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.api.get('/api/auth/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['tasks_pending'], 1)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_repair_command_fixes_drift(self):
+        """repair_task_stats recounts rows changed behind the signals' back"""
+        from django.core.management import call_command
+        from .models import UserTaskStats
+
+        TaskUnit.objects.filter(pk__in=[t.pk for t in self.tasks[:3]]).update(
+            assigned_to=self.student, status='completed'
+        )
+        UserTaskStats.objects.update_or_create(user=self.validator, defaults={'validations_done': 7})
+
+        call_command('repair_task_stats', stdout=io.StringIO())
+
+        self.assertEqual(self._stats(self.student).tasks_completed, 3)
+        self.assertEqual(self._stats(self.validator).validations_done, 0)
+
+
+class ReputationEngineTestCase(TestCase):
+    """Test incremental reputation deltas and the batch recompute"""
+
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='test_client', email='client@test.com', password='testpass123', role='enterprise'
+        )
+        self.student = User.objects.create_user(
+            username='test_student', email='student@test.com', password='testpass123', role='student'
+        )
+        self.validators = [
+            User.objects.create_user(
+                username=f'validator_{i}', password='testpass123', role='student', is_verified=True
+            )
+            for i in range(2)
+        ]
+        self.project = EnterpriseProject.objects.create(
+            title='Test Project', description='Reputation', client=self.client_user, total_amount=1000.00,
+        )
+
+    def _task(self, index, status='submitted'):
+        return TaskUnit.objects.create(
+            project=self.project, unit_index=index, title=f'Task {index}', description='Reputation',
+            type='digital', pay_amount=10, status=status, assigned_to=self.student
+        )
+
+    def _score(self, user):
+        user = User.objects.get(pk=user.pk)
+        return round(user.reputation_score, 6), user.tier
+
+    @patch('wallet.tasks.release_escrow_funds.delay')
+    def test_completion_is_one_small_update(self, _release):
+        """complete_task adjusts the score without recounting tasks"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        task = self._task(1)
+        with CaptureQueriesContext(connection) as ctx:
+            complete_task(task.id)
+
+        self.assertEqual(self._score(self.student), (3.1, 1))
+        reputation_updates = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('UPDATE "users_user" SET "reputation_score"')
+        ]
+        self.assertEqual(len(reputation_updates), 1)
+        self.assertFalse(any('COUNT(' in q['sql'] for q in ctx.captured_queries))
+
+    def test_consensus_outcomes(self):
+        """A rejected task penalizes the student; validators are scored against the outcome"""
+        from .models import ReputationEvent
+
+        task = self._task(1)
+        TaskValidation.objects.create(task_unit=task, validator=self.validators[0], status='rejected')
+        TaskValidation.objects.create(task_unit=task, validator=self.validators[1], status='approved')
+        task.verification_metadata = {'peer_count': 2, 'required_approvals': 2}
+        task.save()
+
+        check_validation_consensus(task.id)
+        check_validation_consensus(task.id)  # Retries don't apply events twice
+
+        self.assertEqual(self._score(self.student), (2.8, 1))
+        self.assertEqual(self._score(self.validators[0]), (3.02, 1))
+        self.assertEqual(self._score(self.validators[1]), (2.95, 1))
+        self.assertEqual(ReputationEvent.objects.count(), 3)
+
+    def test_dispute_lost(self):
+        """A dispute resolved against the student costs reputation"""
+        from admin_dashboard.models import DisputeCase
+        from admin_dashboard.reviews import resolve_disputes
+
+        admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        disputes = [
+            DisputeCase.objects.create(title=f'D{i}', description='x', task=self._task(i), raised_by=self.client_user)
+            for i in (1, 2)
+        ]
+        resolve_disputes([disputes[0].id], admin, 'enterprise_favor', 'Bad work')
+        resolve_disputes([disputes[1].id], admin, 'student_favor', 'Fine')
+
+        self.assertEqual(self._score(self.student), (2.7, 1))
+
+    def test_recompute_corrects_drift(self):
+        """The NumPy batch recompute restores the formula and the tier"""
+        from .reputation import recompute
+
+        for i in range(25):
+            self._task(i, status='completed')
+        self.validators[0].reputation_score = 4.9
+        self.validators[0].save()
+        User.objects.filter(pk=self.student.pk).update(reputation_score=0.0, tier=1)
+
+        self.assertEqual(recompute(), 2)
+        self.assertEqual(self._score(self.student), (5.0, 3))
+        self.assertEqual(self._score(self.validators[0]), (3.0, 1))
+        self.assertEqual(recompute(), 0)
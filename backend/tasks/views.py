@@ -7,6 +7,8 @@ from django.db import transaction
 from django.utils import timezone
 from django.db.models import Q
 from .models import TaskUnit, TaskSubmission, TaskValidation
+from . import stats
+from users.authentication import account
 from .serializers import (
     TaskUnitSerializer, TaskUnitListSerializer, CreateTaskSubmissionSerializer,
     TaskValidationSerializer, AcceptTaskSerializer, TaskStreamSerializer
@@ -73,19 +75,15 @@ def accept_task(request, task_id):
             status=status.HTTP_404_NOT_FOUND
         )
     
-    # Check if student has too many pending tasks
-    pending_tasks = TaskUnit.objects.filter(
-        assigned_to=request.user,
-        status__in=['assigned', 'submitted']
-    ).count()
-    
-    if pending_tasks >= 5:  # Limit concurrent tasks
-        return Response(
-            {"error": "You have too many pending tasks. Complete some before accepting new ones."}, 
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
     with transaction.atomic():
+        # Check if student has too many pending tasks; the locked stats row
+        # also serializes concurrent accepts by the same student
+        if stats.for_user(request.user.pk, lock=True).tasks_pending >= 5:  # Limit concurrent tasks
+            return Response(
+                {"error": "You have too many pending tasks. Complete some before accepting new ones."}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         task.assigned_to = request.user
         task.status = 'assigned'
         task.assigned_at = timezone.now()
@@ -301,7 +299,7 @@ def validation_stats(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    user = request.user
+    user = account(request)
     stats = {
         'validations_completed': TaskValidation.objects.filter(validator=user).count(),
         'validations_approved': TaskValidation.objects.filter(validator=user, status='approved').count(),
@@ -4,4 +4,9 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
-    verbose_name = 'Users'
\ No newline at end of file
+    verbose_name = 'Users'
+
+    def ready(self):
+        from . import authentication, search
+        authentication.connect()
+        search.connect()
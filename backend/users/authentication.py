@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+# The columns most requests need; anything else is loaded lazily on access
+PRINCIPAL_FIELDS = (
+    'id', 'username', 'role', 'is_verified', 'tier', 'kyc_completed',
+    'is_active', 'is_staff', 'is_superuser',
+)
+
+
+def _principal_key(user_id):
+    return f'auth:principal:{user_id}'
+
+
+def account(request):
+    """
+    The full User row behind request.user. The cached principal only carries
+    PRINCIPAL_FIELDS, which is enough for permission checks; views that read
+    or write account fields (balances, contact details) load the row here,
+    once per request.
+    """
+    user = request.user
+    if not user.get_deferred_fields():
+        return user
+    full = getattr(request, '_account', None)
+    if full is None:
+        full = type(user)._default_manager.get(pk=user.pk)
+        request._account = full
+    return full
+
+
+def invalidate_principals(user_ids):
+    """Drop cached principals, e.g. after a queryset.update() on users"""
+    cache.delete_many([_principal_key(user_id) for user_id in user_ids])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user from a short-lived cache of a
+    few narrow columns instead of loading the full User row per request.
+
+    The returned object is a real User built with from_db, meant for
+    permission checks: other fields are deferred, and deferred money fields
+    can't be read at all, so views that touch account fields use account().
+    Entries are dropped whenever a user is saved or deleted. Tokens revoked
+    at logout are refused.
+    """
+
+    def get_validated_token(self, raw_token):
+        from .revocation import is_revoked
+
+        validated_token = super().get_validated_token(raw_token)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti and is_revoked(jti):
+            raise InvalidToken("Token has been revoked")
+        return validated_token
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation needs the password hash; use the full lookup
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        key = _principal_key(user_id)
+        row = cache.get(key)
+        if row is None:
+            row = self.user_model.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values(*PRINCIPAL_FIELDS).first()
+            if row is None:
+                raise AuthenticationFailed("User not found", code="user_not_found")
+            cache.set(key, row, timeout=getattr(settings, 'AUTH_PRINCIPAL_CACHE_TTL', 60))
+
+        if not row['is_active']:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        # from_db wants the loaded values in the model's field order
+        field_names = [f.attname for f in self.user_model._meta.concrete_fields if f.attname in row]
+        return self.user_model.from_db('default', field_names, [row[name] for name in field_names])
+
+
+def connect():
+    from .models import User
+
+    def on_user_changed(sender, instance, **kwargs):
+        user_id = instance.pk
+        transaction.on_commit(lambda: invalidate_principals([user_id]))
+
+    post_save.connect(on_user_changed, sender=User, weak=False, dispatch_uid='auth_principal')
+    post_delete.connect(on_user_changed, sender=User, weak=False, dispatch_uid='auth_principal')
@@ -0,0 +1,65 @@
+import io
+import os
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+IMAGE_FIELDS = ('document_front', 'document_back', 'selfie_photo')
+
+# variant -> (bounding box, Pillow format, extension, save options)
+VARIANTS = {
+    'thumb': ((320, 320), 'JPEG', 'jpg', {'quality': 70, 'optimize': True, 'progressive': True}),
+    'web': ((1280, 1280), 'WEBP', 'webp', {'quality': 80, 'method': 4}),
+}
+
+
+def _variant_sizes():
+    return getattr(settings, 'KYC_DERIVATIVE_SIZES', {})
+
+
+def _render(image, variant):
+    box, image_format, _, options = VARIANTS[variant]
+    box = tuple(_variant_sizes().get(variant, box))
+    copy = image.copy()
+    copy.thumbnail(box, Image.LANCZOS)
+    buffer = io.BytesIO()
+    copy.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def build_derivatives(record):
+    """
+    Write a thumbnail (JPEG) and a web-sized copy (WebP) of each KYC image.
+    Returns {field: {variant: storage path}} for the fields that have a file.
+    """
+    derivatives = {}
+    for field in IMAGE_FIELDS:
+        original = getattr(record, field)
+        if not original:
+            continue
+
+        with original.open('rb') as fh:
+            image = Image.open(fh)
+            image = ImageOps.exif_transpose(image).convert('RGB')
+
+        derivatives[field] = {}
+        for variant, (_, _, extension, _) in VARIANTS.items():
+            path = os.path.join('kyc_derivatives', str(record.pk), f'{field}_{variant}.{extension}')
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            derivatives[field][variant] = default_storage.save(
+                path, ContentFile(_render(image, variant))
+            )
+    return derivatives
+
+
+def derivative_urls(record, request=None):
+    """{field: {variant: url}} for the derivatives generated so far"""
+    urls = {}
+    for field, variants in (record.derivatives or {}).items():
+        urls[field] = {}
+        for variant, path in variants.items():
+            url = default_storage.url(path)
+            urls[field][variant] = request.build_absolute_uri(url) if request else url
+    return urls
@@ -0,0 +1,224 @@
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+from .phones import normalize_phone
+
+PROFILE_FIELDS = ('student_id', 'date_of_birth', 'address')
+
+
+class ImportRowSerializer(serializers.Serializer):
+    """
+    One row of a bulk import. Uniqueness is checked per chunk by the
+    importer rather than with a query per row.
+    """
+    username = serializers.CharField(max_length=150)
+    email = serializers.EmailField()
+    phone = serializers.CharField(max_length=20)
+    password = serializers.CharField(required=False, allow_blank=True)
+    role = serializers.ChoiceField(choices=('student', 'enterprise'), default='student')
+    student_id = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    date_of_birth = serializers.DateField(required=False, allow_null=True)
+    address = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_password(self, value):
+        if value:
+            try:
+                validate_password(value)
+            except DjangoValidationError as e:
+                raise serializers.ValidationError(list(e.messages))
+        return value
+
+    def validate_phone(self, value):
+        try:
+            normalize_phone(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+    def validate_role(self, value):
+        allowed = self.context.get('allowed_roles')
+        if allowed and value not in allowed:
+            raise serializers.ValidationError(f"Role '{value}' can't be imported here")
+        return value
+
+
+def read_rows(stream, fmt):
+    """Yield (row_number, dict) from a CSV or NDJSON text stream"""
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=2):
+            yield number, {key: value for key, value in row.items() if key and value != ''}
+    elif fmt == 'ndjson':
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else {'__invalid__': line}
+    else:
+        raise ValueError(f"Unsupported import format '{fmt}'")
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def _hash_all(passwords, pool):
+    if pool is None:
+        return [make_password(password) for password in passwords]
+    return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // 32)))
+
+
+class UserImporter:
+    """
+    Stream rows in chunks: validate, check uniqueness with one query per
+    field, hash the chunk's passwords across a process pool, then write users
+    and profiles with bulk_create. Rows that fail are reported, not raised.
+    """
+
+    def __init__(self, allowed_roles=None, chunk_size=None, workers=None):
+        self.allowed_roles = allowed_roles
+        self.chunk_size = chunk_size or getattr(settings, 'USER_IMPORT_CHUNK_SIZE', 1000)
+        self.workers = workers if workers is not None else getattr(settings, 'USER_IMPORT_WORKERS', 1)
+        self.seen = {'username': set(), 'phone_e164': set()}
+        self.created = 0
+        self.processed = 0
+        self.truncated = False
+        self.errors = []
+
+    def run(self, rows, max_rows=None):
+        rows = iter(rows)
+        limited = rows if max_rows is None else islice(rows, max_rows)
+
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        try:
+            while True:
+                chunk = list(islice(limited, self.chunk_size))
+                if not chunk:
+                    break
+                self.processed += len(chunk)
+                self._import_chunk(chunk, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if max_rows is not None and next(rows, None) is not None:
+            self.truncated = True
+        if self.created:
+            from .search import rebuild_search_index
+            rebuild_search_index()
+        return self.report()
+
+    def report(self):
+        return {
+            'processed': self.processed,
+            'created': self.created,
+            'truncated': self.truncated,
+            'errors': self.errors,
+        }
+
+    def _validate(self, chunk):
+        from .models import User
+
+        valid = []
+        for number, row in chunk:
+            if '__invalid__' in row:
+                self.errors.append({'row': number, 'errors': {'non_field_errors': ['Invalid JSON']}})
+                continue
+            serializer = ImportRowSerializer(data=row, context={'allowed_roles': self.allowed_roles})
+            if not serializer.is_valid():
+                self.errors.append({'row': number, 'errors': serializer.errors})
+                continue
+            data = serializer.validated_data
+            data['phone_e164'] = normalize_phone(data['phone'])
+            valid.append((number, data))
+
+        # The same number in another format is still a duplicate
+        unique_fields = {'username': 'username', 'phone_e164': 'phone'}
+        taken = {
+            field: set(User.objects.filter(
+                **{f'{field}__in': [data[field] for _, data in valid]}
+            ).values_list(field, flat=True))
+            for field in unique_fields
+        }
+
+        unique = []
+        for number, data in valid:
+            duplicated = {
+                label: [f"A user with this {label} already exists."]
+                for field, label in unique_fields.items()
+                if data[field] in taken[field] or data[field] in self.seen[field]
+            }
+            if duplicated:
+                self.errors.append({'row': number, 'errors': duplicated})
+                continue
+            for field in unique_fields:
+                self.seen[field].add(data[field])
+            unique.append((number, data))
+        return unique
+
+    def _import_chunk(self, chunk, pool):
+        from .models import User
+
+        rows = self._validate(chunk)
+        if not rows:
+            return
+
+        hashes = _hash_all([data.get('password') or None for _, data in rows], pool)
+        users = []
+        for (_, data), password in zip(rows, hashes):
+            user = User(
+                username=User.normalize_username(data['username']),
+                email=User.objects.normalize_email(data['email']),
+                phone=data['phone'],
+                role=data['role'],
+                password=password,
+            )
+            user.sync_minor_units()
+            user.sync_phone()
+            users.append(user)
+
+        try:
+            with transaction.atomic():
+                self._write(rows, users)
+        except IntegrityError:
+            # Someone registered a clashing user meanwhile; save the rest
+            for row, user in zip(rows, users):
+                user.pk = None
+                try:
+                    with transaction.atomic():
+                        self._write([row], [user])
+                except IntegrityError:
+                    self.errors.append({'row': row[0], 'errors': {
+                        'non_field_errors': ['Conflicts with an existing user']
+                    }})
+
+    def _write(self, rows, users):
+        from admin_dashboard import activity, counters
+        from .models import User, UserProfile
+
+        users = User.objects.bulk_create(users, batch_size=1000)
+        UserProfile.objects.bulk_create([
+            UserProfile(user=user, **{field: data[field] for field in PROFILE_FIELDS if data.get(field)})
+            for user, (_, data) in zip(users, rows)
+        ], batch_size=1000)
+
+        # bulk_create sends no signals; keep the feed and counters in step
+        activity.record_bulk_created('user', users)
+        delta = {}
+        for user in users:
+            for name, value in counters.user_contributions(user).items():
+                delta[name] = delta.get(name, 0) + value
+        counters.apply_delta(delta)
+        self.created += len(users)
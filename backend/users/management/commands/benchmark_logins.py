@@ -0,0 +1,75 @@
+import asyncio
+import json
+import os
+import random
+import time
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import AsyncRequestFactory
+
+from users import passwords, views
+from users.models import User
+
+PASSWORD = 'bench-Passw0rd!'
+
+
+class Command(BaseCommand):
+    help = "Benchmark logins/sec through the async login view at several concurrency levels"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=64)
+        parser.add_argument('--logins', type=int, default=64,
+                            help='Logins per concurrency level')
+        parser.add_argument('--concurrency', type=int, nargs='*', default=[1, 4, 16, 64],
+                            help='Requests in flight at once; 1 is what a sync worker does')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        workers = passwords.executor()._max_workers
+        self.stdout.write(
+            f"profile {settings.PASSWORD_HASH_PROFILE} "
+            f"({passwords.ConfigurablePBKDF2PasswordHasher().iterations} iterations), "
+            f"hashing workers {workers}, cpus {os.cpu_count()}"
+        )
+
+        with transaction.atomic():
+            encoded = make_password(PASSWORD)
+            users = User.objects.bulk_create([
+                User(username=f'bench_login_{rng.randrange(10**9)}_{i}',
+                     email=f'bench_login_{i}_{rng.randrange(10**9)}@example.com',
+                     password=encoded)
+                for i in range(options['users'])
+            ], batch_size=1000)
+            emails = [user.email for user in users]
+
+            for concurrency in options['concurrency']:
+                elapsed = async_to_sync(self.run_logins)(emails, options['logins'], concurrency)
+                rate = options['logins'] / elapsed
+                cores = min(concurrency, workers, os.cpu_count() or 1)
+                self.stdout.write(
+                    f"concurrency {concurrency:4d}  {rate:8.1f} logins/s  "
+                    f"{rate / cores:8.1f} logins/s/core"
+                )
+
+            transaction.set_rollback(True)
+
+    async def run_logins(self, emails, logins, concurrency):
+        factory = AsyncRequestFactory()
+        semaphore = asyncio.Semaphore(concurrency)
+        login_view = views.LoginView.as_view()
+
+        async def login(email):
+            async with semaphore:
+                request = factory.post('/', data=json.dumps({'email': email, 'password': PASSWORD}),
+                                       content_type='application/json')
+                response = await login_view(request)
+                if response.status_code != 200:
+                    raise RuntimeError(f"Login failed with {response.status_code}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(login(emails[i % len(emails)]) for i in range(logins)))
+        return time.perf_counter() - started
@@ -0,0 +1,59 @@
+from django.db import migrations
+
+# Frozen copy of the index definitions in users.search at the time of this
+# migration; later changes there need a new migration, not an edit here.
+FTS_TABLE = 'users_search_fts'
+# PostgreSQL: pg_trgm GIN indexes on the same UPPER(...) expressions that
+# Django's icontains lookup generates, so LIKE '%term%' uses them.
+POSTGRES_INDEXES = (
+    ('users_user_username_trgm', 'users_user', 'username'),
+    ('users_user_email_trgm', 'users_user', 'email'),
+    ('users_user_phone_trgm', 'users_user', 'phone'),
+    ('users_kycrecord_document_number_trgm', 'users_kycrecord', 'document_number'),
+)
+FTS_INSERT_SQL = (
+    f"INSERT INTO {FTS_TABLE} (user_id, username, email, phone, document_numbers) "
+    f"SELECT u.id, u.username, COALESCE(u.email, ''), COALESCE(u.phone, ''), "
+    f"COALESCE((SELECT group_concat(k.document_number, ' ') FROM users_kycrecord k "
+    f"WHERE k.user_id = u.id), '') FROM users_user u"
+)
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for name, table, column in POSTGRES_INDEXES:
+            schema_editor.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                f'ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+            )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"user_id UNINDEXED, username, email, phone, document_numbers, tokenize='trigram')"
+        )
+        schema_editor.execute(f'DELETE FROM {FTS_TABLE}')
+        schema_editor.execute(FTS_INSERT_SQL)
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for name, _, _ in POSTGRES_INDEXES:
+            schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('users', '0002_user_wallet_balance_minor'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kycrecord',
+            name='derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
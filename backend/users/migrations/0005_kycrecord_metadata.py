@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_kycrecord_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kycrecord',
+            name='metadata',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:42
+
+from django.db import migrations, models
+
+
+def recompute_reputation(apps, schema_editor):
+    """Bring every student onto the new formula (users start at the base score)"""
+    from tasks.reputation import recompute
+    recompute(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_kycrecord_metadata'),
+        ('tasks', '0005_reputationevent'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='reputation_score',
+            field=models.FloatField(default=3.0),
+        ),
+        migrations.RunPython(recompute_reputation, migrations.RunPython.noop),
+    ]
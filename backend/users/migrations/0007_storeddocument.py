@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_reputation_base_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('file', models.FileField(max_length=255, upload_to='kyc_uploads/')),
+                ('size', models.PositiveBigIntegerField()),
+                ('content_type', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processed', 'Processed'), ('invalid', 'Invalid')], default='pending', max_length=20)),
+                ('width', models.PositiveIntegerField(blank=True, null=True)),
+                ('height', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
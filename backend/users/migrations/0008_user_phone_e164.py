@@ -0,0 +1,72 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:54
+
+import logging
+
+from django.db import migrations, models
+
+from users.phones import normalize_phone
+
+logger = logging.getLogger(__name__)
+
+
+def populate_phone_e164(apps, schema_editor):
+    """
+    Normalize existing numbers. When several accounts hold the same number
+    in different formats, the oldest keeps the normalized value; the others,
+    like unparseable numbers, stay None (and can't log in by phone) and are
+    logged so support can merge or correct them.
+    """
+    User = apps.get_model('users', 'User')
+    owners = {}
+    duplicates = []
+    invalid = []
+    batch = []
+    for user in User.objects.exclude(phone=None).exclude(phone='').order_by('pk').only('pk', 'phone').iterator():
+        try:
+            normalized = normalize_phone(user.phone)
+        except ValueError:
+            invalid.append(user.pk)
+            continue
+        if normalized in owners:
+            duplicates.append((user.pk, owners[normalized]))
+            continue
+        owners[normalized] = user.pk
+        user.phone_e164 = normalized
+        batch.append(user)
+        if len(batch) >= 1000:
+            User.objects.bulk_update(batch, ['phone_e164'])
+            batch = []
+    User.objects.bulk_update(batch, ['phone_e164'])
+
+    if duplicates:
+        logger.warning(
+            "%d users share a phone number with an older account and got no phone_e164 "
+            "(user id -> kept by): %s",
+            len(duplicates), ', '.join(f'{pk} -> {kept}' for pk, kept in duplicates)
+        )
+    if invalid:
+        logger.warning(
+            "%d users have a phone number that can't be normalized: %s",
+            len(invalid), ', '.join(str(pk) for pk in invalid)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_storeddocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='phone_e164',
+            field=models.CharField(blank=True, editable=False, max_length=16, null=True),
+        ),
+        migrations.RunPython(populate_phone_e164, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='user',
+            name='phone_e164',
+            field=models.CharField(blank=True, editable=False, max_length=16, null=True, unique=True),
+        ),
+    ]
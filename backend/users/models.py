@@ -1,8 +1,11 @@
+import uuid
 from django.contrib.auth.models import AbstractUser, Group, Permission
 from django.db import models
 from djmoney.models.fields import MoneyField
+from wallet.money import MinorUnitsMixin
+from .phones import normalize_phone
 
-class User(AbstractUser):
+class User(MinorUnitsMixin, AbstractUser):
     ROLE_CHOICES = (
         ('student', 'Student'),
         ('enterprise', 'Enterprise'),
@@ -10,6 +13,7 @@ class User(AbstractUser):
     )
     
     phone = models.CharField(max_length=20, unique=True, null=True, blank=True)
+    phone_e164 = models.CharField(max_length=16, unique=True, null=True, blank=True, editable=False)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='student')
     kyc_completed = models.BooleanField(default=False)
     wallet_balance = MoneyField(
@@ -18,7 +22,8 @@ class User(AbstractUser):
         default_currency='NGN',
         default=0
     )
-    reputation_score = models.FloatField(default=0.0)
+    wallet_balance_minor = models.BigIntegerField(default=0, editable=False)
+    reputation_score = models.FloatField(default=3.0)  # tasks.reputation.BASE_SCORE
     tier = models.IntegerField(default=1)
     is_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -27,6 +32,40 @@ class User(AbstractUser):
     groups = models.ManyToManyField(Group, related_name='user_realted_groups')
     user_permissions = models.ManyToManyField(Permission, related_name='user_related_permissions')
     
+    minor_unit_fields = ('wallet_balance',)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_phone = instance.__dict__.get('phone', models.DEFERRED)
+        return instance
+    
+    def sync_phone(self):
+        """Derive the indexed E.164 form that phone lookups use"""
+        try:
+            self.phone_e164 = normalize_phone(self.phone)
+        except ValueError:
+            self.phone_e164 = None
+    
+    def _phone_changed(self):
+        if self._state.adding:
+            return True
+        loaded = getattr(self, '_loaded_phone', models.DEFERRED)
+        if 'phone' not in self.__dict__:
+            return False
+        return loaded is models.DEFERRED or self.phone != loaded
+    
+    def save(self, *args, **kwargs):
+        # Only a changed number is re-derived: rows the backfill left without
+        # one (duplicates of another account's number) must stay saveable
+        if self._phone_changed():
+            self.sync_phone()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'phone' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'phone_e164'}
+        super().save(*args, **kwargs)
+        self._loaded_phone = self.__dict__.get('phone', models.DEFERRED)
+    
     def __str__(self):
         return f"{self.username} ({self.role})"
 
@@ -59,7 +98,67 @@ class KYCRecord(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     verified_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='verified_kyc')
     verified_at = models.DateTimeField(null=True, blank=True)
+    derivatives = models.JSONField(default=dict, blank=True, editable=False)  # thumbnails/web copies, see images.py
+    metadata = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"KYC for {self.user.username}"
+
+
+class StoredDocument(models.Model):
+    """
+    One stored copy of an uploaded KYC image per distinct content. Records
+    that upload identical bytes share the file; decoding, EXIF stripping and
+    resizing happen later in Celery (see uploads.py).
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('processed', 'Processed'),
+        ('invalid', 'Invalid'),
+    )
+    
+    sha256 = models.CharField(max_length=64, unique=True)  # Of the bytes as uploaded
+    file = models.FileField(upload_to='kyc_uploads/', max_length=255)
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.file.name} ({self.status})"
+
+
+class UserImportJob(models.Model):
+    """
+    A bulk import uploaded over the API. The file is kept until a Celery
+    worker has imported it (see tasks.run_user_import); the per-row report
+    is what the status endpoint returns.
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    )
+    FORMAT_CHOICES = (
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON'),
+    )
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='import_jobs')
+    file = models.FileField(upload_to='user_imports/', max_length=255, null=True, blank=True)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    allowed_roles = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    report = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
     
     def __str__(self):
-        return f"KYC for {self.user.username}"
\ No newline at end of file
+        return f"Import {self.id} by {self.requested_by.username} ({self.status})"
@@ -0,0 +1,128 @@
+import hashlib
+import hmac
+import math
+import secrets
+import time
+from django.conf import settings
+from django.core.cache import cache
+
+VERIFIED = 'verified'
+INVALID = 'invalid'
+LOCKED = 'locked'
+
+
+class SlidingWindowLimiter:
+    """
+    Sliding-window counter kept in the default cache (Redis in production).
+    The previous fixed window is weighted by how much of it still overlaps
+    the sliding window, so each hit is one get_many plus one incr.
+    """
+
+    def __init__(self, name, limit, window):
+        self.name = name
+        self.limit = limit
+        self.window = window
+
+    def _key(self, identifier, index):
+        return f"otp:limit:{self.name}:{identifier}:{index}"
+
+    def hit(self, identifier):
+        """Count one attempt. Returns 0 if allowed, else seconds until a retry may succeed"""
+        now = time.time()
+        index = int(now // self.window)
+        current_key = self._key(identifier, index)
+        previous_key = self._key(identifier, index - 1)
+
+        cache.add(current_key, 0, timeout=self.window * 2)
+        try:
+            used = cache.incr(current_key)
+        except ValueError:
+            # The window expired between add() and incr()
+            cache.set(current_key, 1, timeout=self.window * 2)
+            used = 1
+
+        previous = cache.get(previous_key, 0)
+        overlap = 1 - (now % self.window) / self.window
+        if previous * overlap + used <= self.limit:
+            return 0
+
+        cache.decr(current_key)
+        return max(1, math.ceil(self.window - now % self.window))
+
+    def release(self, identifier):
+        """Give back a hit that another limit refused"""
+        try:
+            cache.decr(self._key(identifier, int(time.time() // self.window)))
+        except ValueError:
+            pass
+
+
+def _limiters():
+    limits = getattr(settings, 'OTP_SEND_LIMITS', {})
+    return (
+        SlidingWindowLimiter('phone', *limits.get('phone', (3, 600))),
+        SlidingWindowLimiter('ip', *limits.get('ip', (20, 3600))),
+    )
+
+
+def _code_key(phone):
+    return f"otp:code:{phone}"
+
+
+def _attempts_key(phone):
+    return f"otp:attempts:{phone}"
+
+
+def _digest(phone, code):
+    return hmac.new(settings.SECRET_KEY.encode(), f'{phone}:{code}'.encode(), hashlib.sha256).hexdigest()
+
+
+def issue(phone, ip):
+    """
+    Create a code for `phone` unless the phone or IP is over its send limit.
+    Returns (code, retry_after); code is None when the send was refused.
+    Only a keyed hash of the code is stored.
+    """
+    phone_limiter, ip_limiter = _limiters()
+    ip = ip or 'unknown'
+    retry_after = ip_limiter.hit(ip)
+    if retry_after:
+        return None, retry_after
+    retry_after = phone_limiter.hit(phone)
+    if retry_after:
+        ip_limiter.release(ip)
+        return None, retry_after
+
+    length = getattr(settings, 'OTP_LENGTH', 6)
+    ttl = getattr(settings, 'OTP_TTL', 300)
+    code = f'{secrets.randbelow(10 ** length):0{length}d}'
+
+    # A new code replaces the previous one and resets its attempts
+    cache.set_many({_code_key(phone): _digest(phone, code), _attempts_key(phone): 0}, timeout=ttl)
+    return code, 0
+
+
+def verify(phone, code):
+    """
+    Check `code` for `phone`: VERIFIED, INVALID (wrong or expired) or
+    LOCKED (too many attempts; the code is discarded). A code verifies once.
+    """
+    stored = cache.get(_code_key(phone))
+    if stored is None:
+        return INVALID
+
+    try:
+        attempts = cache.incr(_attempts_key(phone))
+    except ValueError:
+        # The code expired meanwhile
+        return INVALID
+
+    if attempts > getattr(settings, 'OTP_MAX_ATTEMPTS', 5):
+        cache.delete_many([_code_key(phone), _attempts_key(phone)])
+        return LOCKED
+
+    if not hmac.compare_digest(stored, _digest(phone, str(code))):
+        return INVALID
+
+    cache.delete_many([_code_key(phone), _attempts_key(phone)])
+    return VERIFIED
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import hashers
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class ConfigurablePBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count taken from the active
+    PASSWORD_HASH_PROFILE. Keeps Django's algorithm name, so existing hashes
+    verify as before and are upgraded on the next successful login.
+    """
+
+    @property
+    def iterations(self):
+        profiles = getattr(settings, 'PASSWORD_HASH_PROFILES', {})
+        profile = getattr(settings, 'PASSWORD_HASH_PROFILE', 'default')
+        return profiles.get(profile, hashers.PBKDF2PasswordHasher.iterations)
+
+
+def executor():
+    """
+    Shared pool for password hashing. hashlib releases the GIL while it
+    works, so threads give real parallelism and the pool size caps how many
+    cores logins may take from the rest of the process.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'PASSWORD_HASH_WORKERS', 4),
+                    thread_name_prefix='password-hash'
+                )
+    return _executor
+
+
+def verify(password, encoded):
+    """
+    Check `password` against a stored hash without touching the database.
+    Returns (valid, new_encoded); new_encoded is set when the hash was made
+    with other parameters than the current profile and should be replaced.
+    """
+    if encoded is None:
+        # Unknown user: spend the same time as a real check
+        hashers.make_password(password)
+        return False, None
+
+    rehash = []
+    valid = hashers.check_password(password, encoded, setter=rehash.append)
+    return valid, hashers.make_password(password) if valid and rehash else None
+
+
+async def averify(password, encoded):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor(), verify, password, encoded)
+
+
+async def amake_password(password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor(), hashers.make_password, password)
@@ -0,0 +1,39 @@
+import re
+from django.conf import settings
+
+_SEPARATORS = re.compile(r'[\s\-.()/]')
+
+
+def default_country_code():
+    return str(getattr(settings, 'PHONE_DEFAULT_COUNTRY_CODE', '234'))
+
+
+def normalize_phone(value, country_code=None):
+    """
+    Return `value` in E.164 form (`+2348031234567`). National numbers, with
+    or without their trunk 0, get the default country code; `00` and a bare
+    country code prefix are read as international. Raises ValueError for
+    anything that can't be a phone number; returns None for blank input.
+    """
+    if value is None:
+        return None
+    number = _SEPARATORS.sub('', str(value))
+    if not number:
+        return None
+
+    country_code = country_code or default_country_code()
+    if number.startswith('+'):
+        digits = number[1:]
+    elif number.startswith('00'):
+        digits = number[2:]
+    elif number.startswith('0'):
+        digits = country_code + number[1:]
+    elif number.startswith(country_code) and len(number) > len(country_code) + 9:
+        digits = number
+    else:
+        digits = country_code + number
+
+    # E.164 allows at most 15 digits; shorter than 8 can't be a subscriber
+    if not digits.isdigit() or digits.startswith('0') or not 8 <= len(digits) <= 15:
+        raise ValueError(f"'{value}' is not a valid phone number")
+    return '+' + digits
@@ -0,0 +1,128 @@
+import hashlib
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+REVISION_KEY = 'jwt:revoked:revision'
+
+_filter = None
+_lock = threading.Lock()
+
+
+def _revoked_key(jti):
+    return f'jwt:revoked:{jti}'
+
+
+def _log_key(revision):
+    return f'jwt:revoked:log:{revision}'
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over token ids. A miss is definite; a hit only
+    means the id may have been revoked and has to be confirmed in the cache.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+        self.revision = 0
+        self.synced_at = None
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+def _new_filter():
+    return BloomFilter(
+        getattr(settings, 'JWT_REVOCATION_BLOOM_CAPACITY', 100_000),
+        getattr(settings, 'JWT_REVOCATION_BLOOM_ERROR_RATE', 0.01),
+    )
+
+
+def _replay(bloom, start, end):
+    """Add the revocations logged after `start` up to `end` to `bloom`"""
+    revisions = range(start + 1, end + 1)
+    for offset in range(0, len(revisions), 1000):
+        keys = [_log_key(revision) for revision in revisions[offset:offset + 1000]]
+        for jti in cache.get_many(keys).values():
+            bloom.add(jti)
+    bloom.revision = end
+
+
+def _sync(force=False):
+    """
+    Bring this process's filter up to date with the revocation log, at most
+    once per JWT_REVOCATION_SYNC_INTERVAL. Between syncs a lookup for an id
+    that isn't in the filter needs no cache round trip at all.
+    """
+    global _filter
+    interval = getattr(settings, 'JWT_REVOCATION_SYNC_INTERVAL', 1.0)
+    bloom = _filter
+    now = time.monotonic()
+    if bloom is not None and not force and now - bloom.synced_at < interval:
+        return bloom
+
+    with _lock:
+        bloom = _filter
+        if bloom is not None and not force and now - bloom.synced_at < interval:
+            return bloom
+
+        remote = cache.get(REVISION_KEY, 0)
+        if bloom is None or remote < bloom.revision or bloom.count > bloom.capacity:
+            # First use, a flushed cache or a saturated filter: rebuild from
+            # the log entries that haven't expired with their tokens
+            bloom = _new_filter()
+            _replay(bloom, max(0, remote - bloom.capacity), remote)
+        elif remote > bloom.revision:
+            _replay(bloom, bloom.revision, remote)
+        bloom.synced_at = now
+        _filter = bloom
+    return bloom
+
+
+def revoke(token):
+    """
+    Revoke a token until it expires. Returns False if it was already revoked,
+    which lets a caller refuse to act on the same token twice.
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    ttl = max(1, math.ceil(token['exp'] - time.time()))
+    if not cache.add(_revoked_key(jti), 1, timeout=ttl):
+        return False
+
+    cache.add(REVISION_KEY, 0, timeout=None)
+    revision = cache.incr(REVISION_KEY)
+    cache.set(_log_key(revision), jti, timeout=ttl)
+    _sync().add(jti)
+    return True
+
+
+def is_revoked(jti):
+    if jti not in _sync():
+        return False
+    return cache.get(_revoked_key(jti)) is not None
+
+
+def reset():
+    """Forget the local filter; the next lookup rebuilds it from the log"""
+    global _filter
+    with _lock:
+        _filter = None
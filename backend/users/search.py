@@ -0,0 +1,105 @@
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_init, post_save
+
+FTS_TABLE = 'users_search_fts'
+SEARCH_FIELDS = ('username', 'email', 'phone')
+MIN_INDEXED_LENGTH = 3  # Trigram indexes can't serve shorter fragments
+
+# users/migrations/0003_user_search_index builds the indexes: pg_trgm GIN
+# indexes on the UPPER(...) expressions that icontains generates on
+# PostgreSQL, and on SQLite an FTS5 trigram shadow table, one row per user
+FTS_INSERT_SQL = (
+    f"INSERT INTO {FTS_TABLE} (user_id, username, email, phone, document_numbers) "
+    f"SELECT u.id, u.username, COALESCE(u.email, ''), COALESCE(u.phone, ''), "
+    f"COALESCE((SELECT group_concat(k.document_number, ' ') FROM users_kycrecord k "
+    f"WHERE k.user_id = u.id), '') FROM users_user u"
+)
+
+
+def _fts_match(term):
+    return '"%s"' % term.replace('"', '""')
+
+
+def search_users(queryset, term):
+    """
+    Narrow a User queryset to rows whose username, email, phone or KYC
+    document number contains `term` (case-insensitive).
+    """
+    from .models import User, KYCRecord
+
+    term = (term or '').strip()
+    if not term:
+        return queryset
+
+    if len(term) >= MIN_INDEXED_LENGTH and connection.vendor == 'sqlite':
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT user_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [_fts_match(term)]
+        ))
+
+    if connection.vendor == 'postgresql':
+        # One indexed lookup per column, combined with UNION so each can
+        # use its own trigram index
+        matches = User.objects.filter(username__icontains=term).values('id')
+        for field in ('email', 'phone'):
+            matches = matches.union(User.objects.filter(**{f'{field}__icontains': term}).values('id'))
+        matches = matches.union(
+            KYCRecord.objects.filter(document_number__icontains=term).values('user_id')
+        )
+        return queryset.filter(id__in=matches)
+
+    return queryset.filter(
+        Q(username__icontains=term) | Q(email__icontains=term) | Q(phone__icontains=term) |
+        Q(id__in=KYCRecord.objects.filter(document_number__icontains=term).values('user_id'))
+    )
+
+
+def reindex_user(user_id):
+    """Refresh one user's row in the SQLite FTS table"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE user_id = %s', [user_id])
+        cursor.execute(f'{FTS_INSERT_SQL} WHERE u.id = %s', [user_id])
+
+
+def rebuild_search_index():
+    """Repopulate the SQLite FTS table, e.g. after bulk_create (no signals)"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(FTS_INSERT_SQL)
+
+
+def connect():
+    """Keep the SQLite FTS table in step; PostgreSQL indexes maintain themselves"""
+    from .models import User, KYCRecord
+
+    def snapshot(instance):
+        return tuple(instance.__dict__.get(field) for field in SEARCH_FIELDS)
+
+    def on_user_init(sender, instance, **kwargs):
+        instance._search_state = snapshot(instance) if instance.pk is not None else None
+
+    def on_user_saved(sender, instance, created, raw=False, **kwargs):
+        state = snapshot(instance)
+        if created or state != getattr(instance, '_search_state', None):
+            reindex_user(instance.pk)
+        instance._search_state = state
+
+    def on_user_deleted(sender, instance, **kwargs):
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE user_id = %s', [instance.pk])
+
+    def on_kyc_changed(sender, instance, **kwargs):
+        reindex_user(instance.user_id)
+
+    post_init.connect(on_user_init, sender=User, weak=False, dispatch_uid='user_search')
+    post_save.connect(on_user_saved, sender=User, weak=False, dispatch_uid='user_search')
+    post_delete.connect(on_user_deleted, sender=User, weak=False, dispatch_uid='user_search')
+    post_save.connect(on_kyc_changed, sender=KYCRecord, weak=False, dispatch_uid='kyc_search')
+    post_delete.connect(on_kyc_changed, sender=KYCRecord, weak=False, dispatch_uid='kyc_search')
@@ -1,10 +1,30 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from . import revocation, uploads
+from .images import derivative_urls
 from .models import UserProfile, KYCRecord
+from .phones import normalize_phone
 
 User = get_user_model()
 
+def validate_phone_number(value, instance=None):
+    """Reject numbers that don't normalize or that another account holds in any format"""
+    try:
+        normalized = normalize_phone(value)
+    except ValueError as e:
+        raise serializers.ValidationError(str(e))
+    
+    others = User.objects.filter(phone_e164=normalized)
+    if instance is not None:
+        others = others.exclude(pk=instance.pk)
+    if normalized and others.exists():
+        raise serializers.ValidationError("A user with this phone number already exists.")
+    return value
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, validators=[validate_password])
     password_confirm = serializers.CharField(write_only=True)
@@ -18,6 +38,9 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             'username': {'required': True}
         }
     
+    def validate_phone(self, value):
+        return validate_phone_number(value)
+    
     def validate(self, attrs):
         if attrs['password'] != attrs['password_confirm']:
             raise serializers.ValidationError({"password": "Password fields don't match."})
@@ -30,7 +53,17 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data.pop('password_confirm')
-        user = User.objects.create_user(**validated_data)
+        password_hash = validated_data.pop('password_hash', None)
+        if password_hash is None:
+            user = User.objects.create_user(**validated_data)
+        else:
+            # Already hashed off the event loop by the async register view
+            validated_data.pop('password')
+            user = User(**validated_data)
+            user.username = User.normalize_username(user.username)
+            user.email = User.objects.normalize_email(user.email)
+            user.password = password_hash
+            user.save()
         
         # Create user profile
         UserProfile.objects.create(user=user)
@@ -53,12 +86,41 @@ class UserSerializer(serializers.ModelSerializer):
                  'profile', 'created_at')
         read_only_fields = ('id', 'kyc_completed', 'wallet_balance', 
                            'reputation_score', 'tier', 'is_verified', 'created_at')
+    
+    def validate_phone(self, value):
+        return validate_phone_number(value, self.instance)
+
+class KYCUploadField(serializers.FileField):
+    """
+    Accepts a KYC image after sniffing its header only. Unlike ImageField it
+    doesn't decode the image in the request; the Celery pipeline does.
+    """
+    default_error_messages = {
+        'invalid_image': 'Upload a JPEG, PNG or WebP image.',
+        'too_large': 'Images must be at most {max_size} bytes.',
+    }
+    
+    def to_internal_value(self, data):
+        upload = super().to_internal_value(data)
+        if upload.size > uploads.max_upload_bytes():
+            self.fail('too_large', max_size=uploads.max_upload_bytes())
+        if uploads.sniff(upload) is None:
+            self.fail('invalid_image')
+        return upload
 
 class KYCRecordSerializer(serializers.ModelSerializer):
+    document_front = KYCUploadField()
+    document_back = KYCUploadField(required=False, allow_null=True)
+    selfie_photo = KYCUploadField()
+    derivative_urls = serializers.SerializerMethodField()
+    
     class Meta:
         model = KYCRecord
         fields = '__all__'
-        read_only_fields = ('user', 'status', 'verified_by', 'verified_at')
+        read_only_fields = ('user', 'status', 'verified_by', 'verified_at', 'derivatives')
+    
+    def get_derivative_urls(self, obj):
+        return derivative_urls(obj, self.context.get('request'))
 
 class UserLoginSerializer(serializers.Serializer):
     email = serializers.EmailField(required=False)
@@ -72,4 +134,24 @@ class UserLoginSerializer(serializers.Serializer):
         if not email and not phone:
             raise serializers.ValidationError("Either email or phone must be provided.")
         
-        return attrs
\ No newline at end of file
+        return attrs
+
+class RevokingTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refuses revoked refresh tokens and, when refresh tokens rotate, revokes
+    the one it was given so it can't be exchanged a second time.
+    """
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        jti = refresh.get(api_settings.JTI_CLAIM)
+        if jti and revocation.is_revoked(jti):
+            raise InvalidToken("Token has been revoked")
+        
+        data = super().validate(attrs)
+        
+        if api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION:
+            if not revocation.revoke(refresh):
+                # A concurrent refresh rotated this token first
+                raise InvalidToken("Token has been revoked")
+        return data
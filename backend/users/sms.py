@@ -0,0 +1,54 @@
+import logging
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Messages sent through LocMemSMSBackend, like django.core.mail.outbox
+outbox = []
+
+
+class BaseSMSBackend:
+    """Delivers one text message; a provider integration subclasses this"""
+
+    def send(self, phone, message):
+        raise NotImplementedError
+
+
+class UnconfiguredSMSBackend(BaseSMSBackend):
+    """
+    The default until SMS_BACKEND names a provider: refuses to send, so a
+    deploy without one fails loudly instead of dropping or logging codes.
+    """
+
+    def send(self, phone, message):
+        raise ImproperlyConfigured(
+            "SMS_BACKEND is not set; configure a provider backend "
+            "(users.sms.LoggingSMSBackend for local development)"
+        )
+
+
+class LoggingSMSBackend(BaseSMSBackend):
+    """
+    Writes messages to the log instead of sending them, for local
+    development only: the log then holds live codes.
+    """
+
+    def send(self, phone, message):
+        logger.info("SMS to %s: %s", phone, message)
+
+
+class LocMemSMSBackend(BaseSMSBackend):
+    """Keeps messages in `outbox` for tests"""
+
+    def send(self, phone, message):
+        outbox.append({'phone': phone, 'message': message})
+
+
+def get_backend():
+    return import_string(getattr(settings, 'SMS_BACKEND', 'users.sms.UnconfiguredSMSBackend'))()
+
+
+def send(phone, message):
+    get_backend().send(phone, message)
@@ -0,0 +1,100 @@
+import io
+from celery import shared_task
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from .models import KYCRecord, StoredDocument, UserImportJob
+
+
+@shared_task
+def generate_kyc_derivatives(record_id):
+    """
+    Build thumbnails and web-sized variants of a KYC record's images so the
+    review queue never has to load the full-resolution uploads
+    """
+    from .images import build_derivatives
+
+    try:
+        record = KYCRecord.objects.get(id=record_id)
+    except KYCRecord.DoesNotExist:
+        return None
+
+    derivatives = build_derivatives(record)
+    KYCRecord.objects.filter(id=record_id).update(derivatives=derivatives)
+    return derivatives
+
+
+@shared_task
+def process_kyc_documents(record_id):
+    """
+    Validate and strip the EXIF data of a new KYC record's images, note
+    documents other users have also submitted, then build derivatives
+    """
+    from .images import IMAGE_FIELDS
+    from .uploads import process
+
+    try:
+        record = KYCRecord.objects.get(id=record_id)
+    except KYCRecord.DoesNotExist:
+        return None
+
+    names = {field: getattr(record, field).name for field in IMAGE_FIELDS if getattr(record, field)}
+    documents = {doc.file.name: process(doc) for doc in StoredDocument.objects.filter(file__in=names.values())}
+
+    metadata = dict(record.metadata)
+    invalid = [field for field, name in names.items() if name in documents and documents[name].status == 'invalid']
+    if invalid:
+        metadata['invalid_images'] = invalid
+
+    shared = {}
+    for field, name in names.items():
+        matches = Q()
+        for other_field in IMAGE_FIELDS:
+            matches |= Q(**{other_field: name})
+        users = sorted(set(
+            KYCRecord.objects.filter(matches).exclude(user=record.user_id).values_list('user_id', flat=True)
+        ))
+        if users:
+            shared[field] = users
+    if shared:
+        # The same document under several accounts is worth a reviewer's look
+        metadata['shared_with_users'] = shared
+
+    if metadata != record.metadata:
+        KYCRecord.objects.filter(id=record_id).update(metadata=metadata)
+    if not invalid:
+        generate_kyc_derivatives(record_id)
+    return {'invalid_images': invalid, 'shared_with_users': shared}
+
+
+@shared_task
+def run_user_import(job_id):
+    """
+    Import the file behind an API bulk import job. Passwords are hashed in
+    this worker; the process pool is left to manage.py import_users so one
+    upload can't take over every core of a worker host. The uploaded file,
+    which holds plain passwords, is deleted whatever the outcome.
+    """
+    from .imports import UserImporter, read_rows
+
+    claimed = UserImportJob.objects.filter(id=job_id, status='pending').update(status='running')
+    if not claimed:
+        return None
+    job = UserImportJob.objects.get(id=job_id)
+
+    try:
+        with job.file.open('rb') as upload:
+            stream = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+            report = UserImporter(allowed_roles=job.allowed_roles, workers=1).run(
+                read_rows(stream, job.format), max_rows=settings.USER_IMPORT_MAX_ROWS
+            )
+    except Exception as e:
+        job.status, job.error = 'failed', str(e)
+        raise
+    else:
+        job.status, job.report = 'completed', report
+    finally:
+        job.file.delete(save=False)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'report', 'error', 'file', 'finished_at'])
+    return report
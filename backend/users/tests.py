@@ -1,3 +1,780 @@
+import io
+import shutil
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.test.utils import override_settings
+from PIL import Image
 
-# Create your tests here.
+from .models import User, KYCRecord
+from .tasks import generate_kyc_derivatives
+
+
+def make_image(name, size=(3000, 2000), color=(200, 30, 30)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class KYCDerivativeTestCase(TestCase):
+    """Test thumbnail and web-sized derivatives for KYC images"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.user = User.objects.create_user(
+            username='student_user', email='student@test.com', password='testpass123', role='student'
+        )
+        self.record = KYCRecord.objects.create(
+            user=self.user,
+            document_type='nin',
+            document_number='12345678901',
+            document_front=make_image('front.png'),
+            selfie_photo=make_image('selfie.png', size=(1000, 3000)),
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_derivatives_are_generated(self):
+        """Each uploaded image gets a bounded JPEG thumbnail and WebP copy"""
+        from django.core.files.storage import default_storage
+
+        derivatives = generate_kyc_derivatives(self.record.id)
+
+        self.assertEqual(set(derivatives), {'document_front', 'selfie_photo'})
+        with default_storage.open(derivatives['document_front']['thumb']) as fh:
+            thumb = Image.open(fh)
+            self.assertEqual(thumb.format, 'JPEG')
+            self.assertLessEqual(max(thumb.size), 320)
+        with default_storage.open(derivatives['selfie_photo']['web']) as fh:
+            web = Image.open(fh)
+            self.assertEqual(web.format, 'WEBP')
+            self.assertEqual(web.size[1], 1280)
+
+        self.record.refresh_from_db()
+        self.assertEqual(self.record.derivatives, derivatives)
+
+    def test_regeneration_keeps_paths(self):
+        """Running the task again overwrites rather than piling up files"""
+        first = generate_kyc_derivatives(self.record.id)
+        second = generate_kyc_derivatives(self.record.id)
+        self.assertEqual(first, second)
+
+    def test_review_serializer_exposes_urls(self):
+        """The admin review queue gets derivative URLs"""
+        from admin_dashboard.serializers import KYCReviewSerializer
+
+        generate_kyc_derivatives(self.record.id)
+        self.record.refresh_from_db()
+        urls = KYCReviewSerializer(self.record).data['derivative_urls']
+
+        self.assertTrue(urls['document_front']['thumb'].endswith('document_front_thumb.jpg'))
+        self.assertTrue(urls['selfie_photo']['web'].startswith('/media/kyc_derivatives/'))
+
+
+class CachedJWTAuthenticationTestCase(TestCase):
+    """Test the cached user principal behind JWT authentication"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='student_user', email='student@test.com', password='testpass123', role='student'
+        )
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+
+    def _user_queries(self, path):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(path, **self.auth)
+        self.assertEqual(response.status_code, 200)
+        return [q['sql'] for q in ctx.captured_queries if 'FROM "users_user"' in q['sql']]
+
+    def test_warm_requests_skip_user_query(self):
+        """After the first request the task stream never reads users_user"""
+        self.assertEqual(len(self._user_queries('/api/tasks/stream/')), 1)
+        self.assertEqual(self._user_queries('/api/tasks/stream/'), [])
+
+    def test_role_change_invalidates(self):
+        """Saving the user drops the cached principal"""
+        self._user_queries('/api/tasks/stream/')
+        self.user.role = 'enterprise'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        response = self.client.get('/api/tasks/stream/', **self.auth)
+        self.assertEqual(response.status_code, 403)
+
+    def test_principal_loads_other_fields_lazily(self):
+        """The principal is a User; unloaded columns are fetched on access"""
+        from rest_framework.test import APIRequestFactory
+        from .authentication import CachedJWTAuthentication
+
+        request = APIRequestFactory().get('/', **self.auth)
+        user, _ = CachedJWTAuthentication().authenticate(request)
+
+        self.assertEqual(user.role, 'student')
+        self.assertIn('email', user.get_deferred_fields())
+        self.assertEqual(user.email, 'student@test.com')
+
+    def test_account_endpoints_with_jwt(self):
+        """Views reading or writing account fields get the full row, not the principal"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        response = self.client.get('/api/wallet/summary/', **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['currency'], 'NGN')
+
+        response = self.client.post(
+            '/api/wallet/withdraw/', {'amount': '500.00', 'bank_account_id': 1},
+            content_type='application/json', **self.auth
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Insufficient balance', str(response.json()))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/auth/profile/', **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('wallet_balance', response.json())
+        self.assertEqual(response.json()['email'], 'student@test.com')
+        # Principal from cache, then one full row; no lazy query per column
+        self.assertEqual(len([q for q in ctx.captured_queries if 'FROM "users_user"' in q['sql']]), 1)
+
+        response = self.client.patch(
+            '/api/auth/profile/', {'email': 'renamed@test.com'}, content_type='application/json', **self.auth
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(User.objects.get(pk=self.user.pk).email, 'renamed@test.com')
+
+    def test_inactive_user_rejected(self):
+        """Deactivated users can't authenticate with an old token"""
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get('/api/tasks/stream/', **self.auth)
+        self.assertEqual(response.status_code, 401)
+
+
+class TokenRevocationTestCase(TestCase):
+    """Test refresh rotation, logout and the revocation filter"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from . import revocation
+
+        cache.clear()
+        revocation.reset()
+        self.user = User.objects.create_user(
+            username='student_user', email='student@test.com', password='testpass123', role='student'
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+
+    def _refresh(self, token):
+        return self.client.post('/api/auth/token/refresh/', {'refresh': str(token)}, content_type='application/json')
+
+    def test_rotated_refresh_token_cannot_be_reused(self):
+        """Rotation revokes the old refresh token; the new one keeps working"""
+        first = self._refresh(self.refresh)
+        self.assertEqual(first.status_code, 200)
+
+        self.assertEqual(self._refresh(self.refresh).status_code, 401)
+        self.assertEqual(self._refresh(first.json()['refresh']).status_code, 200)
+
+    def test_logout_revokes_refresh_and_access(self):
+        """After logout neither token of the session is accepted"""
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {self.refresh.access_token}'}
+        response = self.client.post('/api/auth/logout/', {'refresh': str(self.refresh)}, **auth)
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.client.get('/api/auth/stats/', **auth).status_code, 401)
+        self.assertEqual(self._refresh(self.refresh).status_code, 401)
+
+    def test_logout_rejects_other_users_token(self):
+        """A refresh token can only be revoked by its owner"""
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        other = User.objects.create_user(
+            username='other_user', email='other@test.com', password='testpass123', role='student'
+        )
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(other).access_token}'}
+        response = self.client.post('/api/auth/logout/', {'refresh': str(self.refresh)}, **auth)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self._refresh(self.refresh).status_code, 200)
+
+    def test_unrevoked_lookup_skips_cache_between_syncs(self):
+        """Within the sync interval a filter miss costs no cache access"""
+        from unittest import mock
+        from . import revocation
+
+        revocation.revoke(self.refresh)
+        with mock.patch.object(revocation, 'cache') as cache:
+            self.assertFalse(revocation.is_revoked('not-revoked'))
+        cache.get.assert_not_called()
+        self.assertTrue(revocation.is_revoked(self.refresh['jti']))
+
+    def test_new_process_rebuilds_filter_from_log(self):
+        """Revocations made elsewhere are replayed from the cache log"""
+        from . import revocation
+
+        revocation.revoke(self.refresh)
+        revocation.reset()
+        self.assertTrue(revocation.is_revoked(self.refresh['jti']))
+
+        with override_settings(JWT_REVOCATION_SYNC_INTERVAL=0):
+            token = self.refresh.access_token
+            revocation.reset()
+            revocation.is_revoked('warm-up')
+            # Another process revokes: write straight to the shared log
+            from django.core.cache import cache
+            cache.add(revocation._revoked_key(token['jti']), 1, timeout=60)
+            revision = cache.incr(revocation.REVISION_KEY)
+            cache.set(revocation._log_key(revision), token['jti'], timeout=60)
+            self.assertTrue(revocation.is_revoked(token['jti']))
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        """Every added id is reported; unrelated ids mostly aren't"""
+        from .revocation import BloomFilter
+
+        bloom = BloomFilter(1000, 0.01)
+        ids = [f'jti-{i}' for i in range(1000)]
+        for jti in ids:
+            bloom.add(jti)
+        self.assertTrue(all(jti in bloom for jti in ids))
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+@override_settings(PASSWORD_HASH_PROFILES={'test': 1000, 'stronger': 2000}, PASSWORD_HASH_PROFILE='test')
+class AsyncAuthViewsTestCase(TestCase):
+    """Test the async register/login views and rehash-on-login"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='student_user', email='student@test.com', phone='08012345678',
+            password='testpass123', role='student'
+        )
+
+    def _login(self, **data):
+        return self.client.post('/api/auth/login/', data, content_type='application/json')
+
+    def test_login_by_email_and_phone(self):
+        """Both identifiers return a token pair"""
+        for credentials in ({'email': 'student@test.com'}, {'phone': '08012345678'}):
+            response = self._login(password='testpass123', **credentials)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('access', response.json())
+            self.assertEqual(response.json()['user']['username'], 'student_user')
+
+    def test_bad_credentials_rejected(self):
+        """Wrong passwords, unknown users and inactive users get 401"""
+        self.assertEqual(self._login(email='student@test.com', password='wrong').status_code, 401)
+        self.assertEqual(self._login(email='nobody@test.com', password='testpass123').status_code, 401)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self._login(email='student@test.com', password='testpass123').status_code, 401)
+
+    def test_rehash_on_login_after_profile_change(self):
+        """A hash from an older cost profile is replaced at the next login"""
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+        with override_settings(PASSWORD_HASH_PROFILE='stronger'):
+            response = self._login(email='student@test.com', password='testpass123')
+        self.assertEqual(response.status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+        self.assertTrue(self.user.check_password('testpass123'))
+
+    def test_register(self):
+        """Registration stores a usable hash and returns tokens"""
+        response = self.client.post('/api/auth/register/', {
+            'username': 'new_student', 'email': 'new@test.com', 'phone': '08099999999',
+            'password': 'S3cure-pass!', 'password_confirm': 'S3cure-pass!', 'role': 'student',
+        }, content_type='application/json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('refresh', response.json())
+        user = User.objects.get(username='new_student')
+        self.assertTrue(user.check_password('S3cure-pass!'))
+        self.assertTrue(hasattr(user, 'profile'))
+
+    def test_register_validation_errors(self):
+        """Serializer errors come back as 400"""
+        response = self.client.post('/api/auth/register/', {
+            'username': 'student_user', 'email': 'x@test.com', 'phone': '1',
+            'password': 'S3cure-pass!', 'password_confirm': 'other', 'role': 'student',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('username', response.json())
+
+    def test_drf_contract_kept(self):
+        """Throttles, DRF error bodies and the OpenAPI schema still apply"""
+        from django.core.cache import cache
+        from drf_spectacular.generators import SchemaGenerator
+        from unittest.mock import patch
+        from django.urls import path
+        from rest_framework.throttling import AnonRateThrottle
+        from .views import LoginView, RegisterView
+
+        response = self.client.post('/api/auth/login/', '{"email": ', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('detail', response.json())
+
+        class OneLoginPerMinute(AnonRateThrottle):
+            rate = '1/min'
+
+        cache.clear()
+        with patch.object(LoginView, 'throttle_classes', [OneLoginPerMinute]):
+            self.assertEqual(self._login(email='student@test.com', password='testpass123').status_code, 200)
+            response = self._login(email='student@test.com', password='testpass123')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+        patterns = [path('login/', LoginView.as_view()), path('register/', RegisterView.as_view())]
+        paths = SchemaGenerator(patterns=patterns).get_schema(public=True)['paths']
+        self.assertIn('requestBody', paths['/login/']['post'])
+        self.assertIn('requestBody', paths['/register/']['post'])
+
+
+@override_settings(SMS_BACKEND='users.sms.LocMemSMSBackend')
+class OTPTestCase(TestCase):
+    """Test cache-backed OTP issue/verify and send limits"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from . import sms
+
+        cache.clear()
+        sms.outbox.clear()
+        self.user = User.objects.create_user(
+            username='student_user', email='student@test.com', phone='08012345678',
+            password='testpass123', role='student'
+        )
+
+    def _send(self, phone='08012345678', ip='10.0.0.1'):
+        return self.client.post('/api/auth/send-otp/', {'phone': phone}, REMOTE_ADDR=ip)
+
+    def _verify(self, code, phone='08012345678'):
+        return self.client.post('/api/auth/verify-otp/', {'phone': phone, 'otp': code})
+
+    def _sent_code(self):
+        import re
+        from . import sms
+
+        return re.search(r'\d{6}', sms.outbox[-1]['message']).group()
+
+    def test_send_and_verify_once(self):
+        """A code is texted, verifies once, and only a hash of it is stored"""
+        from django.core.cache import cache
+        from . import sms
+
+        response = self._send()
+        self.assertNotIn('demo_otp', response.json())
+        self.assertEqual(sms.outbox[-1]['phone'], '+2348012345678')
+        code = self._sent_code()
+        self.assertNotIn(code, str(cache.get('otp:code:08012345678')))
+
+        response = self._verify(code)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.json())
+        self.assertEqual(self._verify(code).status_code, 400)
+
+    def test_unconfigured_backend_refuses_to_send(self):
+        """Without SMS_BACKEND codes aren't logged or dropped: sending raises"""
+        from django.conf import settings
+        from django.core.exceptions import ImproperlyConfigured
+        from . import sms
+
+        with self.settings():
+            del settings.SMS_BACKEND
+            self.assertIsInstance(sms.get_backend(), sms.UnconfiguredSMSBackend)
+            with self.assertRaises(ImproperlyConfigured):
+                self._send()
+        self.assertEqual(sms.outbox, [])
+
+    def test_wrong_codes_lock_out(self):
+        """After OTP_MAX_ATTEMPTS wrong guesses even the right code fails"""
+        self._send()
+        code = self._sent_code()
+        wrong = '000000' if code != '000000' else '111111'
+        with self.settings(OTP_MAX_ATTEMPTS=2):
+            self.assertEqual(self._verify(wrong).status_code, 400)
+            self.assertEqual(self._verify(wrong).status_code, 400)
+            self.assertEqual(self._verify(code).status_code, 429)
+
+    def test_no_database_queries_before_verification(self):
+        """Sends and failed verifies never touch the database"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            self._send()
+            self._verify('not-it')
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_send_limits_per_phone_and_ip(self):
+        """Sliding-window limits apply per phone and per client IP"""
+        with self.settings(OTP_SEND_LIMITS={'phone': (2, 600), 'ip': (3, 600)}):
+            self.assertEqual(self._send().status_code, 200)
+            self.assertEqual(self._send().status_code, 200)
+            response = self._send()
+            self.assertEqual(response.status_code, 429)
+            self.assertIn('Retry-After', response)
+
+            # Another phone from the same IP still has IP budget left once
+            self.assertEqual(self._send(phone='08000000001').status_code, 200)
+            self.assertEqual(self._send(phone='08000000002').status_code, 429)
+            self.assertEqual(self._send(phone='08000000002', ip='10.0.0.2').status_code, 200)
+
+    def test_code_exposed_only_when_opted_in(self):
+        """OTP_EXPOSE_CODE returns the texted code for demos"""
+        with self.settings(OTP_EXPOSE_CODE=True):
+            self.assertEqual(self._send().json()['demo_otp'], self._sent_code())
+
+
+@override_settings(PASSWORD_HASH_PROFILES={'test': 1000}, PASSWORD_HASH_PROFILE='test')
+class PhoneNormalizationTestCase(TestCase):
+    """Test E.164 normalization and the phone lookups that use it"""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='student_user', email='student@test.com', phone='0803 123 4567',
+            password='testpass123', role='student'
+        )
+
+    def test_normalize_formats(self):
+        """Common ways of writing the same number agree; junk is rejected"""
+        from .phones import normalize_phone
+
+        for value in ('08031234567', '+2348031234567', '2348031234567', '002348031234567',
+                      '8031234567', '+234 (803) 123-4567'):
+            self.assertEqual(normalize_phone(value), '+2348031234567')
+        self.assertEqual(normalize_phone('+447911123456'), '+447911123456')
+        self.assertIsNone(normalize_phone(''))
+        for value in ('12', '0803-CALL-NOW', '+0123456789', '+1234567890123456'):
+            with self.assertRaises(ValueError):
+                normalize_phone(value)
+
+    def test_phone_e164_kept_in_step(self):
+        """The normalized column follows the phone on every save"""
+        self.assertEqual(self.user.phone_e164, '+2348031234567')
+        self.user.phone = '+2348099999999'
+        self.user.save(update_fields=['phone'])
+        self.assertEqual(User.objects.get(pk=self.user.pk).phone_e164, '+2348099999999')
+
+    def test_duplicate_left_by_backfill_stays_saveable(self):
+        """A row the backfill left without phone_e164 saves until its number changes"""
+        other = User.objects.create_user(
+            username='second_user', email='second@test.com', phone='0803 123 9999',
+            password='testpass123', role='student'
+        )
+        # What migration 0008 leaves for a later account sharing a number
+        User.objects.filter(pk=other.pk).update(phone='08031234567', phone_e164=None)
+
+        other = User.objects.get(pk=other.pk)
+        other.first_name = 'Second'
+        other.save()
+        other.save(update_fields=['first_name'])
+        self.assertIsNone(User.objects.get(pk=other.pk).phone_e164)
+
+        other.phone = '0803 555 0000'
+        other.save(update_fields=['phone'])
+        self.assertEqual(User.objects.get(pk=other.pk).phone_e164, '+2348035550000')
+
+    def test_login_by_any_format_is_one_probe(self):
+        """Each format logs in with a single users_user query"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for phone in ('08031234567', '+2348031234567', '2348031234567'):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(
+                    '/api/auth/login/', {'phone': phone, 'password': 'testpass123'}, content_type='application/json'
+                )
+            self.assertEqual(response.status_code, 200)
+            lookups = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT') and 'FROM "users_user"' in q['sql']]
+            self.assertEqual(len(lookups), 1)
+            self.assertIn('"phone_e164" =', lookups[0])
+
+    def test_duplicate_in_other_format_rejected(self):
+        """Registration and import treat other formats as the same number"""
+        from .imports import UserImporter
+
+        response = self.client.post('/api/auth/register/', {
+            'username': 'copycat', 'email': 'copy@test.com', 'phone': '+234 803 123 4567',
+            'password': 'S3cure-pass!', 'password_confirm': 'S3cure-pass!', 'role': 'student',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('phone', response.json())
+
+        report = UserImporter().run([
+            (2, {'username': 'a', 'email': 'a@uni.edu', 'phone': '2348031234567'}),
+            (3, {'username': 'b', 'email': 'b@uni.edu', 'phone': '0805 000 0000'}),
+            (4, {'username': 'c', 'email': 'c@uni.edu', 'phone': '+2348050000000'}),
+        ])
+        self.assertEqual(report['created'], 1)
+        self.assertEqual([error['row'] for error in report['errors']], [2, 4])
+        self.assertEqual(User.objects.get(username='b').phone_e164, '+2348050000000')
+
+    def test_otp_shared_across_formats(self):
+        """A code sent to one format verifies from another and returns the user"""
+        with self.settings(OTP_EXPOSE_CODE=True, SMS_BACKEND='users.sms.LocMemSMSBackend'):
+            code = self.client.post('/api/auth/send-otp/', {'phone': '08031234567'}).json()['demo_otp']
+        response = self.client.post('/api/auth/verify-otp/', {'phone': '+2348031234567', 'otp': code})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['username'], 'student_user')
+
+        response = self.client.post('/api/auth/send-otp/', {'phone': 'not a phone'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+class BulkUserImportTestCase(TestCase):
+    """Test the streaming bulk user import"""
+
+    def setUp(self):
+        from rest_framework.test import APIClient
+
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.enterprise = User.objects.create_user(
+            username='enterprise_user', email='enterprise@test.com', phone='08000000000',
+            password='testpass123', role='enterprise'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.enterprise)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _import(self, upload):
+        """Queue an import, run its job, and return the finished job's status"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/auth/bulk-import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 202)
+        return self.client.get(response.data['status_url'])
+
+    def _csv(self, rows):
+        header = 'username,email,phone,password,student_id\n'
+        return SimpleUploadedFile('students.csv', (header + ''.join(rows)).encode(), content_type='text/csv')
+
+    def test_csv_import_reports_row_errors(self):
+        """Valid rows are created with profiles; bad rows are reported by line"""
+        from .models import UserProfile
+
+        upload = self._csv([
+            'ada,ada@uni.edu,08011111111,Str0ng-pass!,STU1\n',
+            'bola,not-an-email,08022222222,Str0ng-pass!,STU2\n',
+            'enterprise_user,e2@uni.edu,08033333333,Str0ng-pass!,STU3\n',
+            'chi,chi@uni.edu,08011111111,Str0ng-pass!,STU4\n',
+            'dayo,dayo@uni.edu,08044444444,,STU5\n',
+        ])
+        response = self._import(upload)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'completed')
+        report = response.data['report']
+        self.assertEqual(report['processed'], 5)
+        self.assertEqual(report['created'], 2)
+        self.assertEqual([error['row'] for error in report['errors']], [3, 4, 5])
+        self.assertIn('email', report['errors'][0]['errors'])
+        self.assertIn('phone', report['errors'][2]['errors'])
+
+        ada = User.objects.get(username='ada')
+        self.assertTrue(ada.check_password('Str0ng-pass!'))
+        self.assertEqual(UserProfile.objects.get(user=ada).student_id, 'STU1')
+        self.assertFalse(User.objects.get(username='dayo').has_usable_password())
+
+    def test_enterprises_import_students_only(self):
+        """An enterprise can't create enterprise accounts"""
+        upload = SimpleUploadedFile('rows.ndjson', (
+            '{"username": "ent2", "email": "e@uni.edu", "phone": "0801", "role": "enterprise"}\n'
+            'not json\n'
+        ).encode())
+        report = self._import(upload).data['report']
+
+        self.assertEqual(report['created'], 0)
+        self.assertIn('role', report['errors'][0]['errors'])
+        self.assertEqual(report['errors'][1]['row'], 2)
+
+    def test_students_cannot_import(self):
+        student = User.objects.create_user(username='s', password='testpass123', role='student')
+        self.client.force_authenticate(student)
+        response = self.client.post('/api/auth/bulk-import/', {'file': self._csv([])}, format='multipart')
+        self.assertEqual(response.status_code, 403)
+
+    def test_import_is_queued(self):
+        """The request only stores the file; the job reports once a worker ran it"""
+        import os
+        from unittest.mock import patch
+        from .models import UserImportJob
+        from .tasks import run_user_import
+
+        with patch('users.views.run_user_import.delay') as delay, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/auth/bulk-import/', {
+                'file': self._csv(['ada,ada@uni.edu,08011111111,Str0ng-pass!,STU1\n'])
+            }, format='multipart')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], 'pending')
+        delay.assert_called_once_with(response.data['id'])
+        self.assertFalse(User.objects.filter(username='ada').exists())
+
+        job = UserImportJob.objects.get(id=response.data['id'])
+        path = job.file.path
+        run_user_import(str(job.id))
+        self.assertEqual(self.client.get(response.data['status_url']).data['report']['created'], 1)
+        self.assertFalse(os.path.exists(path))
+
+        # Running it again (a redelivered message) does nothing
+        self.assertIsNone(run_user_import(str(job.id)))
+
+        # Only the requester and admins can see it
+        other = User.objects.create_user(username='other_enterprise', password='testpass123', role='enterprise')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(response.data['status_url']).status_code, 404)
+
+    def test_process_pool_and_search_index(self):
+        """Passwords hash in worker processes and imported users are searchable"""
+        import io as _io
+        from .imports import UserImporter, read_rows
+        from .search import search_users
+
+        rows = ''.join(
+            f'student{i},s{i}@uni.edu,0809{i:07d},Str0ng-pass!{i},\n' for i in range(30)
+        )
+        stream = _io.StringIO('username,email,phone,password,student_id\n' + rows)
+        report = UserImporter(workers=2, chunk_size=8).run(read_rows(stream, 'csv'))
+
+        self.assertEqual((report['created'], report['errors']), (30, []))
+        self.assertTrue(User.objects.get(username='student29').check_password('Str0ng-pass!29'))
+        self.assertEqual(search_users(User.objects.all(), 'student17').count(), 1)
+
+
+class KYCUploadPipelineTestCase(TestCase):
+    """Test hashed streaming uploads, dedupe and deferred image processing"""
+
+    def setUp(self):
+        from rest_framework.test import APIClient
+
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.users = [
+            User.objects.create_user(username=f'student_{i}', password='testpass123', role='student')
+            for i in range(2)
+        ]
+        self.client = APIClient()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _jpeg_with_exif(self, name, color=(10, 120, 200)):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+        exif[0x010F] = 'PhoneMaker'
+        buffer = io.BytesIO()
+        Image.new('RGB', (400, 200), color).save(buffer, format='JPEG', exif=exif)
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+    def _submit(self, user, front, selfie):
+        from unittest.mock import patch
+
+        self.client.force_authenticate(user)
+        with patch('users.views.process_kyc_documents.delay') as delay, \
+                patch('PIL.Image.open', side_effect=AssertionError('decoded in the request')):
+            response = self.client.post('/api/auth/kyc/', {
+                'document_type': 'nin', 'document_number': '12345678901',
+                'document_front': front, 'selfie_photo': selfie,
+            }, format='multipart')
+        return response, delay
+
+    def test_upload_is_hashed_and_deferred(self):
+        """The request stores by content hash and leaves decoding to Celery"""
+        import hashlib
+        from .models import StoredDocument
+
+        front = self._jpeg_with_exif('front.jpg')
+        digest = hashlib.sha256(front.read()).hexdigest()
+        front.seek(0)
+
+        response, delay = self._submit(self.users[0], front, make_image('selfie.png', size=(300, 300)))
+
+        self.assertEqual(response.status_code, 201)
+        record = KYCRecord.objects.get(pk=response.data['id'])
+        document = StoredDocument.objects.get(sha256=digest)
+        self.assertEqual(record.document_front.name, document.file.name)
+        self.assertEqual(document.status, 'pending')
+        delay.assert_called_once_with(record.id)
+
+    def test_one_temporary_file_per_upload(self):
+        """The handler's hashed temporary file is the only one created"""
+        import tempfile as _tempfile
+        from unittest.mock import patch
+
+        with patch('django.core.files.uploadedfile.tempfile.NamedTemporaryFile',
+                   wraps=_tempfile.NamedTemporaryFile) as temporary:
+            response, _ = self._submit(
+                self.users[0], self._jpeg_with_exif('front.jpg'), make_image('selfie.png', size=(300, 300))
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(temporary.call_count, 2)
+
+    def test_identical_documents_are_stored_once(self):
+        """Re-uploading the same bytes reuses the file and flags the shared document"""
+        from .models import StoredDocument
+        from .tasks import process_kyc_documents
+
+        front = self._jpeg_with_exif('front.jpg')
+        first, _ = self._submit(self.users[0], front, make_image('a.png', size=(300, 300)))
+        front.seek(0)
+        second, _ = self._submit(self.users[1], front, make_image('b.png', size=(300, 300), color=(0, 0, 0)))
+
+        self.assertEqual(StoredDocument.objects.count(), 3)
+        result = process_kyc_documents(second.data['id'])
+        self.assertEqual(result['shared_with_users'], {'document_front': [self.users[0].id]})
+
+    def test_processing_strips_exif_and_builds_derivatives(self):
+        """Celery applies the EXIF orientation, drops the metadata and builds derivatives"""
+        from django.core.files.storage import default_storage
+        from .models import StoredDocument
+        from .tasks import process_kyc_documents
+
+        response, _ = self._submit(self.users[0], self._jpeg_with_exif('front.jpg'),
+                                   make_image('selfie.png', size=(300, 300)))
+        process_kyc_documents(response.data['id'])
+
+        record = KYCRecord.objects.get(pk=response.data['id'])
+        document = StoredDocument.objects.get(file=record.document_front.name)
+        self.assertEqual((document.status, document.width, document.height), ('processed', 200, 400))
+        with default_storage.open(document.file.name) as fh:
+            image = Image.open(fh)
+            self.assertEqual(len(image.getexif()), 0)
+            self.assertEqual(image.size, (200, 400))
+        self.assertIn('thumb', record.derivatives['document_front'])
+
+    def test_non_images_rejected_without_decoding(self):
+        """Headers are sniffed; anything that isn't JPEG/PNG/WebP gets a 400"""
+        response, delay = self._submit(
+            self.users[0], SimpleUploadedFile('front.jpg', b'%PDF-1.7 not an image'),
+            make_image('selfie.png', size=(300, 300))
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('document_front', response.data)
+        delay.assert_not_called()
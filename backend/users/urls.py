@@ -4,13 +4,16 @@ from . import views
 
 urlpatterns = [
     path('register/', views.RegisterView.as_view(), name='register'),
-    path('login/', views.login_view, name='login'),
+    path('login/', views.LoginView.as_view(), name='login'),
+    path('logout/', views.logout_view, name='logout'),
     path('profile/', views.UserProfileView.as_view(), name='user-profile'),
     path('profile/detail/', views.UserProfileDetailView.as_view(), name='user-profile-detail'),
     path('kyc/', views.KYCRecordView.as_view(), name='kyc-records'),
     path('send-otp/', views.send_otp, name='send-otp'),
     path('verify-otp/', views.verify_otp, name='verify-otp'),
     path('stats/', views.user_stats, name='user-stats'),
+    path('bulk-import/', views.bulk_import_users, name='user-bulk-import'),
+    path('bulk-import/<uuid:job_id>/', views.bulk_import_status, name='user-bulk-import-status'),
     
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
@@ -1,80 +1,127 @@
+import os
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.contrib.auth import authenticate
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from .serializers import (
     UserRegistrationSerializer, UserSerializer, UserProfileSerializer, 
     KYCRecordSerializer, UserLoginSerializer
 )
-from .models import UserProfile, KYCRecord
+from .models import UserProfile, KYCRecord, UserImportJob
+from .images import IMAGE_FIELDS
+from .tasks import process_kyc_documents, run_user_import
+from .uploads import HashingFileUploadHandler
+from . import otp, passwords, revocation, sms, uploads
+from .authentication import account
+from .phones import normalize_phone
+from admin_dashboard import events
+from tasks.models import UserTaskStats
+from tasks.stats import for_user as task_stats_for_user
 
 User = get_user_model()
 
-class RegisterView(generics.CreateAPIView):
-    queryset = User.objects.all()
+class _AsyncAPIView(generics.GenericAPIView):
+    """
+    GenericAPIView whose handlers are coroutines. Authentication,
+    permissions and throttles run as usual (in a thread, since they may hit
+    the cache or database) and errors go through DRF's exception handler.
+    """
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            if not iscoroutinefunction(handler):
+                # OPTIONS metadata and 405s
+                handler = sync_to_async(handler)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+def _auth_payload(user):
+    refresh = RefreshToken.for_user(user)
+    return {
+        'user': UserSerializer(user).data,
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+    }
+
+class RegisterView(_AsyncAPIView):
+    """
+    Register a user. Password hashing runs in the shared hashing pool so
+    the event loop keeps serving other requests meanwhile.
+    """
     permission_classes = (permissions.AllowAny,)
     serializer_class = UserRegistrationSerializer
 
-    def create(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-        
-        # Generate tokens
-        refresh = RefreshToken.for_user(user)
-        
-        return Response({
-            'user': UserSerializer(user, context=self.get_serializer_context()).data,
-            'refresh': str(refresh),
-            'access': str(refresh.access_token),
-        }, status=status.HTTP_201_CREATED)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
 
-@api_view(['POST'])
-@permission_classes([permissions.AllowAny])
-def login_view(request):
-    serializer = UserLoginSerializer(data=request.data)
-    serializer.is_valid(raise_exception=True)
-    
-    data = serializer.validated_data
-    email = data.get('email')
-    phone = data.get('phone')
-    password = data.get('password')
-    
-    # Authenticate user
-    if email:
-        user = authenticate(request, email=email, password=password)
-    else:
-        try:
-            user = User.objects.get(phone=phone)
-            if user.check_password(password):
-                user = user
-            else:
-                user = None
-        except User.DoesNotExist:
-            user = None
-    
-    if user is not None:
-        refresh = RefreshToken.for_user(user)
-        
-        return Response({
-            'user': UserSerializer(user).data,
-            'refresh': str(refresh),
-            'access': str(refresh.access_token),
-        })
-    else:
-        return Response(
-            {'error': 'Invalid credentials'}, 
-            status=status.HTTP_401_UNAUTHORIZED
-        )
+        password_hash = await passwords.amake_password(serializer.validated_data['password'])
+        user = await sync_to_async(serializer.save)(password_hash=password_hash)
+
+        return Response(await sync_to_async(_auth_payload)(user), status=status.HTTP_201_CREATED)
+
+class LoginView(_AsyncAPIView):
+    """
+    Log in with email or phone. The password check runs in the hashing
+    pool, and a hash made under an older cost profile is replaced.
+    """
+    permission_classes = (permissions.AllowAny,)
+    serializer_class = UserLoginSerializer
+
+    async def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        data = serializer.validated_data
+
+        if data.get('email'):
+            user = await User.objects.filter(email=data['email']).order_by('pk').afirst()
+        else:
+            # One probe on the unique E.164 index, whatever format was typed
+            try:
+                phone = normalize_phone(data.get('phone'))
+            except ValueError:
+                phone = None
+            user = await User.objects.filter(phone_e164=phone).afirst() if phone else None
+
+        valid, new_hash = await passwords.averify(data['password'], user.password if user else None)
+        if not valid or not user.is_active:
+            return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        if new_hash:
+            user.password = new_hash
+            await User.objects.filter(pk=user.pk).aupdate(password=new_hash)
+
+        return Response(await sync_to_async(_auth_payload)(user))
 
 class UserProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = (permissions.IsAuthenticated,)
     
     def get_object(self):
-        return self.request.user
+        return account(self.request)
 
 class UserProfileDetailView(generics.RetrieveUpdateAPIView):
     serializer_class = UserProfileSerializer
@@ -88,50 +135,92 @@ class KYCRecordView(generics.ListCreateAPIView):
     serializer_class = KYCRecordSerializer
     permission_classes = (permissions.IsAuthenticated,)
     
+    def initialize_request(self, request, *args, **kwargs):
+        # Stream uploads to disk and hash them on the way in
+        request.upload_handlers = [HashingFileUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+    
     def get_queryset(self):
         return KYCRecord.objects.filter(user=self.request.user)
     
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        # Identical documents are stored once; the record points at the shared file
+        stored = {
+            field: uploads.store(upload).file.name
+            for field, upload in serializer.validated_data.items()
+            if field in IMAGE_FIELDS and upload
+        }
+        record = serializer.save(user=self.request.user, **stored)
+        events.kyc_submitted(record)
+        
+        # Decoding, EXIF stripping and derivatives happen off the request
+        process_kyc_documents.delay(record.id)
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def send_otp(request):
     """
-    Simple OTP simulation - in production, integrate with SMS provider
+    Issue a one-time code for a phone number, rate limited per phone and
+    per client IP, and text it through SMS_BACKEND. Nothing is read from or
+    written to the database.
     """
     phone = request.data.get('phone')
     
     if not phone:
         return Response({'error': 'Phone number is required'}, status=status.HTTP_400_BAD_REQUEST)
     
-    # For demo purposes, we'll just return a static OTP
-    # In production, generate random OTP and store with expiration
-    demo_otp = "123456"
+    # Limits and codes are keyed by the E.164 form so formats can't dodge them
+    try:
+        phone = normalize_phone(phone)
+    except ValueError:
+        return Response({'error': 'Invalid phone number'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    code, retry_after = otp.issue(phone, request.META.get('REMOTE_ADDR'))
+    if code is None:
+        return Response(
+            {'error': 'Too many OTP requests', 'retry_after': retry_after},
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={'Retry-After': str(retry_after)}
+        )
     
-    return Response({
-        "message": "OTP sent successfully", 
-        "demo_otp": demo_otp  # Remove this in production
-    })
+    sms.send(phone, f"Your Flow verification code is {code}")
+    response = {"message": "OTP sent successfully"}
+    if getattr(settings, 'OTP_EXPOSE_CODE', False):
+        response['demo_otp'] = code
+    return Response(response)
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def verify_otp(request):
     """
-    Verify OTP - in production, validate against stored OTP
+    Verify a one-time code. The user is only looked up once the code
+    has been accepted.
     """
     phone = request.data.get('phone')
-    otp = request.data.get('otp')
+    code = request.data.get('otp')
     
-    if not phone or not otp:
+    if not phone or not code:
         return Response(
             {'error': 'Phone and OTP are required'}, 
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # For demo, accept any OTP. In production, validate against stored OTP
     try:
-        user = User.objects.get(phone=phone)
+        phone = normalize_phone(phone)
+    except ValueError:
+        return Response({'error': 'Invalid phone number'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    result = otp.verify(phone, code)
+    if result == otp.LOCKED:
+        return Response(
+            {'error': 'Too many attempts, request a new OTP'},
+            status=status.HTTP_429_TOO_MANY_REQUESTS
+        )
+    if result != otp.VERIFIED:
+        return Response({'error': 'Invalid or expired OTP'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        user = User.objects.get(phone_e164=phone)
         refresh = RefreshToken.for_user(user)
         
         return Response({
@@ -147,21 +236,103 @@ def verify_otp(request):
             status=status.HTTP_404_NOT_FOUND
         )
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def logout_view(request):
+    """
+    Revoke the given refresh token and the access token of this request
+    until they expire
+    """
+    raw_token = request.data.get('refresh')
+    if not raw_token:
+        return Response({'error': 'Refresh token is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        refresh = RefreshToken(raw_token)
+    except TokenError:
+        return Response({'error': 'Invalid refresh token'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if str(refresh.get(api_settings.USER_ID_CLAIM)) != str(request.user.pk):
+        return Response({'error': 'Refresh token belongs to another user'}, status=status.HTTP_403_FORBIDDEN)
+    
+    revocation.revoke(refresh)
+    if request.auth is not None:
+        revocation.revoke(request.auth)
+    return Response({'message': 'Logged out successfully'})
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def user_stats(request):
     """
     Get user statistics for dashboard
     """
-    user = request.user
+    # One row: the full user joined to its task counters
+    user = User.objects.select_related('task_stats').get(pk=request.user.pk)
+    try:
+        task_stats = user.task_stats
+    except UserTaskStats.DoesNotExist:
+        task_stats = task_stats_for_user(user.pk)
     
     stats = {
-        'wallet_balance': user.wallet_balance,
+        'wallet_balance': user.wallet_balance.amount,
+        'currency': user.wallet_balance.currency.code,
         'reputation_score': user.reputation_score,
         'tier': user.tier,
         'kyc_completed': user.kyc_completed,
-        'tasks_completed': user.assigned_tasks.filter(status='completed').count(),
-        'tasks_pending': user.assigned_tasks.filter(status__in=['assigned', 'submitted']).count(),
+        'tasks_completed': task_stats.tasks_completed,
+        'tasks_pending': task_stats.tasks_pending,
+        'tasks_submitted': task_stats.tasks_submitted,
+        'validations_done': task_stats.validations_done,
     }
     
-    return Response(stats)
\ No newline at end of file
+    return Response(stats)
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_import_users(request):
+    """
+    Onboard many users from an uploaded CSV or NDJSON file. Enterprises
+    may import students; admins may also import enterprises. The file is
+    imported by a Celery worker: this returns 202 with the job, whose
+    status URL reports per-row errors once it has finished.
+    """
+    allowed_roles = {'admin': ('student', 'enterprise'), 'enterprise': ('student',)}.get(request.user.role)
+    if allowed_roles is None:
+        return Response({'error': 'Only enterprises and admins can import users'}, status=status.HTTP_403_FORBIDDEN)
+    
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'A file is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    fmt = request.data.get('format') or os.path.splitext(upload.name)[1].lstrip('.').lower()
+    if fmt not in ('csv', 'ndjson'):
+        return Response({'error': 'Format must be csv or ndjson'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    job = UserImportJob.objects.create(
+        requested_by=request.user, file=upload, format=fmt, allowed_roles=list(allowed_roles)
+    )
+    transaction.on_commit(lambda: run_user_import.delay(str(job.id)))
+    return Response(_import_job_data(request, job), status=status.HTTP_202_ACCEPTED)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_import_status(request, job_id):
+    """Status of a bulk import; the report is filled in once it completes"""
+    jobs = UserImportJob.objects.all()
+    if request.user.role != 'admin':
+        jobs = jobs.filter(requested_by=request.user)
+    job = jobs.filter(id=job_id).first()
+    if job is None:
+        return Response({'error': 'Import not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(_import_job_data(request, job))
+
+def _import_job_data(request, job):
+    return {
+        'id': str(job.id),
+        'status': job.status,
+        'status_url': request.build_absolute_uri(reverse('user-bulk-import-status', args=[job.id])),
+        'report': job.report or None,
+        'error': job.error or None,
+        'created_at': job.created_at,
+        'finished_at': job.finished_at,
+    }
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import WalletTransaction, BankAccount, EscrowLedger, PaymentProviderLog
+from .models import WalletTransaction, BankAccount, EscrowLedger, PaymentProviderLog, ExchangeRate
 
 @admin.register(WalletTransaction)
 class WalletTransactionAdmin(admin.ModelAdmin):
@@ -33,4 +33,10 @@ class PaymentProviderLogAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at',)
     
     def has_add_permission(self, request):
-        return False
\ No newline at end of file
+        return False
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = ('source_currency', 'target_currency', 'rate', 'updated_at')
+    list_filter = ('source_currency', 'target_currency')
+    readonly_fields = ('updated_at',)
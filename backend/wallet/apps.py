@@ -5,3 +5,6 @@ class WalletConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'wallet'
     verbose_name = 'Wallets'
+
+    def ready(self):
+        from . import checks  # noqa: F401 (registers the shared cache check)
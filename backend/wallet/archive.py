@@ -0,0 +1,268 @@
+import gzip
+import io
+import json
+import os
+import zlib
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from admin_dashboard import counters
+from .models import WalletTransaction, TransactionArchive, ArchivedTransactionCount
+from .serializers import WalletTransactionSerializer
+
+ARCHIVABLE_STATUSES = ('completed', 'failed', 'cancelled')
+GZIP_WBITS = 16 + zlib.MAX_WBITS  # zlib output with a gzip header and trailer
+# (type, status) -> ArchivedTransactionCount field summing those rows for wallet_summary
+SUMMARY_TOTALS = {
+    ('task_payment', 'completed'): 'earned_minor',
+    ('withdrawal', 'completed'): 'withdrawn_minor',
+}
+
+
+def archive_root():
+    return str(getattr(settings, 'WALLET_ARCHIVE_ROOT', os.path.join(settings.BASE_DIR, 'archive')))
+
+
+def month_bounds(month):
+    start = timezone.make_aware(datetime(month.year, month.month, 1))
+    return start, start + relativedelta(months=1)
+
+
+def archivable_months(older_than_months=None):
+    """Whole months, before the cutoff, that still have settled rows in the hot table"""
+    if older_than_months is None:
+        older_than_months = getattr(settings, 'WALLET_ARCHIVE_AFTER_MONTHS', 12)
+    today = timezone.now().date()
+    cutoff = date(today.year, today.month, 1) - relativedelta(months=older_than_months)
+
+    return list(WalletTransaction.objects.filter(
+        status__in=ARCHIVABLE_STATUSES,
+        created_at__lt=month_bounds(cutoff)[0]
+    ).dates('created_at', 'month'))
+
+
+def archive_month(month, chunk_size=2000):
+    """
+    Move one month of settled transactions into a gzip'd NDJSON file.
+
+    Rows are written sorted by user and newest first, each user's rows as a
+    separate gzip member whose byte range is recorded, so one user's history
+    is read without decompressing anyone else's (the file as a whole is
+    still ordinary gzip). The file is renamed into place, and only then are
+    the rows deleted and the archive recorded in a single transaction. Rows
+    still pending stay in the hot table.
+    """
+    start, end = month_bounds(month)
+    queryset = WalletTransaction.objects.filter(
+        status__in=ARCHIVABLE_STATUSES,
+        created_at__gte=start,
+        created_at__lt=end
+    ).order_by('user_id', '-created_at', '-id')
+
+    relative_path = os.path.join(
+        'wallet_transactions',
+        f"{month:%Y-%m}.{timezone.now():%Y%m%d%H%M%S%f}.ndjson.gz"
+    )
+    full_path = os.path.join(archive_root(), relative_path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+    ids = []
+    user_counts = Counter()
+    blocks = {}
+    contributions = Counter()
+    totals = defaultdict(lambda: {'earned_minor': Counter(), 'withdrawn_minor': Counter()})
+    tmp_path = f"{full_path}.tmp"
+    with open(tmp_path, 'wb') as fh:
+        user_id = compressor = None
+        for tx in queryset.iterator(chunk_size=chunk_size):
+            if tx.user_id != user_id:
+                if compressor is not None:
+                    fh.write(compressor.flush())
+                    blocks[user_id] = (blocks[user_id], fh.tell() - blocks[user_id])
+                user_id = tx.user_id
+                blocks[user_id] = fh.tell()
+                compressor = zlib.compressobj(wbits=GZIP_WBITS)
+            line = json.dumps(WalletTransactionSerializer(tx).data, default=str) + '\n'
+            fh.write(compressor.compress(line.encode('utf-8')))
+            ids.append(tx.id)
+            user_counts[tx.user_id] += 1
+            contributions.update(counters.transaction_contributions(tx))
+            total = SUMMARY_TOTALS.get((tx.transaction_type, tx.status))
+            if total:
+                totals[tx.user_id][total][tx.amount_currency] += tx.amount_minor
+        if compressor is not None:
+            fh.write(compressor.flush())
+            blocks[user_id] = (blocks[user_id], fh.tell() - blocks[user_id])
+
+    if not ids:
+        os.remove(tmp_path)
+        return None
+
+    os.replace(tmp_path, full_path)
+
+    with transaction.atomic():
+        archive = TransactionArchive.objects.create(
+            month=date(month.year, month.month, 1),
+            path=relative_path,
+            row_count=len(ids)
+        )
+        ArchivedTransactionCount.objects.bulk_create([
+            ArchivedTransactionCount(
+                archive=archive, user_id=user_id, row_count=count,
+                byte_offset=blocks[user_id][0], byte_length=blocks[user_id][1],
+                **{name: dict(sums) for name, sums in totals[user_id].items()}
+            )
+            for user_id, count in user_counts.items()
+        ], batch_size=chunk_size)
+        # A raw delete skips the per-row post_delete signals; the dashboard
+        # counters the rows contributed to are taken off in one step instead
+        for i in range(0, len(ids), chunk_size):
+            batch = WalletTransaction.objects.filter(id__in=ids[i:i + chunk_size])
+            batch._raw_delete(batch.db)
+        counters.apply_delta(counters.diff(contributions, {}))
+
+    return archive
+
+
+def archived_totals(user):
+    """{field: {currency: minor}} summed over a user's archives, per SUMMARY_TOTALS field"""
+    totals = {name: Counter() for name in SUMMARY_TOTALS.values()}
+    for row in ArchivedTransactionCount.objects.filter(user=user).values(*totals):
+        for name, sums in totals.items():
+            sums.update(row[name])
+    return totals
+
+
+def _lines(fh):
+    for line in fh:
+        yield json.loads(line)
+
+
+def iter_archive(archive):
+    """Stream every row of an archive file, in file order"""
+    with gzip.open(os.path.join(archive_root(), archive.path), 'rt', encoding='utf-8') as fh:
+        yield from _lines(fh)
+
+
+def iter_archived_rows(user_count):
+    """
+    Stream one user's rows out of an archive file: only their gzip member
+    is read and decompressed.
+    """
+    full_path = os.path.join(archive_root(), user_count.archive.path)
+    with open(full_path, 'rb') as raw:
+        raw.seek(user_count.byte_offset)
+        block = io.BytesIO(raw.read(user_count.byte_length))
+    with gzip.open(block, 'rt', encoding='utf-8') as fh:
+        yield from _lines(fh)
+
+
+def iter_archived_transactions(since=None, until=None, types=None, statuses=None):
+    """
+    Archived rows matching an export's filters, oldest month first. Only
+    archives whose month overlaps [since, until) are opened.
+    """
+    archives = TransactionArchive.objects.order_by('month', 'id')
+    if since:
+        archives = archives.filter(month__gte=date(since.year, since.month, 1))
+    if until:
+        archives = archives.filter(month__lt=until.date() if isinstance(until, datetime) else until)
+    for archive in archives.iterator():
+        for row in iter_archive(archive):
+            created_at = parse_datetime(row['created_at'])
+            if since and created_at < since or until and created_at >= until:
+                continue
+            if types and row['transaction_type'] not in types:
+                continue
+            if statuses and row['status'] not in statuses:
+                continue
+            yield row
+
+
+class ArchivedTransactionList:
+    """
+    Sequence over a user's archived transactions, newest month first.
+    Length comes from the per-user counts; slicing only opens the files
+    the requested window falls into.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._segments = None
+
+    @property
+    def segments(self):
+        if self._segments is None:
+            counts = ArchivedTransactionCount.objects.filter(
+                user=self.user
+            ).select_related('archive').order_by('-archive__month', '-archive__id')
+            self._segments = list(counts)
+        return self._segments
+
+    def __len__(self):
+        return sum(segment.row_count for segment in self.segments)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+
+        start, stop, _ = index.indices(len(self))
+        rows = []
+        offset = 0
+        for segment in self.segments:
+            count = segment.row_count
+            if offset + count <= start:
+                offset += count
+                continue
+            if offset >= stop:
+                break
+            for position, row in enumerate(iter_archived_rows(segment), start=offset):
+                if position >= stop:
+                    break
+                if position >= start:
+                    rows.append(row)
+            offset += count
+        return rows
+
+
+class TransactionHistory:
+    """
+    Hot rows from the database followed by archived rows, exposed as one
+    sequence so the existing page-number pagination works unchanged.
+    Items are already serialized.
+    """
+
+    def __init__(self, queryset, archived):
+        self.queryset = queryset
+        self.archived = archived
+        self._hot_count = None
+
+    @property
+    def hot_count(self):
+        if self._hot_count is None:
+            self._hot_count = self.queryset.count()
+        return self._hot_count
+
+    def count(self):
+        return self.hot_count + len(self.archived)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+
+        start, stop, _ = index.indices(self.count())
+        rows = []
+        if start < self.hot_count:
+            rows.extend(WalletTransactionSerializer(
+                self.queryset[start:min(stop, self.hot_count)], many=True
+            ).data)
+        if stop > self.hot_count:
+            rows.extend(self.archived[max(start - self.hot_count, 0):stop - self.hot_count])
+        return rows
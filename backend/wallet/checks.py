@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core import checks
+
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    The Paystack rate limiter, idempotency keys and OTP limits only hold
+    across workers when the default cache is shared. Outside DEBUG, a
+    per-process cache (REDIS_URL unset) is reported rather than silently
+    letting every worker keep its own bucket.
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if settings.DEBUG or backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [checks.Warning(
+        f"The default cache ({backend}) is local to each process, so rate limits "
+        "and idempotency keys are not shared between workers.",
+        hint="Set REDIS_URL to a Redis instance shared by the web and Celery workers.",
+        id='wallet.W001',
+    )]
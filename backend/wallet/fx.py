@@ -0,0 +1,87 @@
+import threading
+import time
+from decimal import Decimal
+from django.conf import settings
+from .money import from_minor, to_minor
+
+_rates = {}
+_loaded_at = None
+_lock = threading.Lock()
+
+
+class ExchangeRateUnavailable(Exception):
+    pass
+
+
+def reporting_currency():
+    return getattr(settings, 'REPORTING_CURRENCY', getattr(settings, 'DEFAULT_CURRENCY', 'NGN'))
+
+
+def invalidate_rates():
+    """Drop this process's copy of the rate table"""
+    global _loaded_at
+    with _lock:
+        _loaded_at = None
+
+
+def get_rates():
+    """
+    Exchange rates keyed by (source, target), cached in-process and
+    reloaded from the ExchangeRate table every FX_RATE_CACHE_TTL seconds.
+    """
+    global _rates, _loaded_at
+    ttl = getattr(settings, 'FX_RATE_CACHE_TTL', 300)
+    now = time.monotonic()
+
+    with _lock:
+        if _loaded_at is None or now - _loaded_at >= ttl:
+            from .models import ExchangeRate
+            _rates = {
+                (source, target): rate
+                for source, target, rate in ExchangeRate.objects.values_list(
+                    'source_currency', 'target_currency', 'rate'
+                )
+            }
+            _loaded_at = now
+        return _rates
+
+
+def get_rate(source, target):
+    if source == target:
+        return Decimal('1')
+
+    rates = get_rates()
+    if (source, target) in rates:
+        return rates[(source, target)]
+    if (target, source) in rates and rates[(target, source)]:
+        return Decimal('1') / rates[(target, source)]
+    raise ExchangeRateUnavailable(f"No exchange rate from {source} to {target}")
+
+
+def convert_totals(totals, target=None):
+    """
+    Convert per-currency minor-unit totals into a single minor-unit total in
+    the target currency. Returns (total_minor, unconverted_currencies).
+    """
+    target = target or reporting_currency()
+    total = 0
+    unconverted = []
+
+    for currency, minor in totals.items():
+        if not minor:
+            continue
+        try:
+            rate = get_rate(currency, target)
+        except ExchangeRateUnavailable:
+            unconverted.append(currency)
+            continue
+        total += to_minor(from_minor(minor, currency).amount * rate, target)
+
+    return total, sorted(unconverted)
+
+
+def reporting_total(totals, target=None):
+    """API edge: per-currency minor totals -> Decimal amount in the reporting currency"""
+    target = target or reporting_currency()
+    total, unconverted = convert_totals(totals, target)
+    return from_minor(total, target).amount, unconverted
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+
+
+def _fingerprint(data):
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _wait_for_result(result_key, lock_key, deadline):
+    """
+    Poll for the result of the request holding the lock. Returns None as
+    soon as the lock is released without one (that request raised or failed
+    with a 5xx), or once the deadline passes.
+    """
+    while time.monotonic() < deadline:
+        stored = cache.get(result_key)
+        if stored is not None:
+            return stored
+        if cache.get(lock_key) is None:
+            return cache.get(result_key)
+        time.sleep(0.1)
+    return None
+
+
+def _replay(stored):
+    response = Response(stored['data'], status=stored['status'])
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view_func):
+    """
+    Honour an Idempotency-Key header on a money-moving endpoint.
+
+    The first response for a (user, key) pair is stored in the cache and
+    replayed for any retry. A duplicate that arrives while the first request
+    is still running waits for its result instead of executing again; if
+    the first request ends without a result, the duplicate runs in its place.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        key = request.META.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_func(request, *args, **kwargs)
+
+        if len(key) > 255:
+            return Response(
+                {"error": "Idempotency-Key must be at most 255 characters"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        key_hash = hashlib.sha256(key.encode()).hexdigest()
+        scope = f"idempotency:{view_func.__name__}:{request.user.pk}:{key_hash}"
+        result_key = f"{scope}:result"
+        lock_key = f"{scope}:lock"
+        fingerprint = _fingerprint(request.data)
+        lock_timeout = getattr(settings, 'IDEMPOTENCY_LOCK_TIMEOUT', 30)
+
+        stored = cache.get(result_key)
+        deadline = time.monotonic() + lock_timeout
+        while stored is None:
+            if cache.add(lock_key, fingerprint, timeout=lock_timeout):
+                try:
+                    response = view_func(request, *args, **kwargs)
+                    # Server errors are not stored so the client can retry them
+                    if response.status_code < 500:
+                        cache.set(result_key, {
+                            'fingerprint': fingerprint,
+                            'status': response.status_code,
+                            'data': response.data,
+                        }, timeout=getattr(settings, 'IDEMPOTENCY_KEY_TTL', 86400))
+                finally:
+                    cache.delete(lock_key)
+                return response
+
+            # Another request holds the key: take its result, or take over
+            # the key if it finished without storing one
+            stored = _wait_for_result(result_key, lock_key, deadline)
+            if stored is None and time.monotonic() >= deadline:
+                return Response(
+                    {"error": "A request with this Idempotency-Key is still being processed"},
+                    status=status.HTTP_409_CONFLICT
+                )
+
+        if stored['fingerprint'] != fingerprint:
+            return Response(
+                {"error": "Idempotency-Key was already used with a different request body"},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+        return _replay(stored)
+
+    return wrapper
@@ -0,0 +1,24 @@
+import time
+from django.core.management.base import BaseCommand
+
+from wallet.rollups import build_rollups, history_hours
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild transaction rollups over all of the hot table's history. Run once after "
+        "deploying rollups so the financial overview's older windows are served from them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=None,
+                            help='Only rebuild this many recent hours (default: back to the oldest transaction)')
+        parser.add_argument('--window-hours', type=int, default=24, help='Hours aggregated per query')
+
+    def handle(self, *args, **options):
+        hours = options['hours'] if options['hours'] is not None else history_hours()
+        started = time.perf_counter()
+        built = build_rollups(hours=hours, window_hours=options['window_hours'])
+        self.stdout.write(
+            f"Built {built} hour rollups over {hours} hours in {time.perf_counter() - started:.1f}s"
+        )
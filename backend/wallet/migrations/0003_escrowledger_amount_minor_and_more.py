@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-19 08:57
+
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import migrations, models
+from moneyed import get_currency
+
+
+def backfill_minor_units(model, field, batch_size=2000):
+    """Populate `<field>_minor` for existing rows (frozen copy, don't import app code)"""
+    minor_field = f'{field}_minor'
+    batch = []
+    queryset = model.objects.only('pk', field, f'{field}_currency').order_by('pk')
+    for obj in queryset.iterator(chunk_size=batch_size):
+        amount = getattr(obj, field)
+        sub_unit = get_currency(str(getattr(obj, f'{field}_currency'))).sub_unit or 1
+        scaled = Decimal(str(getattr(amount, 'amount', amount))).scaleb(len(str(sub_unit)) - 1)
+        setattr(obj, minor_field, int(scaled.quantize(Decimal('1'), rounding=ROUND_HALF_UP)))
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            model.objects.bulk_update(batch, [minor_field])
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, [minor_field])
+
+
+def populate_minor_units(apps, schema_editor):
+    backfill_minor_units(apps.get_model('wallet', 'WalletTransaction'), 'amount')
+    backfill_minor_units(apps.get_model('wallet', 'EscrowLedger'), 'amount')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0002_add_bankaccount_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='escrowledger',
+            name='amount_minor',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='wallettransaction',
+            name='amount_minor',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_minor_units, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-19 08:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0003_escrowledger_amount_minor_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_currency', models.CharField(max_length=3)),
+                ('target_currency', models.CharField(max_length=3)),
+                ('rate', models.DecimalField(decimal_places=8, max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('source_currency', 'target_currency')},
+            },
+        ),
+    ]
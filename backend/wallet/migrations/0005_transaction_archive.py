@@ -0,0 +1,62 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0004_exchangerate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTransactionCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TransactionArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('path', models.CharField(max_length=255, unique=True)),
+                ('row_count', models.IntegerField(default=0)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-month', '-id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['user', '-created_at'], name='wallet_wall_user_id_801842_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['transaction_type', 'status', 'created_at'], name='wallet_wall_transac_1cc294_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['created_at'], name='wallet_wall_created_929d33_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedtransactioncount',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_transaction_counts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedtransactioncount',
+            name='archive',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_counts', to='wallet.transactionarchive'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='archivedtransactioncount',
+            unique_together={('archive', 'user')},
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 09:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0005_transaction_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=10)),
+                ('bucket_start', models.DateTimeField()),
+                ('transaction_type', models.CharField(max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('currency', models.CharField(max_length=3)),
+                ('count', models.IntegerField(default=0)),
+                ('amount_minor', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('granularity', 'bucket_start', 'transaction_type', 'status', 'currency')},
+            },
+        ),
+    ]
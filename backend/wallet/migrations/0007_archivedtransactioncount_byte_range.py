@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0006_transactionrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedtransactioncount',
+            name='byte_length',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedtransactioncount',
+            name='byte_offset',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0007_archivedtransactioncount_byte_range'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedtransactioncount',
+            name='earned_minor',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name='archivedtransactioncount',
+            name='withdrawn_minor',
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0008_archivedtransactioncount_totals'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedtransactioncount',
+            name='byte_offset',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='archivedtransactioncount',
+            name='byte_length',
+            field=models.BigIntegerField(),
+        ),
+    ]
@@ -1,10 +1,12 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from djmoney.models.fields import MoneyField
+from .money import MinorUnitsMixin
+from .fx import invalidate_rates
 
 User = get_user_model()
 
-class WalletTransaction(models.Model):
+class WalletTransaction(MinorUnitsMixin, models.Model):
     TRANSACTION_TYPES = (
         ('deposit', 'Deposit'),
         ('withdrawal', 'Withdrawal'),
@@ -25,6 +27,7 @@ class WalletTransaction(models.Model):
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='transactions')
     amount = MoneyField(max_digits=14, decimal_places=2, default_currency='NGN')
+    amount_minor = models.BigIntegerField(default=0, editable=False)  # amount in kobo/cents
     transaction_type = models.CharField(max_length=20, choices=TRANSACTION_TYPES)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     metadata = models.JSONField(default=dict, blank=True)
@@ -34,20 +37,30 @@ class WalletTransaction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
+    minor_unit_fields = ('amount',)
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['transaction_type', 'status', 'created_at']),
+            models.Index(fields=['created_at']),
+        ]
     
     def __str__(self):
         return f"{self.transaction_type} - {self.amount} - {self.user.username}"
 
-class EscrowLedger(models.Model):
+class EscrowLedger(MinorUnitsMixin, models.Model):
     project = models.ForeignKey('projects.EnterpriseProject', on_delete=models.CASCADE, related_name='escrow_entries')
     amount = MoneyField(max_digits=14, decimal_places=2, default_currency='NGN')
+    amount_minor = models.BigIntegerField(default=0, editable=False)
     transaction_type = models.CharField(max_length=50)  # 'funding', 'payout', 'refund'
     reference = models.CharField(max_length=100)
     metadata = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    minor_unit_fields = ('amount',)
+    
     def __str__(self):
         return f"Escrow {self.transaction_type} - {self.amount} - {self.project.title}"
 
@@ -80,4 +93,77 @@ class PaymentProviderLog(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"{self.provider} - {self.action} - {self.reference}"
\ No newline at end of file
+        return f"{self.provider} - {self.action} - {self.reference}"
+
+class ExchangeRate(models.Model):
+    """Rate for converting one unit of source_currency into target_currency"""
+    source_currency = models.CharField(max_length=3)
+    target_currency = models.CharField(max_length=3)
+    rate = models.DecimalField(max_digits=18, decimal_places=8)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['source_currency', 'target_currency']
+    
+    def __str__(self):
+        return f"1 {self.source_currency} = {self.rate} {self.target_currency}"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_rates()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_rates()
+        return result
+
+class TransactionArchive(models.Model):
+    """A compressed NDJSON file holding one month of archived WalletTransactions"""
+    month = models.DateField()  # First day of the archived month
+    path = models.CharField(max_length=255, unique=True)  # Relative to WALLET_ARCHIVE_ROOT
+    row_count = models.IntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-month', '-id']
+    
+    def __str__(self):
+        return f"Archive {self.month:%Y-%m} ({self.row_count} rows)"
+
+class ArchivedTransactionCount(models.Model):
+    """
+    Per-user row counts inside an archive, so history can be paged without
+    reading files, and the totals the wallet summary still has to include.
+    """
+    archive = models.ForeignKey(TransactionArchive, on_delete=models.CASCADE, related_name='user_counts')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_transaction_counts')
+    row_count = models.IntegerField(default=0)
+    byte_offset = models.BigIntegerField()  # Start of the user's gzip member in the file
+    byte_length = models.BigIntegerField()
+    earned_minor = models.JSONField(default=dict)  # {currency: minor} of completed task payments
+    withdrawn_minor = models.JSONField(default=dict)  # {currency: minor} of completed withdrawals
+    
+    class Meta:
+        unique_together = ['archive', 'user']
+
+class TransactionRollup(models.Model):
+    """Pre-aggregated transaction counts and amounts per time bucket"""
+    GRANULARITY_CHOICES = (
+        ('hour', 'Hour'),
+        ('day', 'Day'),
+    )
+    
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+    transaction_type = models.CharField(max_length=20)
+    status = models.CharField(max_length=20)
+    currency = models.CharField(max_length=3)
+    count = models.IntegerField(default=0)
+    amount_minor = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['granularity', 'bucket_start', 'transaction_type', 'status', 'currency']
+    
+    def __str__(self):
+        return f"{self.granularity} {self.bucket_start} {self.transaction_type}/{self.status}: {self.count}"
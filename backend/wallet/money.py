@@ -0,0 +1,81 @@
+from decimal import Decimal, ROUND_HALF_UP
+from django.conf import settings
+from django.db.models import Sum
+from moneyed import Money, get_currency
+
+
+def default_currency():
+    return getattr(settings, 'DEFAULT_CURRENCY', 'NGN')
+
+
+def minor_exponent(currency_code):
+    """Number of decimal places in the currency's minor unit (kobo, cents...)"""
+    sub_unit = get_currency(currency_code).sub_unit or 1
+    return len(str(sub_unit)) - 1
+
+
+def to_minor(amount, currency_code=None):
+    """Convert a Money or Decimal amount into integer minor units"""
+    if isinstance(amount, Money):
+        currency_code = amount.currency.code
+        amount = amount.amount
+    currency_code = currency_code or default_currency()
+    exponent = minor_exponent(currency_code)
+    scaled = Decimal(str(amount)).scaleb(exponent)
+    return int(scaled.quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def from_minor(value, currency_code=None):
+    """Convert integer minor units back into Money"""
+    currency_code = currency_code or default_currency()
+    exponent = minor_exponent(currency_code)
+    return Money(Decimal(int(value or 0)).scaleb(-exponent), currency_code)
+
+
+def sum_minor_by_currency(queryset, field='amount'):
+    """
+    Sum a money field's minor-unit column in the database, grouped by
+    currency. Returns {currency_code: total_minor}.
+    """
+    rows = queryset.order_by().values(f'{field}_currency').annotate(
+        total=Sum(f'{field}_minor')
+    )
+    return {row[f'{field}_currency']: row['total'] or 0 for row in rows}
+
+
+def totals_as_decimals(totals):
+    """API edge: {currency: minor} -> {currency: Decimal amount}"""
+    return {
+        currency: from_minor(total, currency).amount
+        for currency, total in totals.items()
+    }
+
+
+def total_in(totals, currency_code=None):
+    """API edge: the amount for one currency out of a per-currency total"""
+    currency_code = currency_code or default_currency()
+    return from_minor(totals.get(currency_code, 0), currency_code).amount
+
+
+class MinorUnitsMixin:
+    """
+    Keeps a BigInteger `<field>_minor` column in step with each MoneyField
+    named in `minor_unit_fields`, so aggregates can sum plain integers.
+    """
+    minor_unit_fields = ()
+
+    def sync_minor_units(self):
+        for field in self.minor_unit_fields:
+            value = getattr(self, field)
+            setattr(self, f'{field}_minor', to_minor(value) if value is not None else 0)
+
+    def save(self, *args, **kwargs):
+        self.sync_minor_units()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            for field in self.minor_unit_fields:
+                if field in update_fields:
+                    update_fields.add(f'{field}_minor')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
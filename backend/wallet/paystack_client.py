@@ -1,6 +1,90 @@
 import requests
 import json
+import time
 from django.conf import settings
+from django.core.cache import cache
+from .money import to_minor
+
+PRIORITY_HIGH = 'high'
+PRIORITY_NORMAL = 'normal'
+PRIORITY_LOW = 'low'
+
+
+class RateLimitExceeded(Exception):
+    """
+    No token came free within max_wait. Nothing was sent to the provider;
+    Celery tasks retry after `retry_after` seconds instead of going ahead.
+    """
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"Rate limit for {name} still saturated; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class ProviderRateLimiter:
+    """
+    Token bucket shared by every worker through the default cache (Redis in
+    production). The bucket refills `rate` tokens each second; lower priority
+    classes may only draw down to their share of it, so transfers keep
+    headroom when verifications and bank lists are busy.
+    """
+    poll_interval = 0.05
+
+    def __init__(self, name, rate, priority_shares, max_wait):
+        self.name = name
+        self.rate = rate
+        self.priority_shares = priority_shares
+        self.max_wait = max_wait
+
+    def _bucket_key(self, window):
+        return f"ratelimit:{self.name}:{window}"
+
+    def _pause_key(self):
+        return f"ratelimit:{self.name}:paused_until"
+
+    def limit_for(self, priority):
+        share = self.priority_shares.get(priority, self.priority_shares[PRIORITY_NORMAL])
+        return max(1, int(self.rate * share))
+
+    def try_acquire(self, priority=PRIORITY_NORMAL):
+        """Take a token for the current second if the priority class allows it"""
+        now = time.time()
+        paused_until = cache.get(self._pause_key())
+        if paused_until and paused_until > now:
+            return False
+
+        key = self._bucket_key(int(now))
+        cache.add(key, 0, timeout=2)
+        try:
+            used = cache.incr(key)
+        except ValueError:
+            # The window expired between add() and incr()
+            cache.set(key, 1, timeout=2)
+            used = 1
+
+        if used <= self.limit_for(priority):
+            return True
+
+        cache.decr(key)
+        return False
+
+    def acquire(self, priority=PRIORITY_NORMAL, max_wait=None):
+        """
+        Queue until a token is available. Raises RateLimitExceeded if none
+        came free within max_wait (the limiter's default unless given), so a
+        saturated limiter is never bypassed.
+        """
+        deadline = time.monotonic() + (self.max_wait if max_wait is None else max_wait)
+        while not self.try_acquire(priority):
+            if time.monotonic() >= deadline:
+                paused_until = cache.get(self._pause_key()) or 0
+                raise RateLimitExceeded(self.name, max(1.0, paused_until - time.time()))
+            time.sleep(self.poll_interval)
+
+    def pause(self, seconds):
+        """Stop every worker from drawing tokens, e.g. after a 429"""
+        cache.set(self._pause_key(), time.time() + seconds, timeout=int(seconds) + 1)
+
 
 class PaystackClient:
     def __init__(self):
@@ -10,20 +94,62 @@ class PaystackClient:
             'Authorization': f'Bearer {self.secret_key}',
             'Content-Type': 'application/json',
         }
-    
-    def _make_request(self, method, endpoint, data=None):
+        self.rate_limiter = ProviderRateLimiter(
+            name='paystack',
+            rate=getattr(settings, 'PAYSTACK_RATE_LIMIT', 10),
+            priority_shares=getattr(settings, 'PAYSTACK_PRIORITY_SHARES', {
+                PRIORITY_HIGH: 1.0,
+                PRIORITY_NORMAL: 0.7,
+                PRIORITY_LOW: 0.4,
+            }),
+            max_wait=getattr(settings, 'PAYSTACK_RATE_LIMIT_MAX_WAIT', 30),
+        )
+        self.max_retries = getattr(settings, 'PAYSTACK_MAX_RETRIES', 3)
+
+    def _send(self, method, url, data):
+        if method == 'GET':
+            return requests.get(url, headers=self.headers, params=data)
+        return requests.post(url, headers=self.headers, json=data)
+
+    def _retry_after(self, response, attempt):
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return float(2 ** attempt)
+
+    def _make_request(self, method, endpoint, data=None, priority=PRIORITY_NORMAL, max_wait=None):
+        """
+        `max_wait` bounds the total time spent queueing for tokens and
+        backing off after 429s; callers holding row locks or serving a web
+        request pass a short one and get RateLimitExceeded instead of
+        blocking.
+        """
         url = f"{self.base_url}{endpoint}"
-        
+
+        if method not in ('GET', 'POST'):
+            return {'status': False, 'message': 'Invalid HTTP method'}
+
+        deadline = time.monotonic() + (self.rate_limiter.max_wait if max_wait is None else max_wait)
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=self.headers, params=data)
-            elif method == 'POST':
-                response = requests.post(url, headers=self.headers, json=data)
-            else:
-                return {'status': False, 'message': 'Invalid HTTP method'}
-            
+            attempt = 0
+            while True:
+                self.rate_limiter.acquire(priority, max_wait=max(0.0, deadline - time.monotonic()))
+                response = self._send(method, url, data)
+
+                if response.status_code != 429 or attempt >= self.max_retries:
+                    break
+
+                # Provider is throttling us: back off every worker, then retry
+                delay = self._retry_after(response, attempt)
+                self.rate_limiter.pause(delay)
+                if time.monotonic() + delay > deadline:
+                    # The provider refused the call, so retrying later is safe
+                    raise RateLimitExceeded(self.rate_limiter.name, delay)
+                time.sleep(delay)
+                attempt += 1
+
             response_data = response.json()
-            
+
             # Log the request and response
             from .models import PaymentProviderLog
             PaymentProviderLog.objects.create(
@@ -34,9 +160,9 @@ class PaystackClient:
                 response_data=response_data,
                 status='success' if response_data.get('status') else 'failed'
             )
-            
+
             return response_data
-            
+
         except requests.exceptions.RequestException as e:
             # Log error
             from .models import PaymentProviderLog
@@ -49,24 +175,24 @@ class PaystackClient:
                 status='failed'
             )
             return {'status': False, 'message': str(e)}
-    
-    def initialize_transaction(self, email, amount, reference, metadata=None):
+
+    def initialize_transaction(self, email, amount, reference, metadata=None, max_wait=None):
         """Initialize a payment transaction"""
         endpoint = "/transaction/initialize"
         data = {
             'email': email,
-            'amount': int(amount * 100),  # Paystack expects amount in kobo
+            'amount': to_minor(amount),  # Paystack expects amount in kobo
             'reference': reference,
             'metadata': metadata or {}
         }
-        return self._make_request('POST', endpoint, data)
-    
-    def verify_transaction(self, reference):
+        return self._make_request('POST', endpoint, data, priority=PRIORITY_HIGH, max_wait=max_wait)
+
+    def verify_transaction(self, reference, max_wait=None):
         """Verify a transaction"""
         endpoint = f"/transaction/verify/{reference}"
-        return self._make_request('GET', endpoint)
-    
-    def create_transfer_recipient(self, name, account_number, bank_code, currency='NGN'):
+        return self._make_request('GET', endpoint, priority=PRIORITY_NORMAL, max_wait=max_wait)
+
+    def create_transfer_recipient(self, name, account_number, bank_code, currency='NGN', max_wait=None):
         """Create a transfer recipient"""
         endpoint = "/transferrecipient"
         data = {
@@ -76,29 +202,29 @@ class PaystackClient:
             'bank_code': bank_code,
             'currency': currency
         }
-        return self._make_request('POST', endpoint, data)
-    
-    def initiate_transfer(self, amount, recipient_code, reference, reason=None):
+        return self._make_request('POST', endpoint, data, priority=PRIORITY_HIGH, max_wait=max_wait)
+
+    def initiate_transfer(self, amount, recipient_code, reference, reason=None, max_wait=None):
         """Initiate a transfer to a recipient"""
         endpoint = "/transfer"
         data = {
             'source': 'balance',
-            'amount': int(amount * 100),  # Paystack expects amount in kobo
+            'amount': to_minor(amount),  # Paystack expects amount in kobo
             'recipient': recipient_code,
             'reference': reference,
             'reason': reason or 'Withdrawal from Flow'
         }
-        return self._make_request('POST', endpoint, data)
-    
-    def verify_account_number(self, account_number, bank_code):
+        return self._make_request('POST', endpoint, data, priority=PRIORITY_HIGH, max_wait=max_wait)
+
+    def verify_account_number(self, account_number, bank_code, max_wait=None):
         """Verify bank account number"""
         endpoint = f"/bank/resolve?account_number={account_number}&bank_code={bank_code}"
-        return self._make_request('GET', endpoint)
-    
-    def list_banks(self):
+        return self._make_request('GET', endpoint, priority=PRIORITY_NORMAL, max_wait=max_wait)
+
+    def list_banks(self, max_wait=None):
         """Get list of supported banks"""
         endpoint = "/bank"
-        return self._make_request('GET', endpoint)
+        return self._make_request('GET', endpoint, priority=PRIORITY_LOW, max_wait=max_wait)
 
 # Singleton instance
-paystack_client = PaystackClient()
\ No newline at end of file
+paystack_client = PaystackClient()
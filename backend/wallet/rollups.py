@@ -0,0 +1,211 @@
+import math
+from collections import Counter
+from datetime import datetime, time, timedelta
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+from .models import WalletTransaction, TransactionArchive, TransactionRollup
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+ROLLUP_DIMENSIONS = ('transaction_type', 'status', 'currency')
+
+
+def floor_hour(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def coverage():
+    """
+    (first, watermark) of the hours that have been rolled up: the earliest
+    hour rollup and the end of the latest one, or (None, None) if nothing has.
+    Anything before `first` (history older than the first run, until it is
+    backfilled) is not in the rollups.
+    """
+    bounds = TransactionRollup.objects.filter(granularity='hour').aggregate(
+        first=Min('bucket_start'),
+        latest=Max('bucket_start')
+    )
+    if bounds['latest'] is None:
+        return None, None
+    return bounds['first'], bounds['latest'] + HOUR
+
+
+def history_hours(now=None):
+    """
+    Complete hours from the oldest transaction's day to now, for a full backfill.
+    Archived months are left out: only the rows they left in the hot table
+    (still pending) could be re-counted, so their rollups stay as they were.
+    """
+    transactions = WalletTransaction.objects.all()
+    archived = TransactionArchive.objects.aggregate(latest=Max('month'))['latest']
+    if archived:
+        transactions = transactions.filter(created_at__gte=start_of_day(archived + relativedelta(months=1)))
+    oldest = transactions.aggregate(oldest=Min('created_at'))['oldest']
+    if oldest is None:
+        return 0
+    # From midnight, so the oldest day gets its day rollup too
+    start = start_of_day(timezone.localdate(oldest))
+    end = floor_hour(timezone.localtime(now or timezone.now()))
+    return max(0, math.ceil((end - start) / HOUR))
+
+
+def _build_hours(start, end, chunk_size):
+    """Replace the hour rollups in [start, end) with a fresh aggregate"""
+    rows = WalletTransaction.objects.filter(
+        created_at__gte=start,
+        created_at__lt=end
+    ).order_by().annotate(
+        bucket=TruncHour('created_at')
+    ).values('bucket', 'transaction_type', 'status', 'amount_currency').annotate(
+        count=Count('id'),
+        amount=Sum('amount_minor')
+    )
+
+    rollups = [
+        TransactionRollup(
+            granularity='hour',
+            bucket_start=row['bucket'],
+            transaction_type=row['transaction_type'],
+            status=row['status'],
+            currency=row['amount_currency'],
+            count=row['count'],
+            amount_minor=row['amount'] or 0
+        )
+        for row in rows.iterator(chunk_size=chunk_size)
+    ]
+
+    with transaction.atomic():
+        TransactionRollup.objects.filter(
+            granularity='hour',
+            bucket_start__gte=start,
+            bucket_start__lt=end
+        ).delete()
+        TransactionRollup.objects.bulk_create(rollups, batch_size=chunk_size)
+    return len(rollups)
+
+
+def _build_day(day_start):
+    """Replace one day's rollups by summing its hour rollups"""
+    rows = TransactionRollup.objects.filter(
+        granularity='hour',
+        bucket_start__gte=day_start,
+        bucket_start__lt=day_start + DAY
+    ).order_by().values(*ROLLUP_DIMENSIONS).annotate(
+        total_count=Sum('count'),
+        total_amount=Sum('amount_minor')
+    )
+
+    with transaction.atomic():
+        TransactionRollup.objects.filter(granularity='day', bucket_start=day_start).delete()
+        TransactionRollup.objects.bulk_create([
+            TransactionRollup(
+                granularity='day',
+                bucket_start=day_start,
+                count=row['total_count'],
+                amount_minor=row['total_amount'] or 0,
+                **{name: row[name] for name in ROLLUP_DIMENSIONS}
+            )
+            for row in rows
+        ])
+
+
+def build_rollups(hours=None, now=None, chunk_size=2000, window_hours=1):
+    """
+    Recompute hour rollups for the last `hours` complete hours, `window_hours`
+    hours per query, then the day rollups of every complete day those hours
+    touch.
+
+    Each window is deleted and rewritten in one transaction, so running the
+    job twice (or overlapping runs) gives the same rows. Re-covering recent
+    hours picks up status changes such as withdrawals completing; a larger
+    `hours` backfills history, and a larger `window_hours` does it in fewer
+    queries.
+    """
+    if hours is None:
+        hours = getattr(settings, 'TRANSACTION_ROLLUP_HOURS', 48)
+    end = floor_hour(timezone.localtime(now or timezone.now()))
+    start = end - hours * HOUR
+
+    built = 0
+    bucket = start
+    while bucket < end:
+        window_end = min(bucket + window_hours * HOUR, end)
+        built += _build_hours(bucket, window_end, chunk_size)
+        bucket = window_end
+
+    day = timezone.localdate(start)
+    if start_of_day(day) < start:
+        day += DAY  # Only days whose every hour was rebuilt in this run
+    while start_of_day(day) + DAY <= end:
+        _build_day(start_of_day(day))
+        day += DAY
+    return built
+
+
+def window_totals(since, now=None, **filters):
+    """
+    Transaction count and per-currency minor-unit amounts for rows created
+    since `since`. Whatever precedes the first rollup is read live, then
+    hour rollups up to the first midnight, day rollups, hour rollups again,
+    and the live tail after the watermark. `since` must fall on an hour
+    boundary. `filters` apply to transaction_type and status.
+    """
+    now = now or timezone.now()
+    first, mark = coverage()
+    count = 0
+    amounts = Counter()
+
+    def add_live(start, end):
+        nonlocal count
+        live = WalletTransaction.objects.filter(
+            created_at__gte=start,
+            created_at__lt=end,
+            **filters
+        ).order_by().values('amount_currency').annotate(
+            total_count=Count('id'),
+            total_amount=Sum('amount_minor')
+        )
+        for row in live:
+            count += row['total_count']
+            amounts[row['amount_currency']] += row['total_amount'] or 0
+
+    if mark and mark > since:
+        start = max(since, first)
+        if start > since:
+            # Not rolled up yet (e.g. history from before the first run)
+            add_live(since, start)
+
+        if timezone.localtime(start).time() == time.min:
+            first_day = start
+        else:
+            first_day = start_of_day(timezone.localdate(start) + DAY)
+        day_end = max(first_day, start_of_day(timezone.localdate(mark)))
+        pieces = [('hour', start, min(first_day, mark)), ('day', first_day, day_end), ('hour', day_end, mark)]
+
+        for granularity, start, end in pieces:
+            if start >= end:
+                continue
+            rows = TransactionRollup.objects.filter(
+                granularity=granularity,
+                bucket_start__gte=start,
+                bucket_start__lt=end,
+                **filters
+            ).order_by().values('currency').annotate(
+                total_count=Sum('count'),
+                total_amount=Sum('amount_minor')
+            )
+            for row in rows:
+                count += row['total_count'] or 0
+                amounts[row['currency']] += row['total_amount'] or 0
+        since = mark
+
+    add_live(since, now)
+    return {'count': count, 'amounts': {c: v for c, v in amounts.items() if v}}
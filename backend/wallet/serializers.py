@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from users.authentication import account
 from .models import WalletTransaction, BankAccount, EscrowLedger, PaymentProviderLog
 
 class WalletTransactionSerializer(serializers.ModelSerializer):
@@ -26,7 +27,7 @@ class WithdrawalRequestSerializer(serializers.Serializer):
     bank_account_id = serializers.IntegerField()
     
     def validate(self, attrs):
-        user = self.context['request'].user
+        user = account(self.context['request'])
         amount = attrs['amount']
         
         # Check if user has sufficient balance
@@ -3,14 +3,28 @@ from django.db import transaction
 from django.utils import timezone
 from django.conf import settings
 from .models import WalletTransaction, BankAccount, EscrowLedger
-from .paystack_client import paystack_client
+from .paystack_client import RateLimitExceeded, paystack_client
+import logging
 import time
 
-@shared_task
-def process_withdrawal(transaction_id):
+logger = logging.getLogger(__name__)
+
+
+def retry_when_throttled(task, exc):
+    """Requeue a task whose Paystack call found the shared rate limit saturated"""
+    return task.retry(
+        exc=exc, countdown=exc.retry_after,
+        max_retries=getattr(settings, 'PAYSTACK_RATE_LIMIT_RETRIES', 10)
+    )
+
+@shared_task(bind=True)
+def process_withdrawal(self, transaction_id):
     """
-    Process withdrawal request using Paystack
+    Process withdrawal request using Paystack. The Paystack calls run while
+    the withdrawal row is locked, so they only wait briefly for the rate
+    limiter and the task is requeued instead.
     """
+    max_wait = getattr(settings, 'PAYSTACK_RATE_LIMIT_LOCKED_MAX_WAIT', 1)
     try:
         with transaction.atomic():
             withdrawal = WalletTransaction.objects.select_for_update().get(
@@ -38,7 +52,8 @@ def process_withdrawal(transaction_id):
                 recipient_response = paystack_client.create_transfer_recipient(
                     name=bank_account.account_name,
                     account_number=bank_account.account_number,
-                    bank_code=bank_account.bank_code
+                    bank_code=bank_account.bank_code,
+                    max_wait=max_wait
                 )
                 
                 if recipient_response.get('status'):
@@ -53,9 +68,10 @@ def process_withdrawal(transaction_id):
             
             # Initiate transfer
             transfer_response = paystack_client.initiate_transfer(
-                amount=withdrawal.amount.amount,
+                amount=withdrawal.amount,
                 recipient_code=bank_account.metadata['recipient_code'],
-                reference=withdrawal.reference
+                reference=withdrawal.reference,
+                max_wait=max_wait
             )
             
             if transfer_response.get('status'):
@@ -70,6 +86,9 @@ def process_withdrawal(transaction_id):
             
             withdrawal.save()
             
+    except RateLimitExceeded as e:
+        # Raised before the call went out; the withdrawal rolled back to pending
+        raise retry_when_throttled(self, e)
     except WalletTransaction.DoesNotExist:
         pass
     except Exception as e:
@@ -113,8 +132,8 @@ def process_escrow_funding(project_id, amount, reference):
             project.save()
             
             # Create audit log
-            from projects.models import ProjectAudit
-            ProjectAudit.objects.create(
+            from admin_dashboard import audit
+            audit.project_event(
                 project=project,
                 action='ESCROW_FUNDED',
                 description=f'Escrow funded with {amount} via Paystack',
@@ -147,8 +166,8 @@ def release_escrow_funds(task_id):
             )
             
             # Create audit log
-            from projects.models import ProjectAudit
-            ProjectAudit.objects.create(
+            from admin_dashboard import audit
+            audit.project_event(
                 project=project,
                 action='ESCROW_RELEASED',
                 description=f'Escrow released {task.pay_amount} for task {task.id}',
@@ -158,8 +177,8 @@ def release_escrow_funds(task_id):
     except TaskUnit.DoesNotExist:
         pass
 
-@shared_task
-def verify_bank_account(bank_account_id):
+@shared_task(bind=True)
+def verify_bank_account(self, bank_account_id):
     """
     Verify bank account using Paystack
     """
@@ -181,11 +200,13 @@ def verify_bank_account(bank_account_id):
             bank_account.metadata['verification_error'] = verification_response.get('message', 'Verification failed')
             bank_account.save()
             
+    except RateLimitExceeded as e:
+        raise retry_when_throttled(self, e)
     except BankAccount.DoesNotExist:
         pass
 
-@shared_task
-def process_deposit(transaction_id):
+@shared_task(bind=True)
+def process_deposit(self, transaction_id):
     """
     Process deposit transaction (for enterprise funding)
     """
@@ -200,7 +221,7 @@ def process_deposit(transaction_id):
         # In production, this would create an actual payment link
         payment_response = paystack_client.initialize_transaction(
             email=deposit.user.email,
-            amount=deposit.amount.amount,
+            amount=deposit.amount,
             reference=deposit.reference,
             metadata={'user_id': deposit.user.id, 'purpose': 'wallet_funding'}
         )
@@ -216,9 +237,36 @@ def process_deposit(transaction_id):
         deposit.provider_response = payment_response
         deposit.save()
         
+    except RateLimitExceeded as e:
+        raise retry_when_throttled(self, e)
     except WalletTransaction.DoesNotExist:
         pass
 
+@shared_task
+def archive_wallet_transactions(older_than_months=None):
+    """
+    Move settled transactions older than WALLET_ARCHIVE_AFTER_MONTHS into
+    compressed monthly NDJSON files
+    """
+    from .archive import archivable_months, archive_month
+    
+    archived = 0
+    for month in archivable_months(older_than_months):
+        archive = archive_month(month)
+        if archive:
+            archived += archive.row_count
+    return archived
+
+@shared_task
+def build_transaction_rollups(hours=None):
+    """
+    Rebuild hourly and daily transaction rollups for the recent past
+    (TRANSACTION_ROLLUP_HOURS by default)
+    """
+    from .rollups import build_rollups
+    
+    return build_rollups(hours=hours)
+
 @shared_task
 def check_pending_transactions():
     """
@@ -232,9 +280,14 @@ def check_pending_transactions():
     for withdrawal in pending_withdrawals:
         if withdrawal.payment_provider_ref:
             # Verify transaction status with Paystack
-            verification_response = paystack_client.verify_transaction(
-                withdrawal.payment_provider_ref
-            )
+            try:
+                verification_response = paystack_client.verify_transaction(
+                    withdrawal.payment_provider_ref
+                )
+            except RateLimitExceeded:
+                # The rest are picked up by the next scheduled run
+                logger.warning("Paystack rate limit saturated; deferring pending withdrawal checks")
+                break
             
             if verification_response.get('status'):
                 if verification_response['data']['status'] == 'success':
@@ -362,3 +362,579 @@ class WalletIntegrationTestCase(TestCase):
         self.assertEqual(transaction.metadata['bank_account_id'], 123)
         self.assertEqual(transaction.metadata['provider_response']['status'], 'success')
         self.assertEqual(transaction.metadata['notes'], 'Test transaction')
+
+
+class PaystackRateLimiterTestCase(TestCase):
+    """Test the shared Paystack rate limiter"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from .paystack_client import ProviderRateLimiter
+        cache.clear()
+        self.limiter = ProviderRateLimiter(
+            name='paystack_test',
+            rate=4,
+            priority_shares={'high': 1.0, 'normal': 0.5, 'low': 0.25},
+            max_wait=0
+        )
+
+    @patch('wallet.paystack_client.time.time', return_value=1000.0)
+    def test_priority_shares(self, mock_time):
+        """Lower priorities stop drawing before transfers do"""
+        self.assertTrue(self.limiter.try_acquire('low'))
+        self.assertFalse(self.limiter.try_acquire('low'))
+        self.assertTrue(self.limiter.try_acquire('normal'))
+        self.assertFalse(self.limiter.try_acquire('normal'))
+        self.assertTrue(self.limiter.try_acquire('high'))
+        self.assertTrue(self.limiter.try_acquire('high'))
+        self.assertFalse(self.limiter.try_acquire('high'))
+
+        # The next second refills the bucket
+        mock_time.return_value = 1001.0
+        self.assertTrue(self.limiter.try_acquire('low'))
+
+    @patch('wallet.paystack_client.time.time')
+    @patch('wallet.paystack_client.time.sleep')
+    @patch('wallet.paystack_client.requests.post')
+    def test_retries_after_provider_throttling(self, mock_post, mock_sleep, mock_time):
+        """A 429 pauses the shared bucket and the call is retried"""
+        from .paystack_client import PaystackClient
+
+        clock = [1000.0]
+        mock_time.side_effect = lambda: clock[0]
+        mock_sleep.side_effect = lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+        throttled = MagicMock(status_code=429, headers={'Retry-After': '1'})
+        success = MagicMock(status_code=200, headers={})
+        success.json.return_value = {'status': True, 'data': {'reference': 'TRF_test'}}
+        mock_post.side_effect = [throttled, success]
+
+        client = PaystackClient()
+        client.rate_limiter.max_wait = 5
+        response = client.initiate_transfer(100, 'RCP_test', 'WTH_test')
+
+        self.assertTrue(response['status'])
+        self.assertEqual(mock_post.call_count, 2)
+        mock_sleep.assert_any_call(1.0)
+
+    @patch('wallet.paystack_client.time.sleep')
+    @patch('wallet.paystack_client.requests.post')
+    def test_backoff_bounded_by_max_wait(self, mock_post, mock_sleep):
+        """A 429 whose backoff outlasts max_wait raises instead of sleeping"""
+        from .paystack_client import PaystackClient, RateLimitExceeded
+
+        mock_post.return_value = MagicMock(status_code=429, headers={'Retry-After': '20'})
+        client = PaystackClient()
+        client.rate_limiter = self.limiter
+        with self.assertRaises(RateLimitExceeded) as raised:
+            client.initiate_transfer(100, 'RCP_test', 'WTH_test', max_wait=1)
+
+        self.assertEqual(raised.exception.retry_after, 20)
+        self.assertEqual(mock_post.call_count, 1)
+        mock_sleep.assert_not_called()
+        # Every other worker backs off too
+        self.assertFalse(self.limiter.try_acquire('high'))
+
+    @patch('wallet.paystack_client.time.sleep')
+    @patch('wallet.paystack_client.requests.get')
+    def test_bank_list_does_not_block_request(self, mock_get, mock_sleep):
+        """A saturated limiter answers 503 straight away on the request path"""
+        from rest_framework.test import APIClient
+        from .paystack_client import PaystackClient
+
+        user = User.objects.create_user(
+            username='bank_lister', email='banks@test.com', password='testpass123', role='student'
+        )
+        self.limiter.max_wait = 30
+        self.limiter.pause(5)
+        client = PaystackClient()
+        client.rate_limiter = self.limiter
+        api = APIClient()
+        api.force_authenticate(user)
+        with patch('wallet.paystack_client.paystack_client', client):
+            response = api.get('/api/wallet/supported-banks/')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+        mock_get.assert_not_called()
+        mock_sleep.assert_not_called()
+
+    @patch('wallet.paystack_client.requests.post')
+    def test_saturated_limit_is_not_bypassed(self, mock_post):
+        """Once max_wait runs out nothing is sent and the Celery task is requeued"""
+        from celery.exceptions import Retry
+        from .paystack_client import PaystackClient, RateLimitExceeded
+        from .tasks import process_deposit
+
+        self.limiter.pause(5)
+        with self.assertRaises(RateLimitExceeded) as raised:
+            self.limiter.acquire('high')
+        self.assertGreaterEqual(raised.exception.retry_after, 4)
+
+        user = User.objects.create_user(
+            username='enterprise_user', email='enterprise@test.com', password='testpass123', role='enterprise'
+        )
+        deposit = WalletTransaction.objects.create(
+            user=user, amount=5000, transaction_type='deposit', status='pending', reference='DEP_throttled'
+        )
+        client = PaystackClient()
+        client.rate_limiter = self.limiter
+        with patch('wallet.tasks.paystack_client', client), \
+                patch.object(process_deposit, 'retry', side_effect=Retry) as retry:
+            with self.assertRaises(Retry):
+                process_deposit(deposit.id)
+
+        mock_post.assert_not_called()
+        self.assertIsInstance(retry.call_args.kwargs['exc'], RateLimitExceeded)
+        deposit.refresh_from_db()
+        self.assertEqual(deposit.status, 'pending')
+
+    def test_local_cache_reported_outside_debug(self):
+        """Without a shared cache every worker would keep its own bucket"""
+        from .checks import check_shared_cache
+
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+        with override_settings(DEBUG=False, CACHES=locmem):
+            self.assertEqual([error.id for error in check_shared_cache(None)], ['wallet.W001'])
+        with override_settings(DEBUG=True, CACHES=locmem):
+            self.assertEqual(check_shared_cache(None), [])
+        with override_settings(DEBUG=False, CACHES=redis):
+            self.assertEqual(check_shared_cache(None), [])
+
+
+class IdempotencyKeyTestCase(TestCase):
+    """Test Idempotency-Key handling on money-moving endpoints"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from rest_framework.test import APIClient
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            username='enterprise_user',
+            email='enterprise@test.com',
+            password='testpass123',
+            role='enterprise'
+        )
+        self.project = EnterpriseProject.objects.create(
+            title='Test Project',
+            description='Test project for idempotency',
+            client=self.user,
+            total_amount=5000.00,
+            status='draft'
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    @patch('wallet.views.process_escrow_funding.delay')
+    def test_duplicate_request_is_replayed(self, mock_delay):
+        """A retried request returns the first response without re-executing"""
+        payload = {'amount': '5000.00', 'project_id': self.project.id}
+
+        first = self.api.post('/api/wallet/fund-escrow/', payload, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+        second = self.api.post('/api/wallet/fund-escrow/', payload, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(first.data['reference'], second.data['reference'])
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(
+            WalletTransaction.objects.filter(transaction_type='escrow_funding').count(), 1
+        )
+        mock_delay.assert_called_once()
+
+    @patch('wallet.views.process_escrow_funding.delay')
+    def test_key_reused_with_different_body(self, mock_delay):
+        """Reusing a key for a different payload is rejected"""
+        self.api.post(
+            '/api/wallet/fund-escrow/',
+            {'amount': '5000.00', 'project_id': self.project.id},
+            format='json',
+            HTTP_IDEMPOTENCY_KEY='key-2'
+        )
+        response = self.api.post(
+            '/api/wallet/fund-escrow/',
+            {'amount': '6000.00', 'project_id': self.project.id},
+            format='json',
+            HTTP_IDEMPOTENCY_KEY='key-2'
+        )
+
+        self.assertEqual(response.status_code, 422)
+        mock_delay.assert_called_once()
+
+    @patch('wallet.views.process_escrow_funding.delay')
+    def test_duplicate_runs_after_first_request_raises(self, mock_delay):
+        """A failed first request releases the key instead of stalling duplicates"""
+        import hashlib
+        from django.core.cache import cache
+
+        payload = {'amount': '5000.00', 'project_id': self.project.id}
+        mock_delay.side_effect = [RuntimeError('broker down'), None, None]
+        with self.assertRaises(RuntimeError):
+            self.api.post('/api/wallet/fund-escrow/', payload, format='json', HTTP_IDEMPOTENCY_KEY='key-3')
+        retried = self.api.post('/api/wallet/fund-escrow/', payload, format='json', HTTP_IDEMPOTENCY_KEY='key-3')
+        self.assertEqual(retried.status_code, 200)
+
+        # A duplicate waiting on a request that then fails takes over at once
+        key_hash = hashlib.sha256(b'key-4').hexdigest()
+        lock_key = f'idempotency:fund_escrow:{self.user.pk}:{key_hash}:lock'
+        cache.add(lock_key, 'first', timeout=30)
+        with patch('wallet.idempotency.time.sleep', side_effect=lambda _: cache.delete(lock_key)) as sleep:
+            response = self.api.post(
+                '/api/wallet/fund-escrow/', payload, format='json', HTTP_IDEMPOTENCY_KEY='key-4'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sleep.call_count, 1)
+        self.assertNotIn('Idempotent-Replayed', response)
+
+
+class MinorUnitTestCase(TestCase):
+    """Test integer minor-unit storage and aggregation"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='test_user',
+            email='user@test.com',
+            password='testpass123',
+            role='student'
+        )
+
+    def test_conversion_round_trip(self):
+        """Amounts convert to kobo/cents and back without drift"""
+        from decimal import Decimal
+        from djmoney.money import Money
+        from .money import to_minor, from_minor
+
+        self.assertEqual(to_minor(Decimal('1234.56')), 123456)
+        self.assertEqual(to_minor(Money('10.005', 'USD')), 1001)
+        self.assertEqual(from_minor(123456, 'NGN'), Money('1234.56', 'NGN'))
+
+    def test_minor_units_kept_in_step_on_save(self):
+        """Saving a transaction keeps amount_minor in step with amount"""
+        tx = WalletTransaction.objects.create(
+            user=self.user,
+            amount=250.75,
+            transaction_type='deposit',
+            status='completed',
+            reference='MINOR_1'
+        )
+        self.assertEqual(tx.amount_minor, 25075)
+
+        tx.amount = 300
+        tx.save(update_fields=['amount'])
+        tx.refresh_from_db()
+        self.assertEqual(tx.amount_minor, 30000)
+
+    def test_sum_by_currency(self):
+        """Sums are grouped by currency instead of mixing them"""
+        from djmoney.money import Money
+        from .money import sum_minor_by_currency
+
+        for i, amount in enumerate([Money(100, 'NGN'), Money(50, 'NGN'), Money(20, 'USD')]):
+            WalletTransaction.objects.create(
+                user=self.user,
+                amount=amount,
+                transaction_type='task_payment',
+                status='completed',
+                reference=f'SUM_{i}'
+            )
+
+        totals = sum_minor_by_currency(WalletTransaction.objects.all())
+        self.assertEqual(totals, {'NGN': 15000, 'USD': 2000})
+
+
+class ExchangeRateTestCase(TestCase):
+    """Test FX conversion of per-currency totals"""
+
+    def setUp(self):
+        from .models import ExchangeRate
+        ExchangeRate.objects.create(source_currency='USD', target_currency='NGN', rate=1500)
+        ExchangeRate.objects.create(source_currency='NGN', target_currency='KES', rate='0.0869565')
+
+    def test_convert_totals_to_reporting_currency(self):
+        """Totals in several currencies convert into one reporting total"""
+        from .fx import convert_totals
+
+        total, unconverted = convert_totals({'NGN': 100000, 'USD': 1000}, 'NGN')
+        self.assertEqual(total, 100000 + 1500000)
+        self.assertEqual(unconverted, [])
+
+    def test_inverse_and_missing_rates(self):
+        """Inverse rates are derived and missing ones are reported"""
+        from decimal import Decimal
+        from .fx import convert_totals, get_rate
+
+        self.assertEqual(get_rate('KES', 'NGN').quantize(Decimal('0.01')), Decimal('11.50'))
+
+        total, unconverted = convert_totals({'NGN': 5000, 'GHS': 1000}, 'NGN')
+        self.assertEqual(total, 5000)
+        self.assertEqual(unconverted, ['GHS'])
+
+    def test_rate_changes_refresh_cache(self):
+        """Saving a rate drops the in-process cache"""
+        from .models import ExchangeRate
+        from .fx import get_rate
+
+        self.assertEqual(get_rate('USD', 'NGN'), 1500)
+        ExchangeRate.objects.filter(source_currency='USD').get().delete()
+        ExchangeRate.objects.create(source_currency='USD', target_currency='NGN', rate=1600)
+        self.assertEqual(get_rate('USD', 'NGN'), 1600)
+
+
+class TransactionArchiveTestCase(TestCase):
+    """Test cold archiving of settled wallet transactions"""
+
+    def setUp(self):
+        import tempfile
+        from datetime import timedelta
+        from django.utils import timezone
+        from rest_framework.test import APIClient
+
+        self.archive_dir = tempfile.TemporaryDirectory()
+        self.user = User.objects.create_user(
+            username='test_user',
+            email='user@test.com',
+            password='testpass123',
+            role='student'
+        )
+        old = timezone.now() - timedelta(days=500)
+        for i, tx_status in enumerate(['completed', 'failed', 'pending']):
+            tx = WalletTransaction.objects.create(
+                user=self.user,
+                amount=100 + i,
+                transaction_type='task_payment',
+                status=tx_status,
+                reference=f'OLD_{i}'
+            )
+            WalletTransaction.objects.filter(pk=tx.pk).update(created_at=old + timedelta(minutes=i))
+        WalletTransaction.objects.create(
+            user=self.user,
+            amount=50,
+            transaction_type='task_payment',
+            status='completed',
+            reference='RECENT_1'
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def tearDown(self):
+        self.archive_dir.cleanup()
+
+    def test_archive_and_read_back(self):
+        """Settled old rows leave the hot table but stay visible in the list API"""
+        from .models import TransactionArchive
+        from .tasks import archive_wallet_transactions
+
+        with override_settings(WALLET_ARCHIVE_ROOT=self.archive_dir.name):
+            archived = archive_wallet_transactions(older_than_months=12)
+
+            self.assertEqual(archived, 2)
+            self.assertEqual(TransactionArchive.objects.count(), 1)
+            self.assertEqual(
+                sorted(WalletTransaction.objects.values_list('reference', flat=True)),
+                ['OLD_2', 'RECENT_1']
+            )
+
+            response = self.api.get('/api/wallet/transactions/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(
+            [row['reference'] for row in response.data['results']],
+            ['RECENT_1', 'OLD_2', 'OLD_1', 'OLD_0']
+        )
+
+    def test_summary_totals_survive_archiving(self):
+        """Lifetime earned/withdrawn totals include archived rows"""
+        from datetime import timedelta
+        from django.utils import timezone
+        from .tasks import archive_wallet_transactions
+
+        tx = WalletTransaction.objects.create(
+            user=self.user, amount=30, transaction_type='withdrawal', status='completed', reference='OLD_WTH'
+        )
+        WalletTransaction.objects.filter(pk=tx.pk).update(created_at=timezone.now() - timedelta(days=500))
+        fields = ('total_earned', 'total_withdrawn', 'pending_withdrawals', 'totals_by_currency')
+
+        before = self.api.get('/api/wallet/summary/').data
+        with override_settings(WALLET_ARCHIVE_ROOT=self.archive_dir.name):
+            self.assertEqual(archive_wallet_transactions(older_than_months=12), 3)
+        after = self.api.get('/api/wallet/summary/').data
+
+        self.assertEqual({f: after[f] for f in fields}, {f: before[f] for f in fields})
+        self.assertEqual((after['total_earned'], after['total_withdrawn']), (150, 30))
+
+    def test_user_blocks_are_read_by_offset(self):
+        """Each user's rows are a separate gzip member found by its byte range"""
+        import gzip
+        import os
+        from datetime import timedelta
+        from unittest.mock import patch
+        from django.utils import timezone
+        from . import archive
+        from .models import ArchivedTransactionCount
+        from .tasks import archive_wallet_transactions
+
+        other = User.objects.create_user(username='other_user', password='testpass123', role='student')
+        tx = WalletTransaction.objects.create(
+            user=other, amount=7, transaction_type='deposit', status='completed', reference='OTHER_0'
+        )
+        WalletTransaction.objects.filter(pk=tx.pk).update(created_at=timezone.now() - timedelta(days=500))
+
+        with override_settings(WALLET_ARCHIVE_ROOT=self.archive_dir.name):
+            archive_wallet_transactions(older_than_months=12)
+            counts = ArchivedTransactionCount.objects.select_related('archive').order_by('byte_offset')
+            self.assertEqual([c.row_count for c in counts], [2, 1])
+            self.assertEqual(counts[0].byte_offset + counts[0].byte_length, counts[1].byte_offset)
+
+            # Still one ordinary gzip file
+            path = os.path.join(self.archive_dir.name, counts[0].archive.path)
+            with gzip.open(path, 'rt') as fh:
+                self.assertEqual(len(fh.readlines()), 3)
+
+            with patch.object(archive, 'iter_archive', side_effect=AssertionError('scanned the file')):
+                rows = list(archive.iter_archived_rows(counts.get(user=other)))
+            self.assertEqual([row['reference'] for row in rows], ['OTHER_0'])
+
+    def test_rows_deleted_without_per_row_signals(self):
+        """Archived rows are deleted in bulk and the counters adjusted once"""
+        from datetime import timedelta
+        from django.db.models.signals import post_delete
+        from django.utils import timezone
+        from .tasks import archive_wallet_transactions
+
+        old = timezone.now() - timedelta(days=500)
+        tx = WalletTransaction.objects.create(
+            user=self.user, amount=30, transaction_type='withdrawal', status='completed', reference='OLD_WTH'
+        )
+        WalletTransaction.objects.filter(pk=tx.pk).update(created_at=old)
+
+        deleted = []
+        receiver = lambda sender, instance, **kwargs: deleted.append(instance.pk)
+        post_delete.connect(receiver, sender=WalletTransaction)
+        try:
+            with override_settings(WALLET_ARCHIVE_ROOT=self.archive_dir.name), \
+                    patch('admin_dashboard.counters.apply_delta') as apply_delta:
+                self.assertEqual(archive_wallet_transactions(older_than_months=12), 3)
+        finally:
+            post_delete.disconnect(receiver, sender=WalletTransaction)
+
+        self.assertEqual(deleted, [])
+        apply_delta.assert_called_once_with({('withdrawals_today', timezone.localdate(old)): -1})
+        self.assertFalse(WalletTransaction.objects.filter(reference='OLD_WTH').exists())
+
+    def test_nothing_to_archive(self):
+        """Recent transactions are left alone"""
+        from .tasks import archive_wallet_transactions
+
+        with override_settings(WALLET_ARCHIVE_ROOT=self.archive_dir.name):
+            self.assertEqual(archive_wallet_transactions(older_than_months=24), 0)
+        self.assertEqual(WalletTransaction.objects.count(), 4)
+
+
+class TransactionRollupTestCase(TestCase):
+    """Test hourly/daily rollups behind the financial overview windows"""
+
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        self.user = User.objects.create_user(
+            username='test_user',
+            email='user@test.com',
+            password='testpass123',
+            role='student'
+        )
+        now = timezone.now()
+        for i, (tx_type, tx_status, days_ago) in enumerate([
+            ('withdrawal', 'completed', 0),
+            ('deposit', 'completed', 3),
+            ('deposit', 'failed', 3),
+            ('withdrawal', 'completed', 20),
+            ('deposit', 'completed', 60),
+        ]):
+            tx = WalletTransaction.objects.create(
+                user=self.user,
+                amount=100 + i,
+                transaction_type=tx_type,
+                status=tx_status,
+                reference=f'TX_{i}'
+            )
+            WalletTransaction.objects.filter(pk=tx.pk).update(
+                created_at=now - timedelta(days=days_ago, hours=2)
+            )
+
+    def _window(self, days, **filters):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .rollups import start_of_day, window_totals
+
+        return window_totals(start_of_day(timezone.localdate() - timedelta(days=days)), **filters)
+
+    def test_rollups_match_live_queries(self):
+        """Windows answered from rollups agree with scanning the table"""
+        from .tasks import build_transaction_rollups
+
+        before = [self._window(days) for days in (7, 30, 90)]
+        build_transaction_rollups(hours=24 * 90)
+        after = [self._window(days) for days in (7, 30, 90)]
+
+        self.assertEqual(before, after)
+        self.assertEqual([w['count'] for w in after], [3, 4, 5])
+        self.assertEqual(
+            self._window(30, transaction_type='withdrawal', status='completed')['amounts'],
+            {'NGN': 10000 + 10300}
+        )
+
+    def test_rebuild_is_idempotent(self):
+        """Running the job twice leaves the same buckets"""
+        from .models import TransactionRollup
+        from .rollups import build_rollups
+
+        build_rollups(hours=24 * 90)
+        first = list(TransactionRollup.objects.order_by('granularity', 'bucket_start', 'transaction_type', 'status')
+                     .values_list('granularity', 'bucket_start', 'transaction_type', 'status', 'count', 'amount_minor'))
+        build_rollups(hours=24 * 90)
+        second = list(TransactionRollup.objects.order_by('granularity', 'bucket_start', 'transaction_type', 'status')
+                      .values_list('granularity', 'bucket_start', 'transaction_type', 'status', 'count', 'amount_minor'))
+
+        self.assertEqual(first, second)
+        self.assertTrue(any(row[0] == 'day' for row in first))
+
+    def test_history_without_rollups_is_read_live(self):
+        """After only the scheduled run, older history is still counted"""
+        from .rollups import build_rollups
+
+        build_rollups()  # The last TRANSACTION_ROLLUP_HOURS only
+
+        self.assertEqual([self._window(days)['count'] for days in (7, 30, 90)], [3, 4, 5])
+        self.assertEqual(self._window(90, transaction_type='deposit')['amounts'], {'NGN': 10100 + 10200 + 10400})
+
+    def test_backfill_command_covers_history(self):
+        """build_rollups rolls up everything since the oldest transaction"""
+        from datetime import timedelta
+        from io import StringIO
+        from django.core.management import call_command
+        from django.utils import timezone
+        from .models import TransactionRollup
+        from .rollups import coverage
+
+        call_command('build_rollups', stdout=StringIO())
+
+        first, _ = coverage()
+        self.assertLessEqual(first, timezone.now() - timedelta(days=60))
+        self.assertTrue(TransactionRollup.objects.filter(
+            granularity='day', bucket_start__lt=timezone.now() - timedelta(days=59)
+        ).exists())
+        self.assertEqual([self._window(days)['count'] for days in (7, 30, 90)], [3, 4, 5])
+
+    def test_status_change_is_picked_up(self):
+        """A rebuild moves a transaction to its new status bucket"""
+        from .rollups import build_rollups
+
+        build_rollups(hours=24 * 10)
+        WalletTransaction.objects.filter(reference='TX_2').update(status='completed')
+        build_rollups(hours=24 * 10)
+
+        self.assertEqual(self._window(7, status='completed')['count'], 3)
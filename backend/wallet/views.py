@@ -1,16 +1,23 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
+import math
 import uuid
+from collections import Counter
 from .models import WalletTransaction, BankAccount, EscrowLedger
 from .serializers import (
     WalletTransactionSerializer, BankAccountSerializer, 
     WithdrawalRequestSerializer, DepositRequestSerializer, BankVerificationSerializer
 )
 from .tasks import process_withdrawal, process_escrow_funding, verify_bank_account
+from .idempotency import idempotent
+from .money import sum_minor_by_currency, totals_as_decimals, total_in
+from .archive import ArchivedTransactionList, TransactionHistory, archived_totals
 from projects.models import EnterpriseProject
+from users.authentication import account
 
 class WalletTransactionListView(generics.ListAPIView):
     serializer_class = WalletTransactionSerializer
@@ -18,6 +25,17 @@ class WalletTransactionListView(generics.ListAPIView):
     
     def get_queryset(self):
         return WalletTransaction.objects.filter(user=self.request.user)
+    
+    def list(self, request, *args, **kwargs):
+        # Archived history is paged after the hot rows, already serialized
+        history = TransactionHistory(
+            self.get_queryset(),
+            ArchivedTransactionList(request.user)
+        )
+        page = self.paginate_queryset(history)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(history[:])
 
 class BankAccountListView(generics.ListCreateAPIView):
     serializer_class = BankAccountSerializer
@@ -41,6 +59,7 @@ class BankAccountDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@idempotent
 def request_withdrawal(request):
     serializer = WithdrawalRequestSerializer(data=request.data, context={'request': request})
     serializer.is_valid(raise_exception=True)
@@ -85,6 +104,7 @@ def request_withdrawal(request):
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@idempotent
 def fund_escrow(request):
     """
     Fund project escrow using Paystack
@@ -182,25 +202,42 @@ def wallet_summary(request):
     """
     Get wallet summary including balance and recent transactions
     """
-    user = request.user
+    user = account(request)
+    currency = user.wallet_balance.currency.code
+    
+    # Integer sums per currency, converted to amounts only at the edge
+    earned = sum_minor_by_currency(WalletTransaction.objects.filter(
+        user=user,
+        transaction_type='task_payment',
+        status='completed'
+    ))
+    withdrawn = sum_minor_by_currency(WalletTransaction.objects.filter(
+        user=user,
+        transaction_type='withdrawal',
+        status='completed'
+    ))
+    pending = sum_minor_by_currency(WalletTransaction.objects.filter(
+        user=user,
+        transaction_type='withdrawal',
+        status__in=['pending', 'processing']
+    ))
+    
+    # Settled history moved to the cold archive still counts towards the totals
+    archived = archived_totals(user)
+    earned = dict(archived['earned_minor'] + Counter(earned))
+    withdrawn = dict(archived['withdrawn_minor'] + Counter(withdrawn))
     
     summary = {
-        'balance': user.wallet_balance,
-        'total_earned': WalletTransaction.objects.filter(
-            user=user,
-            transaction_type='task_payment',
-            status='completed'
-        ).aggregate(total=models.Sum('amount'))['total'] or 0,
-        'total_withdrawn': WalletTransaction.objects.filter(
-            user=user,
-            transaction_type='withdrawal',
-            status='completed'
-        ).aggregate(total=models.Sum('amount'))['total'] or 0,
-        'pending_withdrawals': WalletTransaction.objects.filter(
-            user=user,
-            transaction_type='withdrawal',
-            status__in=['pending', 'processing']
-        ).aggregate(total=models.Sum('amount'))['total'] or 0,
+        'balance': user.wallet_balance.amount,
+        'currency': currency,
+        'total_earned': total_in(earned, currency),
+        'total_withdrawn': total_in(withdrawn, currency),
+        'pending_withdrawals': total_in(pending, currency),
+        'totals_by_currency': {
+            'total_earned': totals_as_decimals(earned),
+            'total_withdrawn': totals_as_decimals(withdrawn),
+            'pending_withdrawals': totals_as_decimals(pending),
+        },
         'recent_transactions': WalletTransactionSerializer(
             WalletTransaction.objects.filter(user=user)[:5],
             many=True
@@ -215,9 +252,19 @@ def get_supported_banks(request):
     """
     Get list of supported banks from Paystack
     """
-    from .paystack_client import paystack_client
+    from .paystack_client import RateLimitExceeded, paystack_client
     
-    banks_response = paystack_client.list_banks()
+    try:
+        # Don't hold the request while the limiter is saturated
+        banks_response = paystack_client.list_banks(
+            max_wait=getattr(settings, 'PAYSTACK_RATE_LIMIT_REQUEST_MAX_WAIT', 0)
+        )
+    except RateLimitExceeded as e:
+        return Response(
+            {'error': 'Bank list temporarily unavailable, try again shortly'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={'Retry-After': str(math.ceil(e.retry_after))}
+        )
     
     if banks_response.get('status'):
         banks = [
@@ -233,7 +280,4 @@ def get_supported_banks(request):
         return Response(
             {"error": "Failed to fetch banks list"}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
-
-# Add the missing import for models
-from django.db import models
\ No newline at end of file
+        )
\ No newline at end of file